@@ -30,18 +30,14 @@ from framework.global_resources import convert_to_internal_repr
 
 def rand_string(size=None, min=1, max=10, str_set=string.printable):
 
-    out = ""
     if size is None:
         size = random.randint(min, max)
     else:
         # if size is not an int, TypeError is raised with python3
         assert isinstance(size, int)
 
-    while len(out) < size:
-        val = random.choice(str_set)
-        out += val
-
-    return out
+    choice = random.choice
+    return ''.join([choice(str_set) for _ in range(size)])
 
 
 def corrupt_bytes(s, p=0.01, n=None, ctrl_char=False):
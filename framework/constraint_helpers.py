@@ -229,6 +229,29 @@ class CSP(object):
     def exhausted_solutions(self):
         return self._exhausted_solutions
 
+    def get_state(self):
+        """
+        Returns:
+            the current state of the CSP, to be restored through :meth:`CSP.set_state`
+        """
+        return (copy.copy(self._model), copy.copy(self._var_domain), self._var_domain_updated,
+                copy.copy(self._orig_var_domain), self._problem, self._solutions,
+                self._exhausted_solutions, self._is_solution_queried,
+                [c.relation for c in self._constraints])
+
+    def set_state(self, state):
+        """
+        Restore a state returned by :meth:`CSP.get_state`. Note that the iteration over the
+        solutions cannot be rewound, thus it goes on from where it stands.
+        """
+        model, var_domain, self._var_domain_updated, orig_var_domain, self._problem, \
+            self._solutions, self._exhausted_solutions, self._is_solution_queried, relations = state
+        self._model = copy.copy(model)
+        self._var_domain = copy.copy(var_domain)
+        self._orig_var_domain = copy.copy(orig_var_domain)
+        for c, relation in zip(self._constraints, relations):
+            c.relation = relation
+
     def __copy__(self):
         new_csp = type(self)(constraints=self._constraints)
         new_csp.__dict__.update(self.__dict__)
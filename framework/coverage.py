@@ -0,0 +1,192 @@
+################################################################################
+#
+#  Copyright 2014-2016 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import ctypes
+import os
+import re
+import threading
+
+# Shared memory coverage bitmap compatible with AFL instrumented programs
+AFL_MAP_SIZE = 1 << 16
+AFL_SHM_ENV_VAR = '__AFL_SHM_ID'
+
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_EXCL = 0o2000
+_IPC_RMID = 0
+
+# AFL hit count buckets: each count is turned into one bit (1, 2, 3, 4-7, 8-15, 16-31, 32-127, 128+)
+_BUCKETS = bytes([0, 1, 2, 4] + [8] * 4 + [16] * 8 + [32] * 16 + [64] * 96 + [128] * 128)
+
+
+class SharedMemoryBitmap(object):
+    '''
+    System V shared memory segment the instrumented program records its edge coverage in.
+    Its ID has to be provided to the program through the environment variable
+    ``__AFL_SHM_ID`` (refer to :attr:`env`).
+
+    Args:
+        size (int): size of the bitmap
+    '''
+
+    def __init__(self, size=AFL_MAP_SIZE):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._shmget = libc.shmget
+        self._shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        self._shmget.restype = ctypes.c_int
+        self._shmat = libc.shmat
+        self._shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        self._shmat.restype = ctypes.c_void_p
+        self._shmdt = libc.shmdt
+        self._shmdt.argtypes = [ctypes.c_void_p]
+        self._shmctl = libc.shmctl
+        self._shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+        self.size = size
+        self.shm_id = self._shmget(_IPC_PRIVATE, size, _IPC_CREAT | _IPC_EXCL | 0o600)
+        if self.shm_id < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, 'shmget: ' + os.strerror(errno))
+        self._addr = self._shmat(self.shm_id, None, 0)
+        if self._addr in (None, ctypes.c_void_p(-1).value):
+            errno = ctypes.get_errno()
+            self._shmctl(self.shm_id, _IPC_RMID, None)
+            raise OSError(errno, 'shmat: ' + os.strerror(errno))
+        self.env = {AFL_SHM_ENV_VAR: str(self.shm_id)}
+
+    def reset(self):
+        ctypes.memset(self._addr, 0, self.size)
+
+    def read(self):
+        return ctypes.string_at(self._addr, self.size)
+
+    def close(self):
+        if self._addr is None:
+            return
+        self._shmdt(self._addr)
+        self._shmctl(self.shm_id, _IPC_RMID, None)
+        self._addr = None
+
+
+class CoverageFeedback(object):
+    '''
+    Compact summary of the coverage of a test case.
+
+    Args:
+        edges (int): number of edges hit by the test case
+        new_coverage (bool): True if the test case hit an edge, or an edge hit count range,
+          never seen before
+    '''
+
+    _regex = re.compile(rb'^(\d+) edges hit( \(new coverage\))?$')
+
+    def __init__(self, edges, new_coverage):
+        self.edges = edges
+        self.new_coverage = new_coverage
+
+    def to_bytes(self):
+        return b'%d edges hit%s' % (self.edges, b' (new coverage)' if self.new_coverage else b'')
+
+    @classmethod
+    def from_bytes(cls, content):
+        '''
+        Returns:
+            CoverageFeedback: the coverage described by a feedback `content` (as provided by
+            :meth:`to_bytes`), or None if it does not describe coverage
+        '''
+        match = cls._regex.match(content) if isinstance(content, bytes) else None
+        if match is None:
+            return None
+        return cls(int(match.group(1)), match.group(2) is not None)
+
+    def __eq__(self, other):
+        return isinstance(other, CoverageFeedback) and \
+               (self.edges, self.new_coverage) == (other.edges, other.new_coverage)
+
+    def __repr__(self):
+        return 'CoverageFeedback(edges={:d}, new_coverage={!r})'.format(self.edges, self.new_coverage)
+
+
+class VirginMap(object):
+    '''
+    Keep track of the coverage reached by all the test cases (hit count ranges of
+    each edge, as AFL does), so that new coverage can be detected.
+    The bitmaps are handled as big integers so that the comparison is done in one go.
+    As converting a whole bitmap costs much more than hashing it, the bitmaps already
+    classified are remembered through their hashes: the test cases running again a path
+    already seen are then assessed without conversion.
+
+    Args:
+        size (int): size of the bitmaps
+        max_known_traces (int): maximum number of bitmaps remembered
+    '''
+
+    def __init__(self, size=AFL_MAP_SIZE, max_known_traces=65536):
+        self.size = size
+        self.max_known_traces = max_known_traces
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._virgin = (1 << (self.size * 8)) - 1
+            self._last_trace = None
+            # hash of the bitmaps already classified --> number of edges they hit
+            self._known_traces = {}
+
+    def update(self, trace):
+        '''
+        Args:
+            trace (bytes): coverage bitmap of a test case
+
+        Returns:
+            CoverageFeedback: the coverage of the test case
+        '''
+        with self._lock:
+            if trace == self._last_trace:
+                # same path as the previous test case, nothing new
+                return CoverageFeedback(self._last_edges, False)
+
+            key = hash(trace)
+            edges = self._known_traces.get(key, None)
+            if edges is None:
+                edges = self.size - trace.count(0)
+                bits = int.from_bytes(trace.translate(_BUCKETS), 'little')
+                new_bits = bits & self._virgin
+                if new_bits:
+                    self._virgin ^= new_bits
+                if len(self._known_traces) >= self.max_known_traces:
+                    self._known_traces.clear()
+                self._known_traces[key] = edges
+                new_coverage = new_bits != 0
+            else:
+                # path already classified, its coverage is part of the virgin map
+                new_coverage = False
+            self._last_trace = trace
+            self._last_edges = edges
+
+        return CoverageFeedback(edges, new_coverage)
+
+
+# Shared by the targets so that new coverage is assessed against all the test cases
+virgin_map = VirginMap()
@@ -63,6 +63,9 @@ class DataBackend(object):
     def to_bytes(self):
         raise NotImplementedError
 
+    def to_segments(self):
+        return [self.to_bytes()]
+
     def show(self, raw_limit=200, log_func=sys.stdout.write):
         raise NotImplementedError
 
@@ -103,6 +106,9 @@ class NodeBackend(DataBackend):
     def to_bytes(self):
         return self._node.to_bytes()
 
+    def to_segments(self):
+        return self._node.to_segments()
+
     def show(self, raw_limit=200, log_func=sys.stdout.write):
         self._node.show(raw_limit=raw_limit, log_func=log_func)
 
@@ -257,6 +263,7 @@ class DataAttr(AttrGroup):
 class Data(object):
 
     _empty_data_backend = EmptyBackend()
+    _pinned_segments = None
 
     def __init__(self, content=None, altered=False, tg_ids=None, description=None):
 
@@ -265,6 +272,7 @@ class Data(object):
         self.estimated_data_id = None
         self._data_id = None
         self._backend = None
+        self._pinned_segments = None  # refer to Data.pin_value()
 
         self.set_basic_attributes()
         self.altered = altered
@@ -372,8 +380,40 @@ class Data(object):
         self._backend.data_model = dm
 
     def to_bytes(self):
+        if self._pinned_segments is not None:
+            return b''.join(self._pinned_segments)
         return self._backend.to_bytes()
 
+    def to_segments(self):
+        """
+        Returns:
+            list: the segments of the data, whose concatenation is the value returned by
+            :meth:`to_bytes` (refer to :meth:`framework.node.Node.to_segments`)
+        """
+        if self._pinned_segments is not None:
+            return list(self._pinned_segments)
+        return self._backend.to_segments()
+
+    def pin_value(self):
+        """
+        Serialize the data and keep the result, which is then provided by :meth:`to_bytes` and
+        :meth:`to_segments` without going through the content again, until :meth:`unpin_value`
+        is called. Used before handing the data over to other threads, as serializing a node
+        graph is not thread-safe.
+
+        Returns:
+            tuple: the segments of the data
+        """
+        if self._pinned_segments is None:
+            self._pinned_segments = tuple(self._backend.to_segments())
+        return self._pinned_segments
+
+    def unpin_value(self):
+        self._pinned_segments = None
+
+    def is_value_pinned(self):
+        return self._pinned_segments is not None
+
     def to_str(self):
         return self._backend.to_str()
 
@@ -605,6 +645,7 @@ class Data(object):
                 # ncbk = copy.copy(cbk)
                 new_data._callbacks[hook][id(cbk)] = cbk
         new_data._pending_ops = {}  # we do not copy pending_ops
+        new_data._pinned_segments = None
         new_data._backend = copy.copy(self._backend)
         new_data._targets = copy.copy(self._targets)
         new_data.attrs = copy.copy(self.attrs)
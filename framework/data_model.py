@@ -21,6 +21,7 @@
 #
 ################################################################################
 
+import mmap
 import threading
 
 import framework.global_resources as gr
@@ -110,7 +111,7 @@ class DataModel(object):
         wrap their content in a :class:`framework.node.Node`.
 
         Args:
-            data (bytes): file content
+            data (bytes-like): file content (memory-mapped by :meth:`import_file_contents`)
             idx (int): index of the imported file
             filename (str): name of the imported file
 
@@ -127,7 +128,7 @@ class DataModel(object):
 
             print('{:s} Absorb Status: {!r}, {:d}, {:d}'.format(nm, status, off, size))
             print(' \_ length of original data: {:d}'.format(len(data)))
-            print(' \_ remaining: {!r}'.format(data[size:size+1000]))
+            print(' \_ remaining: {!r}'.format(bytes(data[size:size+1000])))
 
             if status == AbsorbStatus.FullyAbsorbed:
                 print("--> Create {:s} from files in '{:s}{:s}' directory"
@@ -139,6 +140,7 @@ class DataModel(object):
             else:
                 return None
         else:
+            data = bytes(data)
             try:
                 return self._create_atom_from_raw_data_specific(data, idx, filename)
             except NotImplementedError:
@@ -176,7 +178,8 @@ class DataModel(object):
         for scope in decoding_scope:
             self._atoms_for_abs[scope] = (prepared_atom, absorb_constraints)
 
-    def decode(self, data, scope=None, atom_name=None, requested_abs_csts=None, colorized=True):
+    def decode(self, data, scope=None, atom_name=None, requested_abs_csts=None, colorized=True,
+               profiler=None):
         """
         Args:
             data:
@@ -184,6 +187,8 @@ class DataModel(object):
             scope (str): requested scope for the decoding (linked to self.register_atom_for_decoding)
             requested_abs_csts:
             colorized:
+            profiler (AbsorptionProfiler): if provided, its report is added to the textual
+              description
 
         Returns:
             tuple:
@@ -195,7 +200,8 @@ class DataModel(object):
         accumulate = a.accumulate
 
         try:
-            atom, extra = self.absorb(data, scope=scope, atom_name=atom_name, requested_abs_csts=requested_abs_csts)
+            atom, extra = self.absorb(data, scope=scope, atom_name=atom_name, requested_abs_csts=requested_abs_csts,
+                                      profiler=profiler)
         except ValueError as err:
             msg = colorize(f'\n*** ERROR: {err} ***', rgb=Color.ERROR)
             return None, msg
@@ -207,14 +213,19 @@ class DataModel(object):
                        .format(name))
             accumulate('\nAbsorption Status: {!r}, {:d}, {:d}'.format(status, off, size))
             accumulate('\n \_ length of original data: {:d}'.format(len(data)))
-            accumulate('\n \_ remaining: {!r}'.format(data[size:size+1000]))
+            accumulate('\n \_ remaining: {!r}'.format(bytes(data[size:size+1000])))
         else:
             accumulate('\n')
             atom.show(log_func=accumulate, display_title=False, pretty_print=colorized)
 
+        if profiler is not None:
+            accumulate('\n\nAbsorption Profile:\n')
+            accumulate(profiler.get_report())
+            accumulate('\n')
+
         return atom, a.content
 
-    def absorb(self, data, scope=None, atom_name=None, requested_abs_csts=None):
+    def absorb(self, data, scope=None, atom_name=None, requested_abs_csts=None, profiler=None):
         """
 
         Args:
@@ -222,6 +233,8 @@ class DataModel(object):
             atom_name (str): requested atom name for the decoding (linked to self.register_atom_for_decoding)
             scope (str): requested scope for the decoding (linked to self.register_atom_for_decoding)
             requested_abs_csts:
+            profiler (AbsorptionProfiler): if provided, collect time and attempts per node
+              (cf. :meth:`Node.absorb`)
 
         Returns:
             Node:
@@ -249,7 +262,8 @@ class DataModel(object):
                 raise ValueError(f"provided atom name is unknown: '{atom_name}'")
 
         abs_csts_to_apply = abs_csts if requested_abs_csts is None else requested_abs_csts
-        status, off, size, name = atom_for_abs.absorb(data, constraints=abs_csts_to_apply)
+        status, off, size, name = atom_for_abs.absorb(data, constraints=abs_csts_to_apply,
+                                                      profiler=profiler)
 
         atom = atom_for_abs if status == AbsorbStatus.FullyAbsorbed else None
 
@@ -387,7 +401,12 @@ class DataModel(object):
 
         for idx, name in enumerate(files):
             with open(os.path.join(path, name), 'rb') as f:
-                buff = f.read()
+                # The file is memory-mapped so that its absorption does not
+                # require to read it entirely, nor to copy it (cf. Node.absorb())
+                try:
+                    buff = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                except ValueError: # empty file
+                    buff = b''
                 d_abs = absorber(buff, idx, name)
                 if d_abs is not None:
                     msgs[name] = d_abs
@@ -34,6 +34,7 @@ import framework.global_resources as gr
 from framework.config import config
 import libs.external_modules as em
 from framework.knowledge.feedback_collector import FeedbackSource
+from framework.node import AbsorptionProfiler
 from libs.external_modules import *
 from libs.utils import chunk_lines
 
@@ -677,12 +678,14 @@ class Database(object):
             "ORDER BY DATE ASC;".format(data_id=data_id)
         )
 
-        def search_dm(data_model_name, load_arg):
+        def search_dm(data_model_name, load_arg, profile_absorption=False):
             for dm in dm_list:
                 if dm.name == data_model_name:
                     dm.load_data_model(load_arg)
 
                     def decode_wrapper(*args, **kwargs):
+                        if profile_absorption:
+                            kwargs['profiler'] = AbsorptionProfiler()
                         return dm.decode(*args, **kwargs)[1]
 
                     return decode_wrapper
@@ -697,14 +700,15 @@ class Database(object):
         decoder_func = None
         fbk_decoder_func = None
         if decoding_hints is not None:
-            load_arg, decode_data, decode_fbk, user_atom_name, user_fbk_atom_name, forced_fbk_decoder = decoding_hints
+            load_arg, decode_data, decode_fbk, user_atom_name, user_fbk_atom_name, forced_fbk_decoder, \
+                profile_absorption = decoding_hints
             if decode_data or decode_fbk:
-                decoder_func = search_dm(dm_name, load_arg)
+                decoder_func = search_dm(dm_name, load_arg, profile_absorption)
                 if decoder_func is None:
                     decode_data = False
             if decode_fbk:
                 if forced_fbk_decoder:
-                    fbk_decoder_func = search_dm(forced_fbk_decoder, load_arg)
+                    fbk_decoder_func = search_dm(forced_fbk_decoder, load_arg, profile_absorption)
                 else:
                     fbk_decoder_func = decoder_func
                 decode_fbk = fbk_decoder_func is not None
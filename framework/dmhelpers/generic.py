@@ -24,6 +24,7 @@
 from framework.node import *
 
 import datetime
+import functools
 
 #####################
 # Data Model Helper #
@@ -241,6 +242,12 @@ def TIMESTAMP(time_format="%H%M%S", utc=False,
     return functools.partial(timestamp, time_format, utc, set_attrs, clear_attrs)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_crc_func(poly, init_crc, xor_out, rev):
+    # building the table of a CRC takes far more time than computing a CRC
+    return crcmod.mkCrcFun(poly, initCrc=init_crc, xorOut=xor_out, rev=rev)
+
+
 def CRC(vt=fvt.INT_str, poly=0x104c11db7, init_crc=0, xor_out=0xFFFFFFFF, rev=True,
         set_attrs=None, clear_attrs=None, after_encoding=True, freezable=False,
         base=16, letter_case='upper', min_sz=4, reverse_str=False):
@@ -284,8 +291,7 @@ def CRC(vt=fvt.INT_str, poly=0x104c11db7, init_crc=0, xor_out=0xFFFFFFFF, rev=Tr
             self.reverse_str = reverse_str
 
         def __call__(self, nodes):
-            crc_func = crcmod.mkCrcFun(self.poly, initCrc=self.init_crc,
-                                       xorOut=self.xor_out, rev=self.rev)
+            crc_func = _get_crc_func(self.poly, self.init_crc, self.xor_out, self.rev)
             if isinstance(nodes, Node):
                 s = nodes.to_bytes() if after_encoding else nodes.get_raw_value()
             else:
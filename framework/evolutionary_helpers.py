@@ -22,6 +22,7 @@
 #
 ################################################################################
 
+import collections
 import math
 import re
 import functools
@@ -29,6 +30,7 @@ import uuid
 from operator import attrgetter
 
 from framework.tactics_helpers import *
+from framework.coverage import CoverageFeedback
 from framework.global_resources import UI
 from framework.scenario import *
 from framework.error_handling import ExtinctPopulationError, PopulationError, CrossOverError
@@ -260,22 +262,32 @@ class DefaultIndividual(Individual):
 
         self.score = None
         self.probability_of_survival = None  # between 0 and 1
+        self.energy = 1  # number of mutants to produce from this individual
         self.mutation_order = mutation_order
 
     def mutate(self):
         assert isinstance(self.data.content, Node)
-        data = self._fmk.process_data([('C', UI(nb=self.mutation_order))], seed=self.data)
+        seed = self.data
+        data = self._fmk.process_data([('C', UI(nb=self.mutation_order))], seed=seed)
         if data is None:
             raise PopulationError
-        data.add_info('Mutation applied on data {}'.format(data._data_id))
+        data.add_info('Mutation applied on data {}'.format(seed._data_id))
         self.data = data
 
 
 class DefaultPopulation(Population):
     """ Provide a default implementation of the Population base class """
 
+    # weights of the score components (refer to _compute_scores())
+    NOVELTY_WEIGHT = 50
+    NEW_COVERAGE_WEIGHT = 30
+    COVERAGE_WEIGHT = 10
+    ERROR_WEIGHT = 20
+    # reference of the feedback providing the coverage (refer to LocalTarget)
+    COVERAGE_FBK_REF = 'LocalTarget[coverage]'
+
     def _initialize(self, init_process, max_size=100, max_generation_nb=50,
-                    crossover_algo=CrossoverHelper.crossover_algo1):
+                    crossover_algo=CrossoverHelper.crossover_algo1, max_energy=4):
         """
             Configure the population
 
@@ -285,20 +297,26 @@ class DefaultPopulation(Population):
                 max_size (integer): maximum size of the population to manipulate
                 max_generation_nb (integer): criteria used to stop the evolution process
                 crossover_algo (func): Crossover algorithm to use
+                max_energy (integer): maximum number of mutants produced from an individual at
+                  each generation. The individuals with the best scores produce the most mutants.
         """
         Population._initialize(self)
 
         self.DATA_PROCESS = init_process
         self.MAX_SIZE = max_size
         self.MAX_GENERATION_NB = max_generation_nb
+        self.MAX_ENERGY = max_energy
         self.generation = None
         self.crossover_algo = crossover_algo
+        self._fbk_signatures = None
 
     def reset(self):
         """ Generate the first generation of individuals in a random way """
         Population.reset(self)
 
         self.generation = 1
+        # number of individuals that have triggered each kind of feedback
+        self._fbk_signatures = collections.Counter()
 
         # individuals initialization
         cpt = 0
@@ -312,10 +330,51 @@ class DefaultPopulation(Population):
             data.add_info(' |_ {!s}'.format(self.DATA_PROCESS))
             self._individuals.append(DefaultIndividual(self._fmk, data))
 
+    @classmethod
+    def _analyze_feedback(cls, feedback):
+        """
+        Returns:
+            tuple: the signature of the feedback (its status and content from each source),
+            the coverage it reports (None if not provided) and whether it reports an error
+        """
+        entries = []
+        coverage = None
+        error = False
+        for source, status, _, content in feedback or []:
+            # only the coverage feedback source is trusted, as the feedback of other sources
+            # could look the same
+            if str(source).endswith(cls.COVERAGE_FBK_REF):
+                cov = CoverageFeedback.from_bytes(content)
+                if cov is not None:
+                    coverage = cov
+                    continue
+            if status is not None and status < 0:
+                error = True
+            entries.append((str(source), status, content))
+        entries.sort(key=lambda x: (x[0], str(x[1]), x[2]))
+        return hash(tuple(entries)), coverage, error
+
     def _compute_scores(self):
-        """ Compute the scores of each individuals """
-        for individual in self._individuals:
-            individual.score = random.uniform(0, 100)
+        """
+        Compute the scores of each individuals from the feedback retrieved after their sending.
+        The rarer the feedback (with respect to all the individuals sent so far), the
+        higher the score. Reaching new coverage (refer to :class:`framework.coverage.CoverageFeedback`),
+        hitting many edges and triggering errors are also rewarded.
+        """
+        analyses = [self._analyze_feedback(ind.feedback) for ind in self._individuals]
+        for signature, _, _ in analyses:
+            self._fbk_signatures[signature] += 1
+        max_edges = max([cov.edges for _, cov, _ in analyses if cov is not None] + [1])
+
+        for individual, (signature, coverage, error) in zip(self._individuals, analyses):
+            score = self.NOVELTY_WEIGHT / self._fbk_signatures[signature]
+            if coverage is not None:
+                score += self.COVERAGE_WEIGHT * coverage.edges / max_edges
+                if coverage.new_coverage:
+                    score += self.NEW_COVERAGE_WEIGHT
+            if error:
+                score += self.ERROR_WEIGHT
+            individual.score = score
 
     def _compute_probability_of_survival(self):
         """ Normalize fitness scores between 0 and 1 """
@@ -329,6 +388,18 @@ class DefaultPopulation(Population):
             else:
                 ind.probability_of_survival = 0.50
 
+    def _compute_energy(self):
+        """ Power schedule: the best individuals will produce more mutants """
+
+        min_score = min(self._individuals, key=attrgetter('score')).score
+        max_score = max(self._individuals, key=attrgetter('score')).score
+
+        for ind in self._individuals:
+            if min_score != max_score:
+                ind.energy = 1 + round((self.MAX_ENERGY - 1) * (ind.score - min_score) / (max_score - min_score))
+            else:
+                ind.energy = 1
+
     def _kill(self):
         """ Simply rolls the dice """
         for i in range(len(self._individuals))[::-1]:
@@ -336,10 +407,33 @@ class DefaultPopulation(Population):
                 del self._individuals[i]
 
     def _mutate(self):
-        """ Operates three bit flips on each individual """
+        """
+        Operates bit flips on each individual. The individuals with energy produce additional
+        mutants, as long as the population is not full. The mutants are produced one at a time,
+        as most of the cost of a mutation is the copy of the seed, which each mutant needs
+        for its own.
+        """
+        room = math.inf if self.MAX_SIZE == -1 else self.MAX_SIZE - len(self._individuals)
+        offspring = []
+        for individual in sorted(self._individuals, key=attrgetter('energy'), reverse=True):
+            extra = min(individual.energy - 1, room)
+            if extra <= 0:
+                break
+            offspring += [DefaultIndividual(self._fmk, individual.data,
+                                            mutation_order=individual.mutation_order)
+                          for _ in range(extra)]
+            room -= extra
+
         for individual in self._individuals:
             individual.mutate()
 
+        for individual in offspring:
+            try:
+                individual.mutate()
+            except PopulationError:
+                continue
+            self._individuals.append(individual)
+
     def _crossover(self):
         """ Compensates the kills through the usage of the COMB disruptor """
         random.shuffle(self._individuals)
@@ -369,6 +463,7 @@ class DefaultPopulation(Population):
 
         self._compute_scores()
         self._compute_probability_of_survival()
+        self._compute_energy()
         self._kill()
         self._mutate()
         self._crossover()
@@ -501,15 +501,16 @@ class NodeConsumerStub(object):
     # The methods save_node() & recover_node() does not work for all situations
     def save_node(self, node):
         '''
-        Generic way to save a node (can impact performance)
+        Generic way to save a node (the state of the subgraph is captured, but not
+        its structure)
         '''
-        self.__node_backup = node.get_internals_backup()
+        self.__node_backup = node.get_state_snapshot()
 
     def recover_node(self, node):
         '''
         Generic way to recover a node
         '''
-        node.set_internals(self.__node_backup)
+        node.restore_state_snapshot(self.__node_backup)
 
     def still_interested_by(self, node):
         return False
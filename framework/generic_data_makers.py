@@ -236,7 +236,7 @@ class sd_walk_data_model(StatefulDisruptor):
         data.add_info('current node:     {!s}'.format(self.modelwalker.consumed_node_path))
 
         if self.clone_node:
-            exported_node = Node(rnode.name, base_node=rnode, new_env=True)
+            exported_node = Node(rnode.name, base_node=rnode, new_env=True, cow=True)
         else:
             exported_node = rnode
 
@@ -392,7 +392,7 @@ class sd_fuzz_typed_nodes(StatefulDisruptor):
         data.add_info('                      (ascii): {!s}'.format(truncate_info(corrupt_node_bytes)))
 
         if self.clone_node:
-            exported_node = Node(rnode.name, base_node=rnode, new_env=True)
+            exported_node = Node(rnode.name, base_node=rnode, new_env=True, cow=True)
         else:
             exported_node = rnode
 
@@ -493,7 +493,7 @@ class sd_switch_to_alternate_conf(StatefulDisruptor):
         data.add_info(' |_ original node value: {!s}'.format(truncate_info(orig_node_val)))
 
         if self.clone_node:
-            exported_node = Node(rnode.name, base_node=rnode, new_env=True)
+            exported_node = Node(rnode.name, base_node=rnode, new_env=True, cow=True)
             data.update_from(exported_node)
         else:
             data.update_from(rnode)
@@ -1629,7 +1629,7 @@ class sd_walk_csp_solutions(StatefulDisruptor):
                 data.add_info(f'     --> {var}: {value}')
 
             if self.clone_node:
-                exported_node = Node(self.seed.name, base_node=self.seed, new_env=True)
+                exported_node = Node(self.seed.name, base_node=self.seed, new_env=True, cow=True)
                 data.update_from(exported_node)
             else:
                 data.update_from(self.seed)
@@ -1755,7 +1755,7 @@ class sd_constraint_fuzz(StatefulDisruptor):
             data.add_info(f'     --> {var}: {value}')
 
         if self.clone_node:
-            exported_node = Node(self.seed.name, base_node=self.seed, new_env=True)
+            exported_node = Node(self.seed.name, base_node=self.seed, new_env=True, cow=True)
             data.update_from(exported_node)
         else:
             data.update_from(self.seed)
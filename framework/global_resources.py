@@ -24,6 +24,7 @@
 import os
 import sys
 import copy
+import mmap
 import inspect
 from enum import Enum
 
@@ -123,6 +124,19 @@ def convert_to_internal_repr(val):
 
     return val
 
+def convert_to_internal_view(val):
+    """
+    Return a :class:`memoryview` over the internal representation of `val`. Bytes-like
+    objects (bytes, bytearray, mmap, memoryview) are not copied, so that slicing the
+    result does not copy the data either.
+    """
+    if isinstance(val, memoryview):
+        return val if val.format == 'B' and val.ndim == 1 else val.cast('B')
+    elif isinstance(val, (bytes, bytearray, mmap.mmap)):
+        return memoryview(val)
+    else:
+        return memoryview(convert_to_internal_repr(val))
+
 def unconvert_from_internal_repr(val):
     try:
         val = val.decode(internal_repr_codec, 'strict')
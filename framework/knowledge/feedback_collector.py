@@ -29,12 +29,13 @@ import collections
 class FeedbackSource(object):
 
     def __init__(self, src, subref=None, reliability=None, related_tg=None,
-                 display_feedback=True):
+                 display_feedback=True, related_data=None):
         self._subref = subref
         self._name = str(src) if subref is None else str(src) + ' - ' + str(subref)
         self._obj = src
         self._reliability = reliability
         self._related_tg = related_tg
+        self._related_data = related_data  # when the feedback is not related to the last sent data
         self._display_feedback = display_feedback
 
     def __str__(self):
@@ -54,6 +55,10 @@ class FeedbackSource(object):
     def related_tg(self):
         return self._related_tg
 
+    @property
+    def related_data(self):
+        return self._related_data
+
     @property
     def display_feedback(self):
         return self._display_feedback
@@ -417,7 +417,7 @@ class Logger(object):
             else:
                 self._current_fmk_info.append((info, now))
 
-    def collect_feedback(self, content, status_code=None, subref=None, fbk_src=None):
+    def collect_feedback(self, content, status_code=None, subref=None, fbk_src=None, related_data=None):
         """
         Used within the scope of the Logger feedback-collector infrastructure.
         If your target implement the interface :meth:`Target.get_feedback`, no need to
@@ -430,12 +430,15 @@ class Logger(object):
             status_code (int): should be negative for error
             subref (str): specific reference to distinguish internal log sources within the same caller
             fbk_src: [optional] source object of the feedback
+            related_data (Data): [optional] data the feedback is related to, if it is not
+              the last data sent (e.g., when several data are processed concurrently by the target)
         """
         now = datetime.datetime.now()
         fbk_src = get_caller_object() if fbk_src is None else fbk_src
 
         with self._tg_fbk_lck:
-            self._tg_fbk.append((now, FeedbackSource(fbk_src, subref=subref), content, status_code))
+            self._tg_fbk.append((now, FeedbackSource(fbk_src, subref=subref, related_data=related_data),
+                                 content, status_code))
 
     def shall_record(self):
         if self.last_data_recordable or not self.__explicit_data_recording:
@@ -480,7 +483,9 @@ class Logger(object):
 
         if record:
             assert isinstance(source, FeedbackSource)
-            if source.related_tg is not None:
+            if source.related_data is not None and source.related_data.get_data_id() is not None:
+                data_id = source.related_data.get_data_id()
+            elif source.related_tg is not None:
                 try:
                     data_id = self._last_data_IDs[source.related_tg]
                 except KeyError:
@@ -36,7 +36,9 @@ import traceback
 import uuid
 import struct
 import math
+import mmap
 import time
+import weakref
 
 from pprint import pprint as pp
 
@@ -477,6 +479,7 @@ class NodeCustomization(object):
     def __init__(self, items_to_set=None, items_to_clear=None, transform_func=None):
         self._transform_func = transform_func
         self._custo_items = copy.copy(self._custo_items)
+        self._internals = None  # the NodeInternals customized by this object
         if items_to_set is not None:
             self.set_items(items_to_set)
         if items_to_clear is not None:
@@ -488,7 +491,12 @@ class NodeCustomization(object):
         else:
             return None
 
+    def _notify_change(self):
+        if self._internals is not None:
+            self._internals._notify_value_change()
+
     def set_items(self, items_to_set):
+        self._notify_change()
         if isinstance(items_to_set, int):
             assert(items_to_set in self._custo_items)
             self._custo_items[items_to_set] = True
@@ -500,6 +508,7 @@ class NodeCustomization(object):
             raise ValueError
 
     def clear_items(self, items_to_clear):
+        self._notify_change()
         if isinstance(items_to_clear, int):
             assert(items_to_clear in self._custo_items)
             self._custo_items[items_to_clear] = False
@@ -511,6 +520,7 @@ class NodeCustomization(object):
             raise ValueError
 
     def copy_from(self, node_custo):
+        self._notify_change()
         self._custo_items = copy.copy(node_custo._custo_items)
 
     @property
@@ -519,6 +529,7 @@ class NodeCustomization(object):
 
     @transform_func.setter
     def transform_func(self, func):
+        self._notify_change()
         self._transform_func = func
 
 
@@ -526,6 +537,7 @@ class NodeCustomization(object):
         new_custo = type(self)()
         new_custo.__dict__.update(self.__dict__)
         new_custo._custo_items = copy.copy(self._custo_items)
+        new_custo._internals = None
         return new_custo
 
 class NonTermCusto(NodeCustomization):
@@ -578,6 +590,7 @@ class NonTermCusto(NodeCustomization):
 
     @full_combinatory_mode.setter
     def full_combinatory_mode(self, val: bool):
+        self._notify_change()
         self._custo_items[self.FullCombinatory] = val
 
     @property
@@ -641,6 +654,16 @@ class FuncCusto(NodeCustomization):
         return self._custo_items[self.CloneExtNodeArgs]
 
 
+def _changes_value(method):
+    # Decorator for the NodeInternals methods that may change the value of the node,
+    # which have to notify it first (cf. NodeInternals._notify_value_change())
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._notify_value_change()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 class NodeInternals(object):
     """
     Base class for implementing the contents of a node.
@@ -660,8 +683,40 @@ class NodeInternals(object):
 
     DISABLED = 100
 
+    # The attributes are stored within a bitmask. Each attribute is
+    # associated to its bit below.
+    _attr_bits = {
+        ### GENERIC ###
+        Freezable: 1 << 0,
+        Mutable: 1 << 1,
+        Determinist: 1 << 2,
+        Finite: 1 << 3,
+        # Used for absorption
+        Abs_Postpone: 1 << 4,
+        # Used to distinguish separator
+        Separator: 1 << 5,
+        AutoSeparator: 1 << 6,
+        # Used to display visual effect when the node is printed on the console
+        Highlight: 1 << 7,
+        # Used for debugging purpose
+        DEBUG: 1 << 8,
+        # Used to express that someone (a disruptor for instance) is
+        # currently doing something with the node and doesn't want
+        # that someone else modify it.
+        LOCKED: 1 << 9,
+        ### INTERNAL USAGE ###
+        DISABLED: 1 << 10
+        }
+
+    _default_attrs = _attr_bits[Freezable] | _attr_bits[Mutable] | _attr_bits[Determinist]
+
     default_custo = None
 
+    # A __dict__ is still provided for the attributes which could be added by
+    # the NodeInternals subclasses defined outside of this module
+    __slots__ = ('private', 'absorb_helper', 'absorb_constraints', '_custo', '_env', '_owner',
+                 '__attrs', '_sync_with', '__dict__', '__weakref__')
+
     def __hash__(self):
         return id(self)
 
@@ -670,31 +725,12 @@ class NodeInternals(object):
         self.private = None
         self.absorb_helper = None
         self.absorb_constraints = None
-        self.custo = None
+        self._custo = None
         self._env = None
+        # Node whose serialized value depends on these internals (cf. Node.to_bytes())
+        self._owner = None
 
-        self.__attrs = {
-            ### GENERIC ###
-            NodeInternals.Freezable: True,
-            NodeInternals.Mutable: True,
-            NodeInternals.Determinist: True,
-            NodeInternals.Finite: False,
-            # Used for absorption
-            NodeInternals.Abs_Postpone: False,
-            # Used to distinguish separator
-            NodeInternals.Separator: False,
-            NodeInternals.AutoSeparator: False,
-            # Used to display visual effect when the node is printed on the console
-            NodeInternals.Highlight: False,
-            # Used for debugging purpose
-            NodeInternals.DEBUG: False,
-            # Used to express that someone (a disruptor for instance) is
-            # currently doing something with the node and doesn't want
-            # that someone else modify it.
-            NodeInternals.LOCKED: False,
-            ### INTERNAL USAGE ###
-            NodeInternals.DISABLED: False
-            }
+        self.__attrs = NodeInternals._default_attrs
 
         self._sync_with = None
         self.customize(self.default_custo)
@@ -711,7 +747,7 @@ class NodeInternals(object):
         self.absorb_constraints = node_internals.absorb_constraints
 
         if self.__class__ == node_internals.__class__:
-            self.custo = node_internals.custo
+            self.custo = copy.copy(node_internals.custo)
             self.absorb_helper = node_internals.absorb_helper
         else:
             if self._sync_with is not None and SyncScope.Size in self._sync_with:
@@ -720,11 +756,12 @@ class NodeInternals(object):
                 del self._sync_with[SyncScope.Size]
 
     def get_attrs_copy(self):
-        return (copy.copy(self.__attrs), copy.copy(self.custo))
+        return (self.__attrs, copy.copy(self.custo))
 
     def set_attrs_from(self, all_attrs):
+        self._notify_attrs_change()
         self.__attrs = all_attrs[0]
-        self.custo = all_attrs[1]
+        self.custo = copy.copy(all_attrs[1])
 
     def _init_specific(self, arg):
         pass
@@ -738,6 +775,20 @@ class NodeInternals(object):
     def customize(self, custo):
         self.custo = copy.copy(custo)
 
+    @property
+    def custo(self):
+        return self._custo
+
+    @custo.setter
+    def custo(self, custo):
+        self._notify_value_change()
+        self._attach_custo(custo)
+
+    def _attach_custo(self, custo):
+        if custo is not None:
+            custo._internals = self
+        self._custo = custo
+
     @property
     def env(self):
         return self._env
@@ -746,6 +797,32 @@ class NodeInternals(object):
     def env(self, src):
         self._env = src
 
+    def _notify_structure_change(self):
+        # Shall be called when the nodes reachable from this one change
+        # (cf. Node.get_all_paths())
+        if self._env is not None:
+            self._env.structure_version += 1
+
+    def _notify_attrs_change(self):
+        # Shall be called when the attributes change (cf. Node.iter_reachable_nodes())
+        self._notify_value_change()
+        if self._env is not None:
+            self._env.attrs_version += 1
+
+    def _notify_value_change(self):
+        # Shall be called before any change of the node internals which may alter the value
+        # of the node, as the ones performed directly on them do not go through
+        # Node._notify_update()
+        env = self._env
+        if env is not None and env._cow_contexts:
+            env.preserve_cow_clones(self)
+        owner = self._owner
+        if owner is not None:
+            self._owner = None
+            owner._invalidate_bytes_cache()
+            if owner._static_region is not None:
+                owner._static_region.value = None
+
     def has_subkinds(self):
         return False
 
@@ -778,10 +855,10 @@ class NodeInternals(object):
 
     def make_private(self, ignore_frozen_state, accept_external_entanglement, delayed_node_internals,
                      forget_original_sync_objs=False):
+        self._owner = None
         if self.private is not None:
             self.private = copy.copy(self.private)
         self.absorb_constraints = copy.copy(self.absorb_constraints)
-        self.__attrs = copy.copy(self.__attrs)
 
         if forget_original_sync_objs:
             self._sync_with = None
@@ -791,7 +868,7 @@ class NodeInternals(object):
             self._sync_with = copy.copy(self._sync_with)
 
         self._make_private_specific(ignore_frozen_state, accept_external_entanglement)
-        self.custo = copy.copy(self.custo)
+        self._attach_custo(copy.copy(self._custo))
 
     # Called near the end of Node copy (Node.set_contents) to update
     # node references inside the NodeInternals
@@ -828,6 +905,24 @@ class NodeInternals(object):
     def _make_private_specific(self, ignore_frozen_state, accept_external_entanglement):
         pass
 
+    # Called by Node.get_state_snapshot(). The returned state shall not be
+    # altered by the subsequent changes of the node internals.
+    def _get_state(self):
+        return (self.__attrs, self._get_state_specific())
+
+    # Called by Node.restore_state_snapshot(). As a snapshot can be restored
+    # several times, @state shall not be altered.
+    @_changes_value
+    def _set_state(self, state):
+        self.__attrs, specific_state = state
+        self._set_state_specific(specific_state)
+
+    def _get_state_specific(self):
+        return None
+
+    def _set_state_specific(self, state):
+        pass
+
 
     def absorb(self, blob, constraints, conf, pending_postpone_desc=None):
         raise NotImplementedError
@@ -843,33 +938,46 @@ class NodeInternals(object):
         raise NotImplementedError
 
     def set_attr(self, name):
-        if name not in self.__attrs:
+        bit = self._attr_bits.get(name, None)
+        if bit is None:
             raise ValueError
         if self._make_specific(name):
-            self.__attrs[name] = True
+            if not self.__attrs & bit:
+                self._notify_attrs_change()
+                self.__attrs |= bit
 
     def clear_attr(self, name):
-        if name not in self.__attrs:
+        bit = self._attr_bits.get(name, None)
+        if bit is None:
             raise ValueError
         if self._unmake_specific(name):
-            self.__attrs[name] = False
+            if self.__attrs & bit:
+                self._notify_attrs_change()
+                self.__attrs &= ~bit
 
     # To be used on very specific case only
     def _set_attr_direct(self, name):
-        if name not in self.__attrs:
+        bit = self._attr_bits.get(name, None)
+        if bit is None:
             raise ValueError
-        self.__attrs[name] = True
+        if not self.__attrs & bit:
+            self._notify_attrs_change()
+            self.__attrs |= bit
 
     # To be used on very specific case only
     def _clear_attr_direct(self, name):
-        if name not in self.__attrs:
+        bit = self._attr_bits.get(name, None)
+        if bit is None:
             raise ValueError
-        self.__attrs[name] = False
+        if self.__attrs & bit:
+            self._notify_attrs_change()
+            self.__attrs &= ~bit
 
     def is_attr_set(self, name):
-        if name not in self.__attrs:
+        bit = self._attr_bits.get(name, None)
+        if bit is None:
             raise ValueError
-        return self.__attrs[name]
+        return bool(self.__attrs & bit)
 
     def set_child_attr(self, name, conf=None, all_conf=False, recursive=False):
         pass
@@ -902,8 +1010,9 @@ class NodeInternals(object):
         if criteria is None:
             return True
 
+        attrs = self.__attrs
         for c in criteria:
-            if not self.__attrs[c]:
+            if not attrs & self._attr_bits[c]:
                 return False
         return True
 
@@ -939,8 +1048,9 @@ class NodeInternals(object):
         if criteria is None:
             return True
 
+        attrs = self.__attrs
         for c in criteria:
-            if self.__attrs[c]:
+            if attrs & self._attr_bits[c]:
                 return False
         return True
 
@@ -1272,9 +1382,10 @@ class DynNode_Helpers(object):
             # print('*** DynHelper: delayed update')
             new_node_pos = {}
             # new_node_ids = {}
-            for old_id, new_id in env.id_list:
-                pos = self._node_pos.get(old_id, None)
-                if pos is not None:
+            id_map = env.id_map
+            for old_id, pos in self._node_pos.items():
+                new_id = id_map.get(old_id, None)
+                if new_id is not None:
                     # print('*** DynHelper: updated')
                     new_node_pos[new_id] = pos
                     # idx = self._node_ids.index(old_id)
@@ -1295,6 +1406,9 @@ class DynNode_Helpers(object):
 
 
 class NodeInternals_Empty(NodeInternals):
+
+    __slots__ = ()
+
     def _get_value(self, conf=None, recursive=True, return_node_internals=False, restrict_csp=False):
         if return_node_internals:
             return (Node.DEFAULT_DISABLED_NODEINT, True)
@@ -1309,16 +1423,17 @@ class NodeInternals_Empty(NodeInternals):
         print('\n*** Empty Node: {!s}'.format(hex(id(self))))
         # raise AttributeError
 
-    def get_child_nodes_by_attr(self, internals_criteria, semantics_criteria, owned_conf, conf, path_regexp,
-                                exclude_self, respect_order, relative_depth, top_node, ignore_fstate,
-                                resolve_generator=False):
-        return None
+    def get_child_nodes(self, ignore_fstate=False):
+        return ()
 
 
 class NodeInternals_GenFunc(NodeInternals):
 
     default_custo = GenFuncCusto()
 
+    __slots__ = ('_generated_node', '_node_helpers', '_trigger_registered', 'generator_arg',
+                 'generator_func', 'node_arg', 'pdepth', 'provide_helpers')
+
     def _init_specific(self, arg):
         self._generated_node = None
         self.generator_func = None
@@ -1383,6 +1498,14 @@ class NodeInternals_GenFunc(NodeInternals):
         # The call to 'self._node_helpers.make_private()' is performed
         # the latest that is during self.make_args_private()
 
+    def _get_state_specific(self):
+        # The generated node is kept as is, its state being part of the snapshot
+        return (self._generated_node, self._trigger_registered, copy.copy(self._node_helpers))
+
+    def _set_state_specific(self, state):
+        self._generated_node, self._trigger_registered, node_helpers = state
+        self._node_helpers = copy.copy(node_helpers)
+
     def make_args_private(self, node_dico, entangled_set, ignore_frozen_state, accept_external_entanglement):
         self._node_helpers.make_private(self.env)
 
@@ -1464,12 +1587,15 @@ class NodeInternals_GenFunc(NodeInternals):
                 self.node_arg = l
 
 
+    @_changes_value
     def reset_generator(self):
         self._generated_node = None
 
     @property
     def generated_node(self):
         if self._generated_node is None:
+            if self.env is not None and self.env._cow_contexts:
+                self.env.preserve_cow_clones(self)
             
             if self.generator_arg is not None and self.node_arg is not None:
                 if self.provide_helpers:
@@ -1512,6 +1638,7 @@ class NodeInternals_GenFunc(NodeInternals):
 
     # generated_node = property(fget=_get_generated_node)
 
+    @_changes_value
     def import_generator_func(self, generator_func,
                               generator_node_arg=None, generator_arg=None,
                               provide_helpers=False):
@@ -1526,6 +1653,7 @@ class NodeInternals_GenFunc(NodeInternals):
         self.generator_arg = generator_arg
 
 
+    @_changes_value
     def set_generator_func_arg(self, generator_node_arg=None, generator_arg=None):
         if generator_node_arg is None and generator_arg is None:
             raise ValueError("At least an argument shall not be None!")
@@ -1565,6 +1693,7 @@ class NodeInternals_GenFunc(NodeInternals):
     def get_raw_value(self, **kwargs):
         return self.generated_node.get_raw_value(**kwargs)
 
+    @_changes_value
     def absorb(self, blob, constraints, conf, pending_postpone_desc=None):
         # We make the generator freezable to be sure that _get_value()
         # won't reset it after absorption
@@ -1586,13 +1715,16 @@ class NodeInternals_GenFunc(NodeInternals):
 
         return st, off, sz, None
 
+    @_changes_value
     def cancel_absorb(self):
         self.generated_node.reset_state()
         # self.generated_node.cancel_absorb()
 
+    @_changes_value
     def confirm_absorb(self):
         self.generated_node.confirm_absorb()
 
+    @_changes_value
     def reset_state(self, recursive=False, exclude_self=False, conf=None, ignore_entanglement=False):
         if self.is_attr_set(NodeInternals.Mutable):
             self._trigger_registered = False
@@ -1621,6 +1753,7 @@ class NodeInternals_GenFunc(NodeInternals):
         else:
             return None if self._generated_node is None else self.generated_node.is_frozen()
 
+    @_changes_value
     def unfreeze(self, conf=None, recursive=True, dont_change_state=False, ignore_entanglement=False,
                  only_generators=False, reevaluate_constraints=False):
         # if self.is_attr_set(NodeInternals.DEBUG):
@@ -1639,6 +1772,7 @@ class NodeInternals_GenFunc(NodeInternals):
             else:
                 pass
 
+    @_changes_value
     def unfreeze_all(self, recursive=True, ignore_entanglement=False):
         # if self.is_attr_set(NodeInternals.Mutable):
         if self.custo.reset_on_unfreeze_mode:
@@ -1680,14 +1814,8 @@ class NodeInternals_GenFunc(NodeInternals):
         if self._generated_node is not None:
             self._generated_node._reset_depth(parent_depth=self.pdepth)
 
-    def get_child_nodes_by_attr(self, internals_criteria, semantics_criteria, owned_conf, conf, path_regexp,
-                                exclude_self, respect_order, relative_depth, top_node, ignore_fstate,
-                                resolve_generator=False):
-        return self.generated_node.get_reachable_nodes(internals_criteria, semantics_criteria, owned_conf, conf,
-                                                       path_regexp=path_regexp, exclude_self=False,
-                                                       respect_order=respect_order, relative_depth=relative_depth,
-                                                       top_node=top_node, ignore_fstate=ignore_fstate,
-                                                       resolve_generator=resolve_generator)
+    def get_child_nodes(self, ignore_fstate=False):
+        return (self.generated_node,)
 
     def set_child_current_conf(self, node, conf, reverse, ignore_entanglement):
         if self.custo.forward_conf_change_mode:
@@ -1696,15 +1824,25 @@ class NodeInternals_GenFunc(NodeInternals):
                                                conf, reverse,
                                                ignore_entanglement=ignore_entanglement)
 
-    def get_child_all_path(self, name, htable, conf, recursive, resolve_generator=False):
+    def get_child_all_path(self, name, htable, conf, recursive, resolve_generator=False,
+                           generators=None):
         if self.env is not None:
-            self.generated_node._get_all_paths_rec(name, htable, conf, recursive=recursive,
-                                                   first=False, resolve_generator=resolve_generator)
+            node = self.generated_node
+            node._get_all_paths_rec(name, htable, conf, recursive=recursive, first=False,
+                                    resolve_generator=resolve_generator, generators=generators)
+            if generators is not None:
+                # A generated terminal node only adds its own path, which can thus be updated
+                # in place when a new node is generated (cf. Node.get_all_paths())
+                path = next(reversed(htable))
+                if htable[path] is not node or not node._is_term_for_paths(conf):
+                    path = None
+                generators.append((self, node, path, conf))
         else:
             # If self.env is None, that means that a node graph is not fully constructed
             # thus we avoid a freeze side-effect (by resolving 'generated_node') of the
             # graph while it is currently manipulated in some way.
-            pass
+            if generators is not None:
+                generators.append((self, self._generated_node, None, conf))
 
     def set_clone_info(self, info, node):
         self._node_helpers.set_graph_info(node, info)
@@ -1713,6 +1851,7 @@ class NodeInternals_GenFunc(NodeInternals):
     def clear_clone_info_since(self, node):
         self._node_helpers.clear_graph_info_since(node)
 
+    @_changes_value
     def set_size_from_constraints(self, size, encoded_size):
         if self.env is not None:
             self.generated_node.set_size_from_constraints(size=size, encoded_size=encoded_size)
@@ -1730,6 +1869,9 @@ class NodeInternals_GenFunc(NodeInternals):
 
 
 class NodeInternals_Term(NodeInternals):
+
+    __slots__ = ('frozen_node',)
+
     def _init_specific(self, arg):
         self.frozen_node = None
 
@@ -1747,10 +1889,25 @@ class NodeInternals_Term(NodeInternals):
 
     def _make_private_term_specific(self, ignore_frozen_state, accept_external_entanglement):
         pass
+
+    def _get_state_specific(self):
+        return (self.frozen_node, self._get_term_state_specific())
+
+    def _set_state_specific(self, state):
+        self.frozen_node, term_state = state
+        self._set_term_state_specific(term_state)
+
+    def _get_term_state_specific(self):
+        return None
+
+    def _set_term_state_specific(self, state):
+        pass
         
+    @_changes_value
     def _set_frozen_value(self, val):
         self.frozen_node = val
 
+    @_changes_value
     def _set_default_value(self, val):
         self.frozen_node = None
         self._set_default_value_specific(val)
@@ -1788,6 +1945,7 @@ class NodeInternals_Term(NodeInternals):
     def get_raw_value(self, **kwargs):
         return self._get_value()
 
+    @_changes_value
     def absorb(self, blob, constraints, conf, pending_postpone_desc=None):
         status = None
         size = None
@@ -1797,7 +1955,8 @@ class NodeInternals_Term(NodeInternals):
 
         if self.absorb_helper is not None:
             try:
-                status, off, size = self.absorb_helper(blob, constraints, self)
+                # the helpers provided by the data models expect bytes
+                status, off, size = self.absorb_helper(bytes(blob), constraints, self)
             except:
                 print("Warning: absorb_helper '{!r}' has crashed! (thus, use default values)".format(self.absorb_helper))
                 status, off, size = AbsorbStatus.Accept, 0, None
@@ -1820,10 +1979,12 @@ class NodeInternals_Term(NodeInternals):
 
         return st, off, size, None
 
+    @_changes_value
     def cancel_absorb(self):
         self.do_revert_absorb()
         self.do_cleanup_absorb()
         
+    @_changes_value
     def confirm_absorb(self):
         self.do_cleanup_absorb()
 
@@ -1839,6 +2000,7 @@ class NodeInternals_Term(NodeInternals):
     def do_cleanup_absorb(self):
         raise NotImplementedError
 
+    @_changes_value
     def reset_state(self, recursive=False, exclude_self=False, conf=None, ignore_entanglement=False):
         self._reset_state_specific(recursive, exclude_self, conf, ignore_entanglement)
         if not exclude_self:
@@ -1853,6 +2015,7 @@ class NodeInternals_Term(NodeInternals):
     def is_frozen(self):
         return self.frozen_node is not None
 
+    @_changes_value
     def unfreeze(self, conf=None, recursive=True, dont_change_state=False, ignore_entanglement=False, only_generators=False,
                  reevaluate_constraints=False):
         if only_generators:
@@ -1869,9 +2032,11 @@ class NodeInternals_Term(NodeInternals):
     def _unfreeze_reevaluate_constraints(self, current_val):
         pass
 
+    @_changes_value
     def unfreeze_all(self, recursive=True, ignore_entanglement=False):
         self.frozen_node = None
 
+    @_changes_value
     def update_value(self, value):
         self.frozen_node = self._update_value_specific(value)
 
@@ -1887,20 +2052,21 @@ class NodeInternals_Term(NodeInternals):
     def reset_depth_specific(self, depth):
         pass
 
-    def get_child_nodes_by_attr(self, internals_criteria, semantics_criteria, owned_conf, conf, path_regexp,
-                                exclude_self, respect_order, relative_depth, top_node, ignore_fstate,
-                                resolve_generator=False):
-        return None
+    def get_child_nodes(self, ignore_fstate=False):
+        return ()
 
     def set_child_current_conf(self, node, conf, reverse, ignore_entanglement):
         pass
 
-    def get_child_all_path(self, name, htable, conf, recursive, resolve_generator=False):
+    def get_child_all_path(self, name, htable, conf, recursive, resolve_generator=False,
+                           generators=None):
         pass
 
 
 class NodeInternals_TypedValue(NodeInternals_Term):
 
+    __slots__ = ('value_type', '__fuzzy_values')
+
     def _init_specific(self, arg):
         NodeInternals_Term._init_specific(self, arg)
         self.value_type = None
@@ -1919,6 +2085,7 @@ class NodeInternals_TypedValue(NodeInternals_Term):
     def _set_default_value_specific(self, val):
         self.value_type.set_default_value(val)
 
+    @_changes_value
     def import_value_type(self, value_type):
         self.value_type = value_type
         # if self.env is not None:
@@ -1937,9 +2104,11 @@ class NodeInternals_TypedValue(NodeInternals_Term):
     def get_value_type(self):
         return self.value_type
 
+    @_changes_value
     def set_size_from_constraints(self, size, encoded_size):
         self.value_type.set_size_from_constraints(size=size, encoded_size=encoded_size)
 
+    @_changes_value
     def set_specific_fuzzy_values(self, vals):
         self.__fuzzy_values = vals
         self.value_type.add_specific_fuzzy_vals(vals)
@@ -1956,6 +2125,17 @@ class NodeInternals_TypedValue(NodeInternals_Term):
             self.value_type.make_random()
         self.__fuzzy_values = copy.copy(self.__fuzzy_values)
 
+    def _get_term_state_specific(self):
+        vt = copy.copy(self.value_type)
+        vt.make_private(forget_current_state=False)
+        return (vt, copy.copy(self.__fuzzy_values))
+
+    def _set_term_state_specific(self, state):
+        vt, fuzzy_values = state
+        self.value_type = copy.copy(vt)
+        self.value_type.make_private(forget_current_state=False)
+        self.__fuzzy_values = copy.copy(fuzzy_values)
+
     def _get_value_specific(self, conf=None, recursive=True):
         ret = self.value_type.get_value()
         return NodeInternals_Term._convert_to_internal_repr(ret)
@@ -2016,6 +2196,8 @@ class NodeInternals_TypedValue(NodeInternals_Term):
 class NodeInternals_Func(NodeInternals_Term):
     default_custo = FuncCusto()
 
+    __slots__ = ('fct', 'fct_arg', 'node_arg', 'provide_helpers', '_node_helpers')
+
     def _init_specific(self, arg):
         NodeInternals_Term._init_specific(self, arg)
         self.fct = None
@@ -2024,6 +2206,7 @@ class NodeInternals_Func(NodeInternals_Term):
         self._node_helpers = DynNode_Helpers()
         self.provide_helpers = False
 
+    @_changes_value
     def import_func(self, fct, fct_node_arg=None, fct_arg=None,
                     provide_helpers=False):
 
@@ -2052,6 +2235,7 @@ class NodeInternals_Func(NodeInternals_Term):
         else:
             return
 
+    @_changes_value
     def set_func_arg(self, node=None, fct_arg=None):
         if node is None and fct_arg is None:
             raise ValueError("At least an argument shall not be None!")
@@ -2175,6 +2359,13 @@ class NodeInternals_Func(NodeInternals_Term):
         # The call to 'self._node_helpers.make_private()' is performed
         # the latest that is during self.make_args_private()
 
+    def _get_term_state_specific(self):
+        return copy.copy(self._node_helpers)
+
+    def _set_term_state_specific(self, state):
+        self._node_helpers = copy.copy(state)
+
+    @_changes_value
     def absorb(self, blob, constraints, conf, pending_postpone_desc=None):
         # we make the generator freezable to be sure that _get_value()
         # won't reset it after absorption
@@ -2182,13 +2373,15 @@ class NodeInternals_Func(NodeInternals_Term):
 
         sz = len(convert_to_internal_repr(self._get_value()))
 
-        self._set_frozen_value(blob[:sz])
+        self._set_frozen_value(bytes(blob[:sz]))
 
         return AbsorbStatus.Absorbed, 0, sz, None
 
+    @_changes_value
     def cancel_absorb(self):
         self._set_frozen_value(None)
 
+    @_changes_value
     def confirm_absorb(self):
         pass
 
@@ -2287,6 +2480,7 @@ class NodeInternals_Func(NodeInternals_Term):
 
         return NodeInternals_Term._convert_to_internal_repr(ret)
 
+    @_changes_value
     def set_size_from_constraints(self, size, encoded_size):
         # not supported
         raise DataModelDefinitionError
@@ -2452,6 +2646,13 @@ class NodeInternals_NonTerm(NodeInternals):
 
     default_custo = NonTermCusto()
 
+    __slots__ = ('subnodes_set', 'subnodes_order', 'subnodes_order_total_weight', 'subnodes_attrs',
+                 'frozen_node_list', 'current_flattened_nodelist', 'separator', 'encoder',
+                 'component_seed', 'excluded_components', 'combinatory_complete',
+                 'exhausted_shapes', 'exhausted_pick_cases', 'current_pick_section',
+                 'current_picked_node_idx', 'cursor_maj', 'cursor_min', 'previous_cursor_maj',
+                 'previous_cursor_min', '_nodes_drawn_qty', '_reevaluation_pending')
+
     def _init_specific(self, arg):
         self.encoder = None
         self.subnodes_set = None
@@ -2469,6 +2670,7 @@ class NodeInternals_NonTerm(NodeInternals):
 
         self.reset()
 
+    @_changes_value
     def reset(self, nodes_drawn_qty=None, custo=None, exhaust_info=None, preserve_node=False):
         self.subnodes_set = set()
         self.subnodes_order = []
@@ -2491,6 +2693,7 @@ class NodeInternals_NonTerm(NodeInternals):
         else:
             self.customize(custo)
 
+    @_changes_value
     def set_encoder(self, encoder):
         self.encoder = encoder
         encoder.reset()
@@ -2552,6 +2755,7 @@ class NodeInternals_NonTerm(NodeInternals):
         return flatten_list, pick_section_amount
 
 
+    @_changes_value
     def import_subnodes_basic(self, node_list, separator=None, preserve_node=False):
         self.reset(preserve_node=preserve_node)
 
@@ -2565,6 +2769,7 @@ class NodeInternals_NonTerm(NodeInternals):
             self.subnodes_attrs[node] = NodeInternals_NonTerm.NodeAttrs()
             self.subnodes_attrs[node].qty = [1, 1]
 
+    @_changes_value
     def import_subnodes_with_csts(self, wlnode_list, separator=None, preserve_node=False):
         self.reset(preserve_node=preserve_node)
 
@@ -2636,6 +2841,7 @@ class NodeInternals_NonTerm(NodeInternals):
 
             self.subnodes_order.append(subnode_list)
 
+    @_changes_value
     def import_subnodes_full_format(self, subnodes_order=None, subnodes_attrs=None,
                                     frozen_node_list=None, current_flat_nodelist=None, internals=None,
                                     nodes_drawn_qty=None, custo=None, exhaust_info=None,
@@ -2682,6 +2888,7 @@ class NodeInternals_NonTerm(NodeInternals):
             raise ValueError
 
 
+    @_changes_value
     def change_subnodes_csts(self, csts_ch):
 
         modified_csts = {}
@@ -2716,10 +2923,99 @@ class NodeInternals_NonTerm(NodeInternals):
             if ignore_frozen_state:
                 self.encoder.reset()
 
+    def _get_state_specific(self):
+        # The nodes of the frozen list are kept as is, their states being part of the snapshot
+        return (copy.copy(self.frozen_node_list), copy.copy(self.current_flattened_nodelist),
+                (self.exhausted_shapes, copy.copy(self.excluded_components), self.combinatory_complete,
+                 self.component_seed, self.exhausted_pick_cases),
+                (self.current_pick_section, self.current_picked_node_idx,
+                 self.cursor_maj, self.cursor_min, self.previous_cursor_maj, self.previous_cursor_min),
+                copy.copy(self._nodes_drawn_qty), self._reevaluation_pending,
+                {n: copy.copy(attrs) for n, attrs in self.subnodes_attrs.items()})
+
+    def _set_state_specific(self, state):
+        frozen_node_list, flattened_nodelist, exhaust_info, cursors, nodes_drawn_qty, \
+            self._reevaluation_pending, subnodes_attrs = state
+
+        self.frozen_node_list = copy.copy(frozen_node_list)
+        self.current_flattened_nodelist = copy.copy(flattened_nodelist)
+        self.exhausted_shapes, excluded_components, self.combinatory_complete, \
+            self.component_seed, self.exhausted_pick_cases = exhaust_info
+        self.excluded_components = copy.copy(excluded_components)
+        self.current_pick_section, self.current_picked_node_idx, self.cursor_maj, self.cursor_min, \
+            self.previous_cursor_maj, self.previous_cursor_min = cursors
+        self._nodes_drawn_qty = copy.copy(nodes_drawn_qty)
+        for n, attrs in subnodes_attrs.items():
+            self.subnodes_attrs[n] = copy.copy(attrs)
+
     def make_private_subnodes(self, node_dico, func_nodes, env, ignore_frozen_state,
                               accept_external_entanglement, entangled_set, delayed_node_internals):
 
-        subnodes_order, subnodes_attrs = self.get_subnodes_csts_copy(node_dico)
+        self.import_private_subnodes(node_dico, ignore_frozen_state=ignore_frozen_state)
+
+        if self.frozen_node_list is None or ignore_frozen_state:
+            iterable = self.subnodes_set
+        else:
+            iterable = set()
+            iterable.update(self.subnodes_set)
+            iterable.update(self.frozen_node_list)
+
+        # iterable shall only have unique nodes
+        for e in iterable:
+            e.env = env
+
+            if e.entangled_nodes is not None and ((not ignore_frozen_state) or accept_external_entanglement):
+                entangled_set.add(e)
+            else:
+                e.entangled_nodes = None
+
+            for c in e.internals:
+                if e.is_genfunc(c):
+                    # The generated node is still the one of the base node until
+                    # make_private() is called, thus the env is set afterwards.
+                    if e.internals[c].node_arg is not None:
+                        func_nodes.add(e)
+                    e.internals[c].make_private(ignore_frozen_state=ignore_frozen_state,
+                                                accept_external_entanglement=accept_external_entanglement,
+                                                delayed_node_internals=delayed_node_internals)
+                    e.internals[c].env = env
+                    continue
+
+                e.internals[c].env = env
+                if e.is_nonterm(c):
+                    e.internals[c].make_private_subnodes(node_dico, func_nodes, env,
+                                                         ignore_frozen_state=ignore_frozen_state,
+                                                         accept_external_entanglement=accept_external_entanglement,
+                                                         entangled_set=entangled_set,
+                                                         delayed_node_internals=delayed_node_internals)
+                    e.internals[c].make_private(ignore_frozen_state=ignore_frozen_state,
+                                                accept_external_entanglement=accept_external_entanglement,
+                                                delayed_node_internals=delayed_node_internals)
+
+                elif e.is_func(c):
+                    if e.internals[c].node_arg is not None:
+                        func_nodes.add(e)
+                    e.internals[c].make_private(ignore_frozen_state=ignore_frozen_state,
+                                                accept_external_entanglement=accept_external_entanglement,
+                                                delayed_node_internals=delayed_node_internals)
+
+                else:
+                    e.internals[c].make_private(ignore_frozen_state=ignore_frozen_state,
+                                                accept_external_entanglement=accept_external_entanglement,
+                                                delayed_node_internals=delayed_node_internals)
+
+    def import_private_subnodes(self, node_dico, ignore_frozen_state, node_getter=None):
+        """
+        Replace the subnodes (and the related information) of this copied node internals
+        by the ones referenced in `node_dico`, without going further down the graph.
+
+        Args:
+          node_dico (dict): old subnode --> new subnode
+          ignore_frozen_state (bool): if True, the frozen state of the node internals is not kept
+          node_getter (function): if provided, it is called with each old subnode and shall
+            return the new subnode to use instead of a shallow copy of it.
+        """
+        subnodes_order, subnodes_attrs = self.get_subnodes_csts_copy(node_dico, node_getter=node_getter)
 
         if self.separator is not None:
             new_separator = copy.copy(self.separator)
@@ -2744,6 +3040,9 @@ class NodeInternals_NonTerm(NodeInternals):
             new_nodes_drawn_qty = copy.copy(self._nodes_drawn_qty)
             new_fl = []
             for e in self.frozen_node_list:
+                if node_getter is not None:
+                    new_fl.append(node_getter(e))
+                    continue
                 if e not in node_dico:
                     new_e = copy.copy(e)
                     new_e.internals = copy.copy(e.internals)
@@ -2763,48 +3062,19 @@ class NodeInternals_NonTerm(NodeInternals):
                                          nodes_drawn_qty=new_nodes_drawn_qty, custo=self.custo,
                                          exhaust_info=new_exhaust_info, separator=new_separator)
 
-        if self.frozen_node_list is None or ignore_frozen_state:
-            iterable = self.subnodes_set
-        else:
-            iterable = set()
-            iterable.update(self.subnodes_set)
-            iterable.update(self.frozen_node_list)
-
-        # iterable shall only have unique nodes
-        for e in iterable:
-            e.env = env
-
-            if e.entangled_nodes is not None and ((not ignore_frozen_state) or accept_external_entanglement):
-                entangled_set.add(e)
-            else:
-                e.entangled_nodes = None
-
-            for c in e.internals:
-                e.internals[c].env = env
-                if e.is_nonterm(c):
-                    e.internals[c].make_private_subnodes(node_dico, func_nodes, env,
-                                                         ignore_frozen_state=ignore_frozen_state,
-                                                         accept_external_entanglement=accept_external_entanglement,
-                                                         entangled_set=entangled_set,
-                                                         delayed_node_internals=delayed_node_internals)
-                    e.internals[c].make_private(ignore_frozen_state=ignore_frozen_state,
-                                                accept_external_entanglement=accept_external_entanglement,
-                                                delayed_node_internals=delayed_node_internals)
-
-                elif e.is_func(c) or e.is_genfunc(c):
-                    if e.internals[c].node_arg is not None:
-                        func_nodes.add(e)
-                    e.internals[c].make_private(ignore_frozen_state=ignore_frozen_state,
-                                                accept_external_entanglement=accept_external_entanglement,
-                                                delayed_node_internals=delayed_node_internals)
+    def get_subnodes_csts_copy(self, node_dico=None, node_getter=None):
+        node_dico = {} if node_dico is None else node_dico # node_dico[old_node] --> new_node
 
-                else:
-                    e.internals[c].make_private(ignore_frozen_state=ignore_frozen_state,
-                                                accept_external_entanglement=accept_external_entanglement,
-                                                delayed_node_internals=delayed_node_internals)
+        if node_getter is None:
+            def node_getter(node):
+                if node not in node_dico:
+                    node_dico[node] = copy.copy(node)
+                new_node = node_dico[node]
+                new_node.internals = copy.copy(new_node.internals)
+                for c in new_node.internals:
+                    new_node.internals[c] = copy.copy(new_node.internals[c])
+                return new_node
 
-    def get_subnodes_csts_copy(self, node_dico=None):
-        node_dico = {} if node_dico is None else node_dico # node_dico[old_node] --> new_node
         csts_copy = []
         for weight, lnode_list in split_with(lambda x: isinstance(x, int),
                                              self.subnodes_order):
@@ -2819,14 +3089,7 @@ class NodeInternals_NonTerm(NodeInternals):
                 new_sublist = []
                 if isinstance(sublist[0], Node):
                     for node in sublist:
-                        if node not in node_dico:
-                            node_dico[node] = copy.copy(node)
-                        new_node = node_dico[node]
-
-                        new_node.internals = copy.copy(new_node.internals)
-                        for c in new_node.internals:
-                            new_node.internals[c] = copy.copy(new_node.internals[c])
-                        new_sublist.append(new_node)
+                        new_sublist.append(node_getter(node))
 
                 elif isinstance(sublist[0], int):
                     new_sublist.append(sublist[0]) # add the total weight
@@ -2835,13 +3098,7 @@ class NodeInternals_NonTerm(NodeInternals):
                         if isinstance(node, int):  # it is not a node but the weight of the node
                             new_sslist.append(node) # add the relative weight
                         else:
-                            if node not in node_dico:
-                                node_dico[node] = copy.copy(node)
-                            new_node = node_dico[node]
-                            new_node.internals = copy.copy(new_node.internals)
-                            for c in new_node.internals:
-                                new_node.internals[c] = copy.copy(new_node.internals[c])
-                            new_sslist.append(new_node)
+                            new_sslist.append(node_getter(node))
 
                     new_sublist.append(new_sslist)
                 else:
@@ -2905,6 +3162,7 @@ class NodeInternals_NonTerm(NodeInternals):
         else:
             return None
 
+    @_changes_value
     def set_subnode_minmax(self, node, min=None, max=None):
         assert node in self.subnodes_attrs
 
@@ -2928,6 +3186,7 @@ class NodeInternals_NonTerm(NodeInternals):
         else:
             return None
 
+    @_changes_value
     def set_subnode_default_qty(self, node, default_qty=None):
         assert node in self.subnodes_attrs
         mini, maxi = self.subnodes_attrs[node].qty
@@ -3288,6 +3547,8 @@ class NodeInternals_NonTerm(NodeInternals):
             self._reevaluation_pending = False
             return (self.frozen_node_list, False)
 
+        self._notify_structure_change()
+
         if self.separator is not None:
             ignore_sep_fstate = not self.separator.node.is_frozen()
 
@@ -3626,8 +3887,7 @@ class NodeInternals_NonTerm(NodeInternals):
                     list_to_enc = list(flatten(list_to_enc))
 
                 if list_to_enc:
-                    if issubclass(list_to_enc[0].__class__, NodeInternals):
-                        list_to_enc = list(map(tobytes_helper, list_to_enc))
+                    list_to_enc = list(map(tobytes_helper, list_to_enc))
                     blob = b''.join(list_to_enc)
                 else:
                     blob = b''
@@ -3669,6 +3929,7 @@ class NodeInternals_NonTerm(NodeInternals):
                 #  --> TBC
                 disabled_node = False
                 self.frozen_node_list.pop(idx-removed_cpt)
+                self._notify_structure_change()
                 removed_cpt += 1
                 continue
 
@@ -3682,6 +3943,7 @@ class NodeInternals_NonTerm(NodeInternals):
             if not self.separator.suffix and not self.separator.always:
                 l.pop(-1)
                 self.frozen_node_list.pop(-1)
+                self._notify_structure_change()
 
         if node_list:
             node_env = node_list[0].env
@@ -3730,11 +3992,13 @@ class NodeInternals_NonTerm(NodeInternals):
         raw_list = list(flatten(raw_list))
 
         def tobytes_helper(node_internals):
-            return node_internals._get_value(return_node_internals=False)[0]
+            if isinstance(node_internals, bytes):
+                return node_internals
+            else:
+                return node_internals._get_value(return_node_internals=False)[0]
 
         if raw_list:
-            if issubclass(raw_list[0].__class__, NodeInternals):
-                raw_list = list(map(tobytes_helper, raw_list))
+            raw_list = list(map(tobytes_helper, raw_list))
             raw = b''.join(raw_list)
         else:
             raw = b''
@@ -3755,6 +4019,8 @@ class NodeInternals_NonTerm(NodeInternals):
                     expand_list.pop(-1)
                 node_internals._clone_separator_cleanup()
 
+            # @node_list is the frozen list of the parent of @node
+            node._notify_update(structure=True)
             node_list.pop(idx)
             for i, n in enumerate(expand_list):
                 node_list.insert(idx+i, n)
@@ -3766,8 +4032,10 @@ class NodeInternals_NonTerm(NodeInternals):
         node.set_private(None)
         node.clear_attr(NodeInternals.DISABLED)
         if idx < len(node_list):
+            node._notify_update(structure=True)
             node_list.pop(idx)
 
+    @_changes_value
     def set_separator_node(self, sep_node, prefix=True, suffix=True, unique=False, always=False):
         check_err = set()
         for n in self.subnodes_set:
@@ -3810,6 +4078,28 @@ class NodeInternals_NonTerm(NodeInternals):
         self._precondition_subnode_ops()
         return len(self.frozen_node_list)
 
+    def has_static_structure(self):
+        """
+        Tell if the list of subnodes cannot change whatever the state of the node, that is
+        if there is only one shape, made of ordered sections of subnodes with fixed quantities,
+        and neither separator, encoder nor padding collapsing.
+
+        Returns:
+            bool
+        """
+        if self.encoder is not None or self.separator is not None \
+                or self.custo.collapse_padding_mode or len(self.subnodes_order) != 2:
+            return False
+        for delim, sublist in self.__iter_csts(self.subnodes_order[1]):
+            if delim[1] != '>':
+                return False
+            for node in sublist:
+                mini, maxi = self.subnodes_attrs[node].qty
+                if mini != maxi or mini < 0:
+                    return False
+        return True
+
+    @_changes_value
     def replace_subnode(self, old, new):
         self.subnodes_set.remove(old)
         self.subnodes_set.add(new)
@@ -3829,6 +4119,9 @@ class NodeInternals_NonTerm(NodeInternals):
                         if n is old:
                             sublist[idx] = new
 
+        self._notify_structure_change()
+
+    @_changes_value
     def add(self, node, min=1, max=1, default_qty=None, after=None, before=None, idx=None):
         """
         This method add a new node to this non-terminal. The location and the quantity can be configured
@@ -3925,6 +4218,8 @@ class NodeInternals_NonTerm(NodeInternals):
             for _ in range(default_qty if default_qty is not None else min):
                 self.frozen_node_list.insert(f_idx, node)
 
+        self._notify_structure_change()
+
 
     def _parse_node_desc(self, node_desc):
         mini, maxi = self.subnodes_attrs[node_desc].qty
@@ -4113,6 +4408,7 @@ class NodeInternals_NonTerm(NodeInternals):
             return length
 
 
+    @_changes_value
     def absorb(self, blob, constraints, conf, pending_postpone_desc=None):
         '''
         TOFIX: Checking existence condition independently from data
@@ -4123,7 +4419,7 @@ class NodeInternals_NonTerm(NodeInternals):
 
         if self.encoder:
             original_blob = blob
-            blob = self.encoder.decode(blob)
+            blob = convert_to_internal_view(self.encoder.decode(bytes(blob)))
 
         abs_excluded_components = []
         abs_exhausted = False
@@ -4148,7 +4444,7 @@ class NodeInternals_NonTerm(NodeInternals):
 
             if st == AbsorbStatus.Reject:
                 if DEBUG:
-                    print('REJECTED: SEPARATOR, blob: %r ...' % blob[:4])
+                    print('REJECTED: SEPARATOR, blob: %r ...' % bytes(blob[:4]))
                 abort = True
             elif st == AbsorbStatus.Absorbed or st == AbsorbStatus.FullyAbsorbed:
                 if off != 0:
@@ -4156,7 +4452,7 @@ class NodeInternals_NonTerm(NodeInternals):
                     new_sep.cancel_absorb()
                 else:
                     if DEBUG:
-                        print('ABSORBED: SEPARATOR, blob: %r ..., consumed: %d' % (blob[:4], sz))
+                        print('ABSORBED: SEPARATOR, blob: %r ..., consumed: %d' % (bytes(blob[:4]), sz))
                     blob = blob[sz:]
                     consumed_size += sz
             else:
@@ -4231,7 +4527,7 @@ class NodeInternals_NonTerm(NodeInternals):
                 if st == AbsorbStatus.Reject:
                     nb_absorbed = node_no-1
                     if DEBUG:
-                        print('\nREJECT: %s, size: %d, blob: %r ...' % (node.name, len(blob), blob[:4]))
+                        print('\nREJECT: %s, size: %d, blob: %r ...' % (node.name, len(blob), bytes(blob[:4])))
                     if min_node == 0:
                         # if DEBUG:
                         #     print(' --> min node == 0 (No abort)')
@@ -4246,7 +4542,7 @@ class NodeInternals_NonTerm(NodeInternals):
                 elif st == AbsorbStatus.Absorbed or st == AbsorbStatus.FullyAbsorbed:
                     if DEBUG:
                         print('\nABSORBED: %s, abort: %r, off: %d, consumed_sz: %d, blob: %r...' \
-                              % (node.name, abort, off, sz, blob[off:off+sz][:100]))
+                              % (node.name, abort, off, sz, bytes(blob[off:off+sz][:100])))
                         print(f'\nPostpone Node: {postponed.name if postponed else "N/A"} ({postponed!r})')
 
                     nb_absorbed = node_no
@@ -4280,7 +4576,7 @@ class NodeInternals_NonTerm(NodeInternals):
                         elif st2 == AbsorbStatus.Absorbed or st2 == AbsorbStatus.FullyAbsorbed:
                             if DEBUG:
                                 print('\nABSORBED (of postponed): %s, off: %d, consumed_sz: %d, blob: %r ...' \
-                                    % (postponed.name, off2, sz2, blob[off2:sz2][:100]))
+                                    % (postponed.name, off2, sz2, bytes(blob[off2:sz2][:100])))
 
                             if pending_upper_postpone is not None: # meaning postponed_node_desc is None
                                 pending_postponed_to_send_back = postponed
@@ -4403,6 +4699,7 @@ class NodeInternals_NonTerm(NodeInternals):
                 abs_exhausted = False
 
             self.frozen_node_list = []
+            self._notify_structure_change()
 
             if self.separator is not None and self.separator.prefix:
                 abort, blob, consumed_size, new_sep = _try_separator_absorption_with(blob, consumed_size)
@@ -4485,7 +4782,7 @@ class NodeInternals_NonTerm(NodeInternals):
                                             l.append(bval)
                                         partial_blob = struct.pack('{:d}s'.format(nb_bytes), bytes(l))
                                 else:
-                                    partial_blob = blob[consumed_size:last_idx]
+                                    partial_blob = bytes(blob[consumed_size:last_idx])
                                     last_byte = blob[last_idx:last_idx+1]
                                     if last_byte != b'':
                                         val = struct.unpack('B', last_byte)[0]
@@ -4754,7 +5051,7 @@ class NodeInternals_NonTerm(NodeInternals):
                     sep = self.frozen_node_list.pop(-1)
                     data = sep._tobytes()
                     consumed_size = consumed_size - len(data)
-                    blob = blob + data
+                    blob = convert_to_internal_view(bytes(blob) + data)
 
             if not abort:
                 status = AbsorbStatus.Absorbed
@@ -4769,15 +5066,20 @@ class NodeInternals_NonTerm(NodeInternals):
         if self.encoder:
             consumed_size = len(original_blob)
 
+        self._notify_structure_change()
+
         return status, 0, consumed_size, postponed_to_send_back
 
+    @_changes_value
     def cancel_absorb(self):
         for n in self.subnodes_set:
             n.cancel_absorb()
         if self.separator is not None:
             self.separator.node.cancel_absorb()
         self.frozen_node_list = None
+        self._notify_structure_change()
 
+    @_changes_value
     def confirm_absorb(self):
         iterable = copy.copy(self.subnodes_set)
         if self.separator is not None:
@@ -4849,6 +5151,7 @@ class NodeInternals_NonTerm(NodeInternals):
                 node.entangled_nodes = None
 
 
+    @_changes_value
     def unfreeze(self, conf=None, recursive=True, dont_change_state=False, ignore_entanglement=False, only_generators=False,
                  reevaluate_constraints=False):
         mutable = self.is_attr_set(NodeInternals.Mutable)
@@ -4894,6 +5197,7 @@ class NodeInternals_NonTerm(NodeInternals):
                                        reevaluate_constraints=reevaluate_constraints)
 
                 self.frozen_node_list = None
+                self._notify_structure_change()
                 for n in self.subnodes_set:
                     n.clear_clone_info_since(n)
 
@@ -4913,6 +5217,7 @@ class NodeInternals_NonTerm(NodeInternals):
         if not dont_change_state and not only_generators and not reevaluate_constraints and mutable:
             self._cleanup_entangled_nodes()
             self.frozen_node_list = None
+            self._notify_structure_change()
             self._nodes_drawn_qty = {}
             for n in self.subnodes_set:
                 self._clear_drawn_node_attrs(n)
@@ -4922,6 +5227,7 @@ class NodeInternals_NonTerm(NodeInternals):
             self.excluded_components = []
 
 
+    @_changes_value
     def unfreeze_all(self, recursive=True, ignore_entanglement=False):
         if recursive:
             iterable = copy.copy(self.subnodes_set)
@@ -4934,6 +5240,7 @@ class NodeInternals_NonTerm(NodeInternals):
         self._cleanup_entangled_nodes()
 
         self.frozen_node_list = None
+        self._notify_structure_change()
         self._nodes_drawn_qty = {}
         for n in self.subnodes_set:
             self._clear_drawn_node_attrs(n)
@@ -4943,6 +5250,7 @@ class NodeInternals_NonTerm(NodeInternals):
             self.excluded_components = []
 
 
+    @_changes_value
     def reset_state(self, recursive=False, exclude_self=False, conf=None, ignore_entanglement=False):
         if recursive:
             iterable = copy.copy(self.subnodes_set)
@@ -4959,6 +5267,7 @@ class NodeInternals_NonTerm(NodeInternals):
 
     def _reset_state_info(self, new_info=None, nodes_drawn_qty=None):
         self.frozen_node_list = None
+        self._notify_structure_change()
 
         if new_info is None:
             self.exhausted_shapes = False
@@ -5065,40 +5374,13 @@ class NodeInternals_NonTerm(NodeInternals):
         for e in iterable:
             e._reset_depth(depth)
 
-    def get_child_nodes_by_attr(self, internals_criteria, semantics_criteria, owned_conf, conf, path_regexp,
-                               exclude_self, respect_order, relative_depth, top_node, ignore_fstate,
-                               resolve_generator=False):
-
+    def get_child_nodes(self, ignore_fstate=False):
+        # if the node is not frozen, the order will not be preserved
+        # as self.subnodes_set will be used, and it is a set()
         if self.frozen_node_list is not None and not ignore_fstate:
-            iterable = self.frozen_node_list
+            return self.frozen_node_list
         else:
-            iterable = self.subnodes_set
-            # self.get_subnodes_with_csts()
-            # iterable = self.frozen_node_list
-
-        if respect_order:
-            # if the node is not frozen, the order will not be
-            # preserved as self.subnodes_set will be used as a base,
-            # and it is a set()
-            s = []
-        else:
-            s = set()
-
-        for e in iterable:
-            nlist = e.get_reachable_nodes(internals_criteria, semantics_criteria, owned_conf, conf,
-                                          path_regexp=path_regexp,
-                                          exclude_self=False, respect_order=respect_order,
-                                          relative_depth=relative_depth, top_node=top_node,
-                                          ignore_fstate=ignore_fstate, resolve_generator=resolve_generator)
-
-            if respect_order:
-                for e in nlist:
-                    if e not in s:
-                        s.append(e)
-            else:
-                s = s.union(nlist)
-
-        return s
+            return self.subnodes_set
 
 
     def set_child_current_conf(self, node, conf, reverse, ignore_entanglement):
@@ -5109,7 +5391,8 @@ class NodeInternals_NonTerm(NodeInternals):
             node._set_subtrees_current_conf(e, conf, reverse, ignore_entanglement=ignore_entanglement)
 
 
-    def get_child_all_path(self, name, htable, conf, recursive, resolve_generator=False):
+    def get_child_all_path(self, name, htable, conf, recursive, resolve_generator=False,
+                           generators=None):
         if self.frozen_node_list is not None:
             iterable = self.frozen_node_list
         else:
@@ -5119,8 +5402,10 @@ class NodeInternals_NonTerm(NodeInternals):
 
         for idx, node in enumerate(iterable):
             node._get_all_paths_rec(name, htable, conf, recursive=recursive, first=False,
-                                    resolve_generator=resolve_generator, clone_idx=idx)
+                                    resolve_generator=resolve_generator, clone_idx=idx,
+                                    generators=generators)
 
+    @_changes_value
     def set_size_from_constraints(self, size, encoded_size):
         # not supported
         raise DataModelDefinitionError
@@ -5431,10 +5716,21 @@ class Node(object):
     CORRUPT_NODE_QTY = 7
     CORRUPT_SIZE_SYNC = 8
 
+    # The attributes of a node are stored within slots to reduce the memory footprint
+    # of the graphs. The rarely used ones (e.g., the copy-on-write bookkeeping) and
+    # the ones added by the users are stored within __dict__.
+    _slots = ('internals', 'current_conf', 'name', 'description', 'env', 'entangled_nodes',
+              'semantics', 'fuzz_weight', 'depth', 'tmp_ref_count', 'abs_postpone_sent_back',
+              '_post_freeze_handler', '_delayed_jobs_called',
+              '_bytes_cache', '_bytes_cache_parents', '_static_region',
+              '_paths_htable', '_paths_htable_key', '_paths_generators', '_paths_node_index',
+              '_reachable_indexes')
+    __slots__ = _slots + ('__dict__', '__weakref__')
+
     def __init__(self, name, base_node=None, copy_dico=None, ignore_frozen_state=False,
                  accept_external_entanglement=False, acceptance_set=None,
                  subnodes=None, values=None, value_type=None, vt=None, new_env=False,
-                 description=None):
+                 description=None, cow=False):
         """
         Args:
           name (str): Name of the node. Every children node of a node shall have a unique name.
@@ -5462,16 +5758,43 @@ class Node(object):
            will be copied. Otherwise, the same will be used. If `ignore_frozen_state` is True, a
            new :class:`Env()` will be used.
           description (str): textual description of the node
+          cow (bool): [If `base_node` provided] If True, `base_node` is cloned in a copy-on-write
+            fashion: the nodes of the new graph are only copied when they are accessed or when
+            their counterparts in `base_node` graph are about to change. Thus, the clone cost
+            depends on the parts of the graphs that diverge. Ignored if `copy_dico` is provided
+            or if `base_node` has no :class:`Env()`.
         """
 
         assert '/' not in name  # '/' is a reserved character
 
+        if cow and base_node is not None and base_node.env is not None and copy_dico is None \
+                and subnodes is None and values is None and value_type is None:
+            _CowCloneContext(self, name, base_node, ignore_frozen_state=ignore_frozen_state,
+                             accept_external_entanglement=accept_external_entanglement,
+                             acceptance_set=acceptance_set, new_env=new_env)
+            return
+
         self.internals = {}
         self.name = name
         self.description = description
         self.env = None
 
+        # Path index of the graph behind this node, only rebuilt when the Env structure
+        # version or the parameters of the search change (cf. Node.get_all_paths())
         self._paths_htable = None
+        self._paths_htable_key = None
+        self._paths_generators = None
+        self._paths_node_index = None
+        # Indexes of the nodes reachable from this one (cf. Node.iter_reachable_nodes())
+        self._reachable_indexes = None
+
+        # Serialized value of the node, shared with its parents through
+        # self._bytes_cache_parents for dirty-path propagation (cf. Node.to_bytes())
+        self._bytes_cache = None
+        self._bytes_cache_parents = None
+        # Static part of the graph this node belongs to, if it has been compiled
+        # (cf. Node.compile())
+        self._static_region = None
 
         self.entangled_nodes = None
 
@@ -5517,6 +5840,7 @@ class Node(object):
         else:
             self._delayed_jobs_called = False
 
+            self.current_conf = None
             self.add_conf('MAIN')
             self.set_current_conf('MAIN')
 
@@ -5537,7 +5861,7 @@ class Node(object):
                 self.make_empty()
 
     def get_clone(self, name=None, ignore_frozen_state=False, accept_external_entanglement=False,
-                  acceptance_set=None, new_env=True):
+                  acceptance_set=None, new_env=True, cow=False):
         """Create a new node. To be used within a graph-based data model.
 
         Args:
@@ -5548,6 +5872,8 @@ class Node(object):
           acceptance_set (set): refer to the corresponding Node parameter
           new_env (bool): If True, the current :class:`Env()` will be copied.
             Otherwise, the same will be used.
+          cow (bool): If True, the clone is performed in a copy-on-write fashion
+            (refer to the corresponding Node parameter)
 
         Returns:
           Node: duplicated Node object
@@ -5559,7 +5885,7 @@ class Node(object):
         return Node(name, base_node=self, ignore_frozen_state=ignore_frozen_state,
                     accept_external_entanglement=accept_external_entanglement,
                     acceptance_set=acceptance_set,
-                    new_env=new_env)
+                    new_env=new_env, cow=cow)
 
 
     def __copy__(self):
@@ -5567,8 +5893,21 @@ class Node(object):
         # It does not handle self.internals nor self.entangled_nodes which are copied
         # in a different way.
 
+        if '_cow_ctx' in self.__dict__:
+            self._cow_materialize()
+
         new_node = type(self)(self.name)
+        for k in Node._slots:
+            setattr(new_node, k, getattr(self, k))
         new_node.__dict__.update(self.__dict__)
+        new_node._bytes_cache = None
+        new_node._bytes_cache_parents = None
+        new_node._static_region = None
+        new_node._paths_htable = None
+        new_node._paths_htable_key = None
+        new_node._paths_generators = None
+        new_node._paths_node_index = None
+        new_node._reachable_indexes = None
         if self.semantics is not None:
             new_node.semantics = copy.copy(self.semantics)
             new_node.semantics.make_private()
@@ -5605,6 +5944,7 @@ class Node(object):
           dict: For each subnodes of `base_node` (keys), reference the corresponding subnodes within the new node.
         """
 
+        self._notify_update(structure=True)
         self.description = base_node.description
         self._post_freeze_handler = base_node._post_freeze_handler
 
@@ -5760,6 +6100,7 @@ class Node(object):
         Returns:
           None
         '''
+        self._preserve_cow_clones()
         self.fuzz_weight = int(w)
 
     def get_fuzz_weight(self):
@@ -5780,6 +6121,7 @@ class Node(object):
         Returns:
           None
         '''
+        self._preserve_cow_clones()
         self.fuzz_weight = 1
         if recursive:
             for conf in self.internals:
@@ -5788,6 +6130,7 @@ class Node(object):
     def add_conf(self, conf):
         # @conf could not be None or the empty string
         if conf and conf not in self.internals:
+            self._preserve_cow_clones()
             self.internals[conf] = None
             return True
         else:
@@ -5795,6 +6138,7 @@ class Node(object):
 
     def remove_conf(self, conf):
         if conf != 'MAIN':
+            self._notify_update(structure=True)
             del self.internals[conf]
 
     def is_conf_existing(self, conf):
@@ -5808,6 +6152,7 @@ class Node(object):
 
     def _set_subtrees_current_conf(self, node, conf, reverse, ignore_entanglement=False):
         conf2 = conf if node.is_conf_existing(conf) else node.current_conf
+        node._notify_update(structure=conf2 != node.current_conf)
 
         if not reverse:
             node.current_conf = conf2
@@ -5837,6 +6182,7 @@ class Node(object):
                 self._set_subtrees_current_conf(e, conf, reverse, ignore_entanglement=ignore_entanglement)
             else:
                 if e.is_conf_existing(conf):
+                    e._notify_update(structure=conf != e.current_conf)
                     e.current_conf = conf
 
         if not ignore_entanglement and self.entangled_nodes is not None:
@@ -5864,6 +6210,9 @@ class Node(object):
     def entangle_with(self, node):
         assert(node is not self)
 
+        for e in itertools.chain((self, node), self.entangled_nodes or (), node.entangled_nodes or ()):
+            e._preserve_cow_clones()
+
         if self.entangled_nodes is None:
             self.entangled_nodes = {self}
 
@@ -5882,6 +6231,9 @@ class Node(object):
         return self.internals[self.current_conf]
 
     def __set_current_internals(self, internal):
+        self._notify_update(structure=not self.is_term()
+                                      or not isinstance(internal, NodeInternals_Term),
+                            attrs=True)
         self.internals[self.current_conf] = internal
 
     def __get_internals(self):
@@ -5901,7 +6253,41 @@ class Node(object):
         return Node(self.name, base_node=self, ignore_frozen_state=False,
                     accept_external_entanglement=True, new_env=False)
 
+    def get_state_snapshot(self):
+        """
+        Capture the state of the nodes reachable from this one, so that it can be restored
+        in one operation with :meth:`Node.restore_state_snapshot`, without re-evaluating
+        generator functions or constraints.
+
+        The snapshot covers the frozen state of the nodes (drawn values, shapes of the
+        non-terminal nodes, exhaustion information, generated nodes, ...), their attributes
+        and current configuration, the drawn-node attributes kept by the :class:`Env` for
+        these nodes, and the state of the CSP of the :class:`Env`.
+
+        Note: the subnodes of the non-terminal nodes are not part of the snapshot, thus they
+        should not be changed until the snapshot is restored.
+
+        Returns:
+          NodeStateSnapshot: the snapshot
+        """
+        return NodeStateSnapshot(self)
+
+    def restore_state_snapshot(self, snapshot):
+        """
+        Restore the state captured by :meth:`Node.get_state_snapshot`. A snapshot can be
+        restored several times.
+
+        Args:
+          snapshot (NodeStateSnapshot): snapshot previously taken from this node
+        """
+        if snapshot.node is not self:
+            raise ValueError('The snapshot has not been taken from this node!')
+        snapshot.restore()
+
     def set_internals(self, backup):
+        term_only = all(isinstance(i, NodeInternals_Term)
+                        for i in itertools.chain(self.internals.values(), backup.internals.values()))
+        self._notify_update(structure=not term_only or self.name != backup.name, attrs=True)
         self.name = backup.name
         self.env = backup.env
         self.semantics = backup.semantics
@@ -6011,6 +6397,7 @@ class Node(object):
     def set_subnodes_basic(self, node_list, conf=None, ignore_entanglement=False, separator=None,
                            preserve_node=True):
         conf = self._check_conf(conf)
+        self._notify_update(structure=True)
 
         new_internals = NodeInternals_NonTerm()
         if preserve_node:
@@ -6028,6 +6415,7 @@ class Node(object):
     def set_subnodes_with_csts(self, wlnode_list, conf=None, ignore_entanglement=False, separator=None,
                                preserve_node=True):
         conf = self._check_conf(conf)
+        self._notify_update(structure=True)
 
         new_internals = NodeInternals_NonTerm()
         if preserve_node:
@@ -6043,6 +6431,7 @@ class Node(object):
 
     def set_subnodes_full_format(self, subnodes_order, subnodes_attrs, conf=None, separator=None, preserve_node=True):
         conf = self._check_conf(conf)
+        self._notify_update(structure=True)
 
         new_internals = NodeInternals_NonTerm()
         if preserve_node:
@@ -6057,6 +6446,7 @@ class Node(object):
     def set_values(self, values=None, value_type=None, conf=None, ignore_entanglement=False,
                    preserve_node=True):
         conf = self._check_conf(conf)
+        self._notify_update(structure=not self.is_term(conf), attrs=True)
 
         new_internals = NodeInternals_TypedValue()
         if preserve_node:
@@ -6084,6 +6474,7 @@ class Node(object):
                  conf=None, ignore_entanglement=False, provide_helpers=False,
                  preserve_node=True):
         conf = self._check_conf(conf)
+        self._notify_update(structure=not self.is_term(conf), attrs=True)
 
         new_internals = NodeInternals_Func()
         if preserve_node:
@@ -6104,6 +6495,7 @@ class Node(object):
                            func_arg=None, conf=None, ignore_entanglement=False,
                            provide_helpers=False, preserve_node=True):
         conf = self._check_conf(conf)
+        self._notify_update(structure=True)
 
         new_internals = NodeInternals_GenFunc()
         if preserve_node:
@@ -6120,17 +6512,96 @@ class Node(object):
 
     def make_empty(self, conf=None):
         conf = self._check_conf(conf)
+        self._notify_update(structure=True)
         self.internals[conf] = NodeInternals_Empty()
         
     def is_empty(self, conf=None):
         conf = self._check_conf(conf)
         return isinstance(self.internals[conf], NodeInternals_Empty)
 
-    def absorb(self, blob, constraints=AbsCsts(), conf=None, pending_postpone_desc=None):
+    def absorb(self, blob, constraints=AbsCsts(), conf=None, pending_postpone_desc=None,
+               profiler=None):
+        """
+        Try to absorb the provided blob by modifying the node graph so that its serialized
+        value matches it.
+
+        During the absorption, the rejections of the subgraphs that do not depend on
+        the rest of the graph (no generator or function nodes, no synchronization,
+        no entanglement, no delayed absorption) are memoized, so that the backtracking of the
+        non-terminal nodes does not try again to absorb the same blob with the same unchanged
+        subgraph. The memo lives until the end of the outermost absorption and relies on the
+        :class:`Env` of the node (it can be disabled through ``Env.absorption_memo_enabled``).
+
+        Args:
+          blob (bytes-like): the data to absorb. Bytes, bytearray, mmap and memoryview objects
+            are not copied: the subnodes are given views on the remaining part of the data.
+          constraints (AbsCsts): constraints that rule the absorption
+          conf (str): configuration to use
+          pending_postpone_desc (Node): node whose absorption has been postponed by a parent
+            node (internal usage)
+          profiler (AbsorptionProfiler): if provided (and if this absorption is not
+            nested in another one), collect time and attempts per node
+
+        Returns:
+          tuple: absorption status, offset, size of the absorbed data and name of the node
+        """
+        env = self.env
+        if env is not None and env._absorption is not None:
+            return self._absorb(blob, constraints, conf, pending_postpone_desc, env._absorption)
+        elif env is None or (not env.absorption_memo_enabled and profiler is None):
+            return self._absorb(blob, constraints, conf, pending_postpone_desc, None)
+
+        blob = convert_to_internal_view(blob)
+        session = _AbsorptionSession(blob, env.absorption_memo_enabled, profiler)
+        env._absorption = session
+        try:
+            return self._absorb(blob, constraints, conf, pending_postpone_desc, session)
+        finally:
+            env._absorption = None
+
+    def _absorb(self, blob, constraints, conf, pending_postpone_desc, session):
+        if session is None:
+            return self._absorb_internals(blob, constraints, conf, pending_postpone_desc)
+
+        profiler = session.profiler
+        if profiler is not None:
+            t0 = time.perf_counter()
+
+        if session.memo is None:
+            ret = self._absorb_internals(blob, constraints, conf, pending_postpone_desc)
+        else:
+            key = None
+            # the rejections of the terminal nodes are cheaper to find again than to memoize
+            if pending_postpone_desc is None and self.is_nonterm() \
+                    and session.is_context_free(self):
+                key = session.get_key(self, blob, constraints, conf)
+                ret = None if key is None else session.lookup(self, key, blob)
+                if ret is not None:
+                    if profiler is not None:
+                        profiler.record(self, ret[0], time.perf_counter() - t0, memoized=True)
+                    return ret
+
+            clock = session.clock
+            ret = self._absorb_internals(blob, constraints, conf, pending_postpone_desc)
+            if ret[0] != AbsorbStatus.Reject:
+                session.clock += 1
+            if session.clock != clock:
+                session.notify_change(self)
+            if key is not None and ret[0] == AbsorbStatus.Reject:
+                session.store(self, key, blob, ret)
+
+        if profiler is not None:
+            profiler.record(self, ret[0], time.perf_counter() - t0)
+
+        return ret
+
+    def _absorb_internals(self, blob, constraints, conf, pending_postpone_desc):
         conf, next_conf = self._compute_confs(conf=conf, recursive=True)
-        blob = convert_to_internal_repr(blob)
+        blob = convert_to_internal_view(blob)
+        self._notify_update()
         status, off, sz, postpone_sent_back = self.internals[conf].absorb(blob, constraints=constraints, conf=next_conf,
                                                                           pending_postpone_desc=pending_postpone_desc)
+        self._notify_update()
         if postpone_sent_back is not None:
             self.abs_postpone_sent_back = postpone_sent_back
 
@@ -6139,16 +6610,31 @@ class Node(object):
             self.internals[conf].confirm_absorb()
         return status, off, sz, self.name
 
+    def cancel_absorb(self):
+        self._notify_update()
+        env = self.env
+        if env is not None and env._absorption is not None and env._absorption.memo is not None:
+            env._absorption.clock += 1
+            env._absorption.notify_change(self)
+        self.internals[self.current_conf].cancel_absorb()
+
+    def confirm_absorb(self):
+        self._notify_update()
+        self.internals[self.current_conf].confirm_absorb()
+
     def set_absorb_helper(self, helper, conf=None):
         conf = self._check_conf(conf)
+        self._preserve_cow_clones()
         self.internals[conf].set_absorb_helper(helper)
 
     def enforce_absorb_constraints(self, csts, conf=None):
         conf = self._check_conf(conf)
+        self._preserve_cow_clones()
         self.internals[conf].enforce_absorb_constraints(csts)
 
     def set_size_from_constraints(self, size=None, encoded_size=None, conf=None):
         conf = self._check_conf(conf)
+        self._notify_update()
         self.internals[conf].set_size_from_constraints(size=size, encoded_size=encoded_size)
 
     # Does not affect function/generator Nodes
@@ -6187,6 +6673,7 @@ class Node(object):
 
     def make_synchronized_with(self, scope, node=None, param=None, sync_obj=None, conf=None):
         conf = self._check_conf(conf)
+        self._preserve_cow_clones()
         self.internals[conf].set_node_sync(scope=scope, node=node, param=param, sync_obj=sync_obj)
 
     def synchronized_with(self, scope, conf=None):
@@ -6195,6 +6682,7 @@ class Node(object):
         return val
 
     def set_attr(self, name, conf=None, all_conf=False, recursive=False):
+        self._notify_update()
         if all_conf:
             for c in self.internals:
                 self.internals[c].set_attr(name)
@@ -6207,6 +6695,7 @@ class Node(object):
 
 
     def clear_attr(self, name, conf=None, all_conf=False, recursive=False):
+        self._notify_update()
         if all_conf:
             for c in self.internals:
                 self.internals[c].clear_attr(name)
@@ -6229,6 +6718,7 @@ class Node(object):
 
     def set_private(self, val, conf=None):
         conf = self._check_conf(conf)
+        self._preserve_cow_clones()
         self.internals[conf].set_private(val)
 
     def get_private(self, conf=None):
@@ -6236,6 +6726,9 @@ class Node(object):
         return self.internals[conf].get_private()
 
     def set_semantics(self, sem):
+        self._preserve_cow_clones()
+        if self.env is not None:
+            self.env.attrs_version += 1
         if isinstance(sem, NodeSemantics):
             self.semantics = sem
         else:
@@ -6276,101 +6769,130 @@ class Node(object):
 
         """
 
+        nodes = list(self.iter_reachable_nodes(internals_criteria=internals_criteria,
+                                               semantics_criteria=semantics_criteria,
+                                               owned_conf=owned_conf, conf=conf,
+                                               path_regexp=path_regexp, exclude_self=exclude_self,
+                                               top_node=top_node, ignore_fstate=ignore_fstate,
+                                               resolve_generator=resolve_generator,
+                                               relative_depth=relative_depth))
 
-        def __compliant(node, config, top_node, side_effect_risk):
+        if respect_order:
+            return nodes
+        else:
+            l1 = []
+            l2 = []
+            for e in nodes:
+                if e.get_fuzz_weight() > 1:
+                    l1.append(e)
+                else:
+                    l2.append(e)
+            l1 = sorted(l1, key=lambda x: -x.get_fuzz_weight())
+
+            return l1 + sorted(l2, key=lambda x: x.name)
+
+    def iter_reachable_nodes(self, internals_criteria=None, semantics_criteria=None,
+                             owned_conf=None, conf=None, path_regexp=None, exclude_self=False,
+                             top_node=None, ignore_fstate=False, resolve_generator=False,
+                             relative_depth=-1):
+        """
+        Lazy version of :meth:`get_reachable_nodes` (with `respect_order` set to `True`) that
+        yields the matching nodes in the order they are reached. The graph should not be
+        modified while iterating.
+
+        When the search is not limited in depth, the reachable nodes are retrieved from an index
+        kept by this node until the structure of the graph changes, and the criteria on the
+        node kinds, the attributes and the semantics are first resolved through it.
+
+        Args:
+            See :meth:`get_reachable_nodes`
+        """
+        top_node = self if top_node is None else top_node
+
+        if path_regexp is not None:
+            path_regexp = re.compile(path_regexp)
+            # computed before the walk as it may resolve generators
+            top_node.get_all_paths(resolve_generator=resolve_generator)
+            paths_index = top_node._get_paths_node_index()
+
+        if relative_depth <= -1 and self.env is not None:
+            index = self._get_reachable_index(conf, ignore_fstate, resolve_generator)
+            nodes, checked = index.get_candidates(internals_criteria, semantics_criteria)
+            if checked:
+                internals_criteria = semantics_criteria = None
+        else:
+            nodes = self._walk_reachable_nodes(conf, ignore_fstate, resolve_generator,
+                                               relative_depth=relative_depth)
+
+        for node in nodes:
             if node is top_node and exclude_self:
-                return False
+                continue
+
+            if owned_conf is not None and not node.is_conf_existing(owned_conf):
+                continue
 
             if internals_criteria:
-                cond1 = node.internals[config].match(internals_criteria)
-            else:
-                cond1 = True
+                config = conf if node.is_conf_existing(conf) else node.current_conf
+                if not node.internals[config].match(internals_criteria):
+                    continue
 
             if semantics_criteria:
-                if node.semantics is None:
-                    cond2 = False
-                else:
-                    cond2 = node.semantics.match(semantics_criteria)
-            else:
-                cond2 = True
+                if node.semantics is None or not node.semantics.match(semantics_criteria):
+                    continue
 
             if path_regexp is not None:
-                paths = node.get_all_paths_from(top_node, flush_cache=False,
-                                                resolve_generator=resolve_generator)
-                for p in paths:
-                    if re.search(path_regexp, p):
-                        cond3 = True
+                for p in paths_index.get(node, ()):
+                    if path_regexp.search(p):
                         break
                 else:
-                    cond3 = False
-            else:
-                cond3 = True
-
-            return cond1 and cond2 and cond3
-
-
-        def get_reachable_nodes_rec(node, config, rdepth, top_node):
-            s = []
-
-            if config == None:
-                config = self.current_conf
-                next_conf = None
-            else:
-                next_conf = config
-
-            if not node.is_conf_existing(config):
-                config = node.current_conf
-
-            internal = node.internals[config]
-            side_effect_risk = isinstance(internal, NodeInternals_GenFunc) and not internal.is_frozen()
-
-            if (owned_conf == None) or node.is_conf_existing(owned_conf):
-                if __compliant(node, config, top_node, side_effect_risk=side_effect_risk):
-                    s.append(node)
-
-            if not resolve_generator and side_effect_risk:
-                return s
-
-            if rdepth <= -1 or rdepth > 0:
-                s2 = internal.get_child_nodes_by_attr(internals_criteria=internals_criteria,
-                                                      semantics_criteria=semantics_criteria,
-                                                      owned_conf=owned_conf, conf=next_conf,
-                                                      path_regexp=path_regexp,
-                                                      exclude_self=False,
-                                                      respect_order=respect_order,
-                                                      relative_depth = rdepth - 1,
-                                                      top_node=top_node, ignore_fstate=ignore_fstate,
-                                                      resolve_generator=resolve_generator)
-                if s2:
-                    for e in s2:
-                        if e not in s:
-                            s.append(e)
-
-            return s
+                    continue
 
-        top_node = self if top_node is None else top_node
-        if relative_depth == -1:
-            top_node._paths_htable = None
+            yield node
+
+    def _walk_reachable_nodes(self, conf, ignore_fstate, resolve_generator, relative_depth=-1,
+                              generators=None):
+        # Preorder walk yielding each node reachable from this one once. A node already
+        # reached is walked through again only if there is more depth left to explore.
+        # The generator nodes met are added to @generators as tuples
+        # (internals, generated node or None, True if the generated node has been walked)
+        depths = {}
+        stack = [(self, relative_depth)]
+        while stack:
+            node, rdepth = stack.pop()
+            prev_rdepth = depths.get(node)
+            if prev_rdepth is not None and rdepth <= prev_rdepth:
+                continue
+            depths[node] = rdepth
+            if prev_rdepth is None:
+                yield node
 
-        nodes = get_reachable_nodes_rec(node=self, config=conf, rdepth=relative_depth,
-                                        top_node=top_node)
+            if -1 < rdepth <= 0:
+                continue
 
-        if relative_depth == -1:
-            top_node._paths_htable = None
+            internal = node.internals[conf if node.is_conf_existing(conf) else node.current_conf]
+            if isinstance(internal, NodeInternals_GenFunc):
+                # a generator not frozen yet would have to be resolved, with side effects
+                walked = resolve_generator or bool(internal.is_frozen())
+                if walked:
+                    stack.append((internal.generated_node, rdepth - 1 if rdepth > 0 else rdepth))
+                if generators is not None:
+                    generators.append((internal, internal._generated_node, walked))
+                continue
 
-        if respect_order:
-            return nodes
-        else:
-            l1 = []
-            l2 = []
-            for e in nodes:
-                if e.get_fuzz_weight() > 1:
-                    l1.append(e)
-                else:
-                    l2.append(e)
-            l1 = sorted(l1, key=lambda x: -x.get_fuzz_weight())
+            children = internal.get_child_nodes(ignore_fstate=ignore_fstate)
+            if children:
+                rdepth = rdepth - 1 if rdepth > 0 else rdepth
+                stack.extend([(e, rdepth) for e in reversed(list(children))])
 
-            return l1 + sorted(l2, key=lambda x: x.name)
+    def _get_reachable_index(self, conf, ignore_fstate, resolve_generator):
+        key = (conf, ignore_fstate, resolve_generator)
+        if self._reachable_indexes is None:
+            self._reachable_indexes = {}
+        index = self._reachable_indexes.get(key)
+        if index is None or not index.update(self):
+            index = _ReachableNodesIndex(self, conf, ignore_fstate, resolve_generator)
+            self._reachable_indexes[key] = index
+        return index
 
 
     @staticmethod
@@ -6454,7 +6976,7 @@ class Node(object):
 
 
     def _get_all_paths_rec(self, pname, htable, conf, recursive, first=True, resolve_generator=False,
-                           clone_idx=0):
+                           clone_idx=0, generators=None):
 
         next_conf = conf if recursive else None
 
@@ -6472,7 +6994,14 @@ class Node(object):
         side_effect_risk = isinstance(internal, NodeInternals_GenFunc) and not internal.is_frozen()
         if resolve_generator or not side_effect_risk:
             internal.get_child_all_path(name, htable, conf=next_conf, recursive=recursive,
-                                        resolve_generator=resolve_generator)
+                                        resolve_generator=resolve_generator, generators=generators)
+        elif generators is not None:
+            generators.append((internal, internal._generated_node, None, next_conf))
+
+    def _is_term_for_paths(self, conf):
+        if not self.is_conf_existing(conf):
+            conf = self.current_conf
+        return isinstance(self.internals[conf], NodeInternals_Term)
 
 
     def get_all_paths(self, conf=None, recursive=True, depth_min=None, depth_max=None,
@@ -6487,15 +7016,31 @@ class Node(object):
               could result from the call of this method. And thus for this latter case,
               the method works as if `resolve_generator` is set to `True`.
 
+            flush_cache: if `False` and the paths have already been computed, they are returned
+              whatever the changes on the graph since then. Otherwise, they are computed again
+              only if the structure of the graph has changed (or the parameters differ).
+              Note that renaming a node is not considered as a structure change.
+
         Returns:
             dict: the keys are either a 'path' or a tuple ('path', int) when the path already
               exists (case of the same node used more than once within the same non-terminal)
         """
 
-        if flush_cache or self._paths_htable is None:
-            self._paths_htable = collections.OrderedDict()
-            self._get_all_paths_rec('', self._paths_htable, conf, recursive=recursive,
-                                    resolve_generator=resolve_generator)
+        if self._paths_htable is None or (flush_cache and not self._update_paths_htable(
+                conf, recursive, resolve_generator)):
+            # The version is retrieved before the walk, as resolving generators may change
+            # the graph while it is walked through, in which case the paths will be computed again
+            env = self.env
+            key = None if env is None else \
+                (env, env.structure_version, conf, recursive, resolve_generator)
+            htable = collections.OrderedDict()
+            generators = []
+            self._get_all_paths_rec('', htable, conf, recursive=recursive,
+                                    resolve_generator=resolve_generator, generators=generators)
+            self._paths_htable = htable
+            self._paths_htable_key = key
+            self._paths_generators = generators
+            self._paths_node_index = None
 
         if depth_min is not None or depth_max is not None:
             depth_min = int(depth_min) if depth_min is not None else 0
@@ -6512,6 +7057,51 @@ class Node(object):
 
         return paths
 
+    def _update_paths_htable(self, conf, recursive, resolve_generator):
+        # Return False if self._paths_htable has to be computed again. Changes of the structure
+        # are tracked by the Env, except for the generator nodes which are checked one by one.
+        # Only the ones producing terminal nodes, which is the most common case, are handled
+        # without computing all the paths again.
+        env = self.env
+        key = self._paths_htable_key
+        if key is None or key[0] is not env or key[1] != env.structure_version \
+                or key[2:] != (conf, recursive, resolve_generator):
+            return False
+
+        generators = self._paths_generators
+        for idx, (gen_internals, node, path, gen_conf) in enumerate(generators):
+            if gen_internals._generated_node is node:
+                continue
+            if path is None or gen_internals.env is None:
+                return False
+            if gen_internals._generated_node is None and not resolve_generator:
+                return False
+
+            new_node = gen_internals.generated_node
+            if new_node.name != node.name or not new_node._is_term_for_paths(gen_conf):
+                return False
+
+            self._paths_htable[path] = new_node
+            generators[idx] = (gen_internals, new_node, path, gen_conf)
+            index = self._paths_node_index
+            if index is not None:
+                path = path[0] if isinstance(path, tuple) else path
+                index[node].remove(path)
+                if not index[node]:
+                    del index[node]
+                index.setdefault(new_node, []).append(path)
+
+        return key[1] == env.structure_version
+
+    def _get_paths_node_index(self):
+        # node --> paths, built from self._paths_htable on demand
+        if self._paths_node_index is None:
+            index = {}
+            for path, node in self._paths_htable.items():
+                index.setdefault(node, []).append(path[0] if isinstance(path, tuple) else path)
+            self._paths_node_index = index
+        return self._paths_node_index
+
     def iter_paths(self, conf=None, recursive=True, depth_min=None, depth_max=None, only_paths=False,
                    resolve_generator=False, flush_cache=True):
 
@@ -6525,21 +7115,14 @@ class Node(object):
                 yield path if only_paths else (path, node)
 
     def get_path_from(self, node, conf=None, flush_cache=True, resolve_generator=False):
-        for path, nd in node.iter_paths(conf=conf, flush_cache=flush_cache,
-                                        resolve_generator=resolve_generator):
-            if nd == self:
-                return path
-        else:
-            return None
+        paths = self.get_all_paths_from(node, conf=conf, flush_cache=flush_cache,
+                                        resolve_generator=resolve_generator)
+        return paths[0] if paths else None
 
 
     def get_all_paths_from(self, node, conf=None, flush_cache=True, resolve_generator=False):
-        l = []
-        for path, nd in node.iter_paths(conf=conf, flush_cache=flush_cache,
-                                        resolve_generator=resolve_generator):
-            if nd == self:
-                l.append(path)
-        return l
+        node.get_all_paths(conf=conf, flush_cache=flush_cache, resolve_generator=resolve_generator)
+        return list(node._get_paths_node_index().get(self, []))
 
     def is_path_valid(self, path, resolve_generator=False):
         htable = self.get_all_paths(resolve_generator=resolve_generator, flush_cache=True)
@@ -6572,6 +7155,118 @@ class Node(object):
             self.unfreeze(conf=conf, recursive=recursive)
             self.freeze(conf=conf, recursive=recursive)
 
+    def freeze_batch(self, n, resolve_csp=False, as_nodes=False):
+        """
+        Produce `n` independent variants of the node in one call. Each of them is frozen from the
+        current state of the node, as would do `n` copies of it, but the state is restored from a
+        snapshot (cf. :meth:`get_state_snapshot`) instead of copying the graph each time. The node
+        is left in the state of the last variant.
+
+        Args:
+            n (int): number of variants to produce
+            resolve_csp (bool): resolve the CSP, if any, for each variant (cf. :meth:`freeze`)
+            as_nodes (bool): if True, the variants are provided as copy-on-write clones of
+              the node (cf. :meth:`get_clone`). Otherwise, they are provided serialized.
+
+        Returns:
+            list: the variants, either as bytes or as :class:`Node`
+        """
+        snapshot = self.get_state_snapshot() if n > 1 else None
+        variants = []
+        for i in range(n):
+            if i > 0:
+                self.restore_state_snapshot(snapshot)
+            if resolve_csp or as_nodes:
+                self.freeze(resolve_csp=resolve_csp)
+            variants.append(self.get_clone(cow=True) if as_nodes else self.to_bytes())
+        return variants
+
+    def compile(self):
+        """
+        Collapse the subtrees of the graph whose serialized value cannot change (fixed headers,
+        single-value typed nodes, non-terminal nodes with a static structure made of such nodes, ...)
+        into precomputed byte segments. The graph then behaves like a template: these segments are
+        neither unfrozen nor walked through anymore, and only the other nodes (the holes of the
+        template) are frozen again after an :meth:`unfreeze`.
+
+        A collapsed subtree is expanded back, as a whole, as soon as one of its nodes is changed
+        through the :class:`Node` API (new value, absorption, attribute change, corruption
+        from a disruptor, ...). Calling this method again collapses the subtrees anew.
+
+        .. note:: Nodes with alternate configurations, entangled nodes, synchronized nodes,
+          generator or function nodes, and CSP variables are never collapsed.
+
+        Returns:
+            int: the number of nodes that have been collapsed
+        """
+        env = self.env
+        if env is None:
+            raise ValueError('the node shall have an Env() to be compiled')
+
+        self.freeze()
+        csp_vars = set() if env.csp is None else set(env.csp.var_mapping.values())
+
+        def get_subnodes(node):
+            internals = node.internals[node.current_conf]
+            if isinstance(internals, NodeInternals_NonTerm):
+                return internals.frozen_node_list or ()
+            elif isinstance(internals, NodeInternals_GenFunc):
+                gen_node = internals._generated_node
+                return () if gen_node is None else (gen_node,)
+            else:
+                return ()
+
+        def is_static(node, subnodes):
+            internals = node.internals[node.current_conf]
+            if len(node.internals) > 1 or node.entangled_nodes or node in csp_vars \
+                    or node._post_freeze_handler is not None or internals._sync_with \
+                    or internals.is_attr_set(NodeInternals.DISABLED) \
+                    or internals.is_attr_set(NodeInternals.AutoSeparator) \
+                    or (internals.custo is not None and internals.custo.transform_func is not None):
+                return False
+            if isinstance(internals, NodeInternals_TypedValue):
+                return internals.value_type.is_constant()
+            elif isinstance(internals, NodeInternals_NonTerm):
+                return internals.frozen_node_list is not None and internals.has_static_structure() \
+                    and all(static[n] for n in subnodes)
+            else:
+                return isinstance(internals, NodeInternals_Empty)
+
+        # Step 1 - find out the static nodes, children first
+        static = {}
+        nodes = [(self, False)]
+        while nodes:
+            node, subnodes_done = nodes.pop()
+            if subnodes_done:
+                static[node] = is_static(node, get_subnodes(node))
+            elif node not in static:
+                static[node] = False  # avoid visiting it twice
+                node._static_region = None
+                nodes.append((node, True))
+                nodes.extend((n, False) for n in get_subnodes(node))
+
+        # Step 2 - collapse the subtrees whose root is static. The subnodes of a non-terminal
+        # node collapsing its padding are kept apart as it needs their NodeInternals.
+        collapsed_qty = 0
+        nodes = [(self, True)]
+        while nodes:
+            node, collapsible = nodes.pop()
+            if collapsible and static[node]:
+                region = _StaticRegion(node, node._tobytes())
+                subtree = [node]
+                while subtree:
+                    n = subtree.pop()
+                    n._static_region = region
+                    n.internals[n.current_conf]._owner = n
+                    collapsed_qty += 1
+                    subtree.extend(get_subnodes(n))
+            else:
+                internals = node.internals[node.current_conf]
+                collapsible = not isinstance(internals, NodeInternals_NonTerm) \
+                              or not internals.custo.collapse_padding_mode
+                nodes.extend((n, collapsible) for n in get_subnodes(node))
+
+        return collapsed_qty
 
     def freeze(self, conf=None, recursive=True, return_node_internals=False, restrict_csp=False, resolve_csp=False):
         """
@@ -6652,6 +7347,11 @@ class Node(object):
 
     def _get_value(self, conf=None, recursive=True, return_node_internals=False, restrict_csp=False):
 
+        region = self._static_region
+        if region is not None and region.root is self and region.value is not None \
+                and not self.env.color_enabled:
+            return region.value
+
         next_conf = conf if recursive else None
         conf2 = conf if self.is_conf_existing(conf) else self.current_conf
 
@@ -6665,6 +7365,9 @@ class Node(object):
                       "been associted to the Node.)".format(self.name))
             raise ValueError
 
+        if self.env is not None and self.env._cow_contexts and not _CowCloneContext.is_stable(internal):
+            self.env.preserve_cow_clones(self)
+
         ret, was_not_frozen = internal._get_value(conf=next_conf, recursive=recursive,
                                                   return_node_internals=return_node_internals,
                                                   restrict_csp=restrict_csp)
@@ -6732,6 +7435,7 @@ class Node(object):
         return self.internals[conf].is_frozen()
 
     def reset_state(self, recursive=False, exclude_self=False, conf=None, ignore_entanglement=False):
+        self._notify_update()
         self._delayed_jobs_called = False
         current_conf, next_conf = self._compute_confs(conf=conf, recursive=recursive)
         self.internals[current_conf].reset_state(recursive=recursive, exclude_self=exclude_self, conf=next_conf,
@@ -6744,6 +7448,36 @@ class Node(object):
 
 
     def to_bytes(self, conf=None, recursive=True):
+        """
+        Freeze the node and return its serialized value.
+
+        When the attached :class:`Env` has its ``bytes_cache_enabled`` attribute set (default
+        behavior), each node keeps its serialized value. A change on a node (unfreeze,
+        new value, absorption, ...), be it performed through the node or directly on its
+        :class:`NodeInternals`, only invalidates the path from this node up to the roots
+        that have serialized it, so that only this path is serialized again while the clean
+        sibling subtrees reuse their cached values.
+
+        Args:
+            conf (str): configuration to use. The cache is only used with the current ones.
+            recursive (bool): if ``False``, the cache won't be used.
+
+        Returns:
+            bytes: the serialized node
+        """
+        if conf is None and recursive and self.env is not None \
+                and self.env.bytes_cache_enabled and not self.env.color_enabled:
+            if self._bytes_cache is not None and not self.env.delayed_jobs_pending:
+                return self._bytes_cache
+            # Only the dirty subtrees are frozen. We fall back to a complete freeze
+            # if DJobs have been registered in the meantime (cf. Node.freeze() step 2)
+            val = self._get_bytes_from_cache()[0]
+            if self.env.delayed_jobs_enabled and self.env.delayed_jobs_pending:
+                self.freeze()
+                val = self._get_bytes_from_cache()[0]
+            else:
+                self._delayed_jobs_called = True
+            return val
 
         def tobytes_helper(node_internals):
             if isinstance(node_internals, bytes):
@@ -6766,6 +7500,67 @@ class Node(object):
 
         return val
 
+    def to_segments(self, conf=None, recursive=True):
+        """
+        Freeze the node and return its serialized value as a list of segments, whose concatenation
+        is the value returned by :meth:`to_bytes`. The segments are the values of the terminal
+        nodes (or the cached values of the subtrees already serialized), so that data can be
+        handed over to the kernel (e.g., through :func:`os.writev` or :meth:`socket.socket.sendmsg`)
+        without building the whole value.
+
+        Args:
+            conf (str): configuration to use
+            recursive (bool): refer to :meth:`to_bytes`
+
+        Returns:
+            list: the segments (:class:`bytes` objects) of the serialized node
+        """
+        if conf is None and recursive and self.env is not None \
+                and self.env.bytes_cache_enabled and not self.env.color_enabled:
+            if self._bytes_cache is not None and not self.env.delayed_jobs_pending:
+                return [self._bytes_cache]
+            segments = []
+            self._get_segments_from_cache(segments)
+            if self.env.delayed_jobs_enabled and self.env.delayed_jobs_pending:
+                # same as in Node.to_bytes()
+                self.freeze()
+                segments = []
+                self._get_segments_from_cache(segments)
+            else:
+                self._delayed_jobs_called = True
+            return segments
+
+        def tobytes_helper(node_internals):
+            if isinstance(node_internals, bytes):
+                return node_internals
+            else:
+                return node_internals._get_value(conf=conf, recursive=recursive,
+                                                 return_node_internals=False)[0]
+
+        node_internals_list = self.freeze(conf=conf, recursive=recursive)
+        if isinstance(node_internals_list, list):
+            return [v for v in map(tobytes_helper, flatten(node_internals_list)) if v]
+        else:
+            return [node_internals_list]
+
+    def _get_segments_from_cache(self, segments):
+        # Same walk as Node._get_bytes_from_cache() except that the values of the
+        # non-terminal nodes that are not cached yet are not built.
+        if self._bytes_cache is None:
+            internal = self.internals[self.current_conf]
+            if isinstance(internal, NodeInternals_NonTerm) and internal.frozen_node_list is None:
+                self._get_value(return_node_internals=True)
+            if isinstance(internal, NodeInternals_NonTerm) and internal.frozen_node_list is not None \
+                    and not internal.custo.collapse_padding_mode and not internal.encoder:
+                for n in internal.frozen_node_list:
+                    if not n.is_attr_set(NodeInternals.DISABLED):
+                        n._get_segments_from_cache(segments)
+                return
+
+        val = self._get_bytes_from_cache()[0]
+        if val:
+            segments.append(val)
+
     def to_str(self, conf=None, recursive=True):
         val = self.to_bytes(conf=conf, recursive=recursive)
         return unconvert_from_internal_repr(val)
@@ -6798,8 +7593,8 @@ class Node(object):
         if isinstance(node_internals_list, list):
             node_internals_list = list(flatten(node_internals_list))
             if node_internals_list:
-                if issubclass(node_internals_list[0].__class__, NodeInternals):
-                    node_internals_list = list(map(tobytes_helper, node_internals_list))
+                # the list may mix NodeInternals and bytes (encoded or compiled subtrees)
+                node_internals_list = list(map(tobytes_helper, node_internals_list))
                 val = b''.join(node_internals_list)
             else:
                 val = b''
@@ -6808,8 +7603,115 @@ class Node(object):
 
         return val
 
+    def _get_bytes_from_cache(self):
+        """
+        Serialize the node by reusing the cached value of every clean subtree and by freezing
+        only the dirty ones. The nodes that are serialized again register their parent so that
+        they can propagate a future invalidation to it.
+
+        Returns:
+            tuple: the serialized value and a boolean which is ``True`` if the value has been cached
+        """
+        if self._bytes_cache is not None:
+            return self._bytes_cache, True
+
+        internal = self.internals[self.current_conf]
+        cacheable = True
+
+        if isinstance(internal, NodeInternals_NonTerm):
+            if internal.frozen_node_list is None:
+                self._get_value(return_node_internals=True)
+            if internal.frozen_node_list is None or internal.custo.collapse_padding_mode:
+                return self._tobytes(), False
+            val_list = []
+            for n in internal.frozen_node_list:
+                if n.is_attr_set(NodeInternals.DISABLED):
+                    # its existence could be resolved by the next freeze
+                    cacheable = False
+                    continue
+                val, subnode_cacheable = n._get_bytes_from_cache()
+                if subnode_cacheable:
+                    n._add_bytes_cache_parent(self)
+                else:
+                    cacheable = False
+                val_list.append(val)
+            val = b''.join(val_list)
+            if internal.encoder:
+                val = internal.encoder.encode(val)
+
+        elif isinstance(internal, NodeInternals_GenFunc):
+            if internal.custo.trigger_last_mode or not internal.is_attr_set(NodeInternals.Freezable):
+                return self._tobytes(), False
+            if internal._generated_node is None:
+                self._get_value(return_node_internals=True)
+            val, cacheable = internal.generated_node._get_bytes_from_cache()
+            if cacheable:
+                internal.generated_node._add_bytes_cache_parent(self)
+
+        elif isinstance(internal, NodeInternals_Term):
+            if internal.frozen_node is None:
+                val = self._tobytes()
+                if internal.frozen_node is None:
+                    return val, False
+            val = internal.frozen_node
+
+        else:
+            val = self._tobytes()
+
+        if cacheable:
+            self._bytes_cache = val
+            # the changes performed directly on the internals have to invalidate the cache
+            internal._owner = self
+
+        return val, cacheable
+
+    def _notify_update(self, structure=False, attrs=False):
+        # Shall be called before any change on the node. @structure shall be True if the
+        # nodes reachable from this one may change (cf. Node.get_all_paths()), and @attrs
+        # if its internals or its semantics are replaced (cf. Node.iter_reachable_nodes())
+        self._preserve_cow_clones()
+        self._invalidate_bytes_cache()
+        if self._static_region is not None:
+            self._static_region.value = None
+        env = self.env
+        if env is not None:
+            if structure:
+                env.structure_version += 1
+            if attrs:
+                env.attrs_version += 1
+
+    def _preserve_cow_clones(self):
+        env = self.env
+        if env is not None and env._cow_contexts:
+            env.preserve_cow_clones(self)
+
+    def _cow_materialize(self):
+        ctx = self.__dict__.pop('_cow_ctx')
+        base_node = self.__dict__.pop('_cow_base')
+        ctx.materialize(self, base_node)
+
+    def _add_bytes_cache_parent(self, node):
+        if self._bytes_cache_parents is None:
+            self._bytes_cache_parents = {node}
+        else:
+            self._bytes_cache_parents.add(node)
+
+    def _invalidate_bytes_cache(self):
+        # A valid cache implies valid caches for the whole subtree, thus the propagation
+        # can stop on the nodes whose cache is already invalid.
+        self._bytes_cache = None
+        node_list = [self]
+        while node_list:
+            node = node_list.pop()
+            if node._bytes_cache_parents:
+                for p in node._bytes_cache_parents:
+                    if p._bytes_cache is not None:
+                        p._bytes_cache = None
+                        node_list.append(p)
+
     def set_frozen_value(self, value, conf=None):
         conf = self._check_conf(conf)
+        self._notify_update()
 
         if self.is_term(conf):
             value = convert_to_internal_repr(value)
@@ -6819,6 +7721,7 @@ class Node(object):
 
     def set_default_value(self, value, conf=None):
         conf = self._check_conf(conf)
+        self._notify_update()
 
         if self.is_term(conf):
             self.internals[conf]._set_default_value(value)
@@ -6827,11 +7730,22 @@ class Node(object):
 
     def fix_synchronized_nodes(self, conf=None):
         conf = self._check_conf(conf)
+        self._notify_update()
         self.internals[conf].synchronize_nodes(self)
 
+    def update_value(self, value, conf=None):
+        conf = self._check_conf(conf)
+        self._notify_update()
+        self.internals[conf].update_value(value)
+
     def unfreeze(self, conf=None, recursive=True, dont_change_state=False,
                  ignore_entanglement=False, only_generators=False,
                  reevaluate_constraints=False, walk_csp=False, walk_csp_step_size=1):
+        if self._static_region is not None and self._static_region.value is not None:
+            # part of a compiled graph that cannot change (cf. Node.compile())
+            return
+
+        self._notify_update()
         self._delayed_jobs_called = False
 
         next_conf = conf
@@ -6863,6 +7777,10 @@ class Node(object):
                            reevaluate_constraints=reevaluate_constraints)
 
     def unfreeze_all(self, recursive=True, ignore_entanglement=False):
+        if self._static_region is not None and self._static_region.value is not None:
+            return
+
+        self._notify_update()
         self._delayed_jobs_called = False
 
         for conf in self.internals:
@@ -7266,6 +8184,10 @@ class Node(object):
         return self.env._color_enabled
 
     def __getattr__(self, name):
+        if '_cow_ctx' in self.__dict__:
+            # copy-on-write clone which is accessed for the first time
+            self._cow_materialize()
+            return getattr(self, name)
         internals = self.__getattribute__('internals')[self.current_conf]
         if hasattr(internals, name):
             return getattr(internals, name)
@@ -7273,6 +8195,758 @@ class Node(object):
             return object.__getattribute__(self, name)
 
 
+class _StaticRegion(object):
+    '''
+    Subtree of a compiled graph whose serialized value cannot change (cf. :meth:`Node.compile`).
+    All its nodes refer to it. Its value is reset as soon as one of them is changed.
+    '''
+
+    __slots__ = ('root', 'value')
+
+    def __init__(self, root, value):
+        self.root = root
+        self.value = value
+
+
+class _AbsorptionSession(object):
+    '''
+    State of an absorption in progress, shared by all the nodes involved in it through
+    their :class:`Env` (cf. :meth:`Node.absorb`).
+
+    The memo records the rejections of the non-terminal subgraphs which only depend on
+    the absorbed blob. Its entries are identified by the subgraph, the offset of the blob from
+    the end of the blob of the outermost absorption, the constraints and the configuration.
+    Each entry is bound to a version of the subgraph. The clock is incremented each time a node
+    absorbs something or has its absorption cancelled. As the nodes of a subgraph only change
+    within the absorption of its root, the version of the latter is incremented if the clock has
+    moved during its absorption, or if its absorption is cancelled.
+    '''
+
+    __slots__ = ('memo', 'versions', 'clock', 'profiler', '_root_blob', '_last_suffix',
+                 '_context_free')
+
+    def __init__(self, root_blob, memo_enabled, profiler):
+        # (id(node), offset from the end, constraints, conf) --> (node, version, result)
+        self.memo = {} if memo_enabled else None
+        self.versions = {}
+        self.clock = 0
+        self.profiler = profiler
+        self._root_blob = self._get_root_buffer(root_blob)
+        self._last_suffix = root_blob
+        # id(node) --> (node, bool)
+        self._context_free = {}
+
+    def is_context_free(self, node):
+        item = self._context_free.get(id(node))
+        if item is not None and item[0] is node:
+            return item[1]
+
+        context_free = not node.entangled_nodes
+        for i in node.internals.values():
+            if not context_free:
+                break
+            if isinstance(i, (NodeInternals_GenFunc, NodeInternals_Func)) or i._sync_with \
+                    or i.is_attr_set(NodeInternals.Abs_Postpone):
+                context_free = False
+            elif isinstance(i, NodeInternals_NonTerm):
+                subnodes = list(i.subnodes_set)
+                if i.separator is not None:
+                    subnodes.append(i.separator.node)
+                if i.custo.collapse_padding_mode:
+                    # the absorption of the subnodes depends on the bits consumed by
+                    # the previous ones
+                    for n in subnodes:
+                        self._context_free[id(n)] = (n, False)
+                    context_free = False
+                else:
+                    context_free = all(self.is_context_free(n) for n in subnodes)
+
+        self._context_free[id(node)] = (node, context_free)
+        return context_free
+
+    @staticmethod
+    def _get_root_buffer(view):
+        # the comparison of memoryviews is far slower than the one of the objects they expose
+        obj = view.obj
+        if isinstance(obj, (bytes, bytearray, mmap.mmap)) and len(obj) == view.nbytes:
+            return obj
+        else:
+            return bytes(view)
+
+    def _is_suffix(self, blob):
+        # the blobs given to the subnodes are the remaining parts of the outermost one,
+        # except for the ones decoded by an encoder or cut for a postponed node
+        root = self._root_blob
+        if blob is self._last_suffix:
+            return True
+        elif len(blob) > len(root):
+            return False
+
+        if isinstance(root, mmap.mmap):
+            start = len(root) - len(blob)
+            suffix = root.find(blob, start) == start
+        else:
+            suffix = root.endswith(blob)
+        if suffix:
+            self._last_suffix = blob
+        return suffix
+
+    def get_key(self, node, blob, constraints, conf):
+        if not isinstance(blob, (bytes, memoryview)):
+            return None
+        return id(node), len(blob), tuple(constraints.constraints.values()), conf
+
+    # The key is only valid if the blob is a suffix of the outermost one, which is
+    # checked only when the memo is actually read or written as it costs a comparison.
+
+    def lookup(self, node, key, blob):
+        entry = self.memo.get(key)
+        if entry is not None and entry[0] is node and entry[1] == self.versions.get(key[0], 0) \
+                and self._is_suffix(blob):
+            return entry[2]
+        return None
+
+    def store(self, node, key, blob, result):
+        if self._is_suffix(blob):
+            self.memo[key] = (node, self.versions.get(key[0], 0), result)
+
+    def notify_change(self, node):
+        self.versions[id(node)] = self.versions.get(id(node), 0) + 1
+
+
+class AbsorptionProfiler(object):
+    '''
+    Collect the time spent and the number of attempts for each node involved in
+    an absorption (cf. :meth:`Node.absorb` and :meth:`DataModel.absorb`).
+
+    The nodes are identified by their names, the clones created for the absorption
+    of nodes with a quantity greater than one being accounted to the original node.
+    The time of a node includes the time spent within its subnodes.
+    '''
+
+    def __init__(self):
+        # node name --> [attempts, rejections, memoized rejections, time]
+        self.stats = collections.OrderedDict()
+
+    def record(self, node, status, duration, memoized=False):
+        name = node.name
+        base_name, sep, clone_no = name.rpartition(':')
+        if sep and clone_no.isdigit():
+            name = base_name
+        stats = self.stats.get(name)
+        if stats is None:
+            self.stats[name] = stats = [0, 0, 0, 0.0]
+        stats[0] += 1
+        if status == AbsorbStatus.Reject:
+            stats[1] += 1
+            if memoized:
+                stats[2] += 1
+        stats[3] += duration
+
+    def reset(self):
+        self.stats = collections.OrderedDict()
+
+    def get_report(self, limit=None):
+        """
+        Args:
+          limit (int): only report the `limit` nodes that took the most time
+
+        Returns:
+          str: the statistics of the nodes, sorted by decreasing time
+        """
+        stats = sorted(self.stats.items(), key=lambda x: x[1][3], reverse=True)
+        if limit is not None:
+            stats = stats[:limit]
+        header = '{:<40s}{:>10s}{:>10s}{:>10s}{:>12s}'.format('Node', 'attempts', 'rejected',
+                                                             'memoized', 'time (ms)')
+        lines = [header, '-'*len(header)]
+        for name, (attempts, rejected, memoized, duration) in stats:
+            lines.append('{:<40s}{:>10d}{:>10d}{:>10d}{:>12.2f}'.format(name, attempts, rejected,
+                                                                       memoized, duration*1000))
+        return '\n'.join(lines)
+
+
+class NodeStateSnapshot(object):
+    '''
+    State of the nodes reachable from a node (cf. :meth:`Node.get_state_snapshot`).
+    '''
+
+    def __init__(self, node):
+        self.node = node
+        # (node, current conf, internals, state of each internals, entangled nodes,
+        #  delayed jobs flag) for each node
+        self._node_states = []
+        node_ids = {id(node)}
+        nodes = [node]
+        while nodes:
+            n = nodes.pop()
+            internals = dict(n.internals)
+            states = {}
+            for conf, node_internals in internals.items():
+                if node_internals is None:
+                    continue
+                states[conf] = node_internals._get_state()
+                for child in self._get_child_nodes(node_internals):
+                    if id(child) not in node_ids:
+                        node_ids.add(id(child))
+                        nodes.append(child)
+            self._node_states.append((n, n.current_conf, internals, states,
+                                      copy.copy(n.entangled_nodes), n._delayed_jobs_called))
+        self._node_ids = node_ids
+
+        self._env = env = node.env
+        if env is not None:
+            drawn_node_attrs = env.env4NT.drawn_node_attrs
+            self._drawn_node_attrs = {i: drawn_node_attrs[i] for i in node_ids if i in drawn_node_attrs}
+            self._exhausted_nodes = [n for n in env.exhausted_nodes if id(n) in node_ids]
+            self._csp_state = None if env.csp is None else env.csp.get_state()
+
+    @staticmethod
+    def _get_child_nodes(node_internals):
+        # All the nodes whose state may change when node_internals is frozen or unfrozen
+        if isinstance(node_internals, NodeInternals_NonTerm):
+            nodes = list(node_internals.subnodes_set)
+            if node_internals.frozen_node_list:
+                nodes += node_internals.frozen_node_list
+            if node_internals.separator is not None:
+                nodes.append(node_internals.separator.node)
+            return nodes
+        elif isinstance(node_internals, NodeInternals_GenFunc):
+            gen_node = node_internals._generated_node
+            return () if gen_node is None else (gen_node,)
+        else:
+            return ()
+
+    def restore(self):
+        self.node._notify_update(structure=True, attrs=True)
+        for n, conf, internals, states, entangled_nodes, djobs_called in self._node_states:
+            n._notify_update()
+            if n.internals != internals:
+                n.internals = dict(internals)
+            for c, state in states.items():
+                internals[c]._set_state(state)
+            n.current_conf = conf
+            n.entangled_nodes = copy.copy(entangled_nodes)
+            n._delayed_jobs_called = djobs_called
+
+        env = self._env
+        if env is not None:
+            node_ids = self._node_ids
+            drawn_node_attrs = env.env4NT.drawn_node_attrs
+            for i in node_ids:
+                attrs = self._drawn_node_attrs.get(i, None)
+                if attrs is None:
+                    drawn_node_attrs.pop(i, None)
+                else:
+                    drawn_node_attrs[i] = attrs
+            env.exhausted_nodes = [n for n in env.exhausted_nodes if id(n) not in node_ids] \
+                                  + self._exhausted_nodes
+            if self._csp_state is not None and env.csp is not None:
+                env.csp.set_state(self._csp_state)
+
+
+class _ReachableNodesIndex(object):
+    '''
+    Nodes reachable from a node, in the order of Node.iter_reachable_nodes(), along with
+    secondary indexes on their kinds, attributes and semantics that are built on demand.
+    '''
+
+    def __init__(self, node, conf, ignore_fstate, resolve_generator):
+        self.conf = conf
+        self.resolve_generator = resolve_generator
+        # The versions are retrieved before the walk, as resolving generators may change the
+        # graph while it is walked through, in which case the index will be built again
+        env = node.env
+        self.env = env
+        self.structure_version = env.structure_version
+        self.attrs_version = env.attrs_version
+        self.generators = []
+        self.nodes = list(node._walk_reachable_nodes(conf, ignore_fstate, resolve_generator,
+                                                     generators=self.generators))
+        self.positions = {n: i for i, n in enumerate(self.nodes)}
+        # ('kind'|'attr'|'sem', criterion) --> positions of the matching nodes
+        self.subsets = {}
+
+    def _internals(self, node):
+        conf = self.conf
+        return node.internals[conf if node.is_conf_existing(conf) else node.current_conf]
+
+    def _match(self, node, key):
+        kind, crit = key
+        if kind == 'kind':
+            return self._internals(node)._match_node_kinds((crit,))
+        elif kind == 'attr':
+            return self._internals(node)._match_mandatory_attrs((crit,))
+        else:
+            return node.semantics is not None and node.semantics._match_mandatory_criteria((crit,))
+
+    def update(self, node):
+        # Return False if the index has to be built again. As for Node.get_all_paths(), the
+        # generator nodes are checked one by one, and only the ones producing terminal nodes
+        # are handled without walking through the graph again.
+        env = node.env
+        if env is not self.env or env.structure_version != self.structure_version:
+            return False
+
+        for idx, (internal, gen_node, walked) in enumerate(self.generators):
+            if internal._generated_node is gen_node \
+                    and (self.resolve_generator or bool(internal.is_frozen()) == walked):
+                continue
+            if not walked or (internal._generated_node is None and not self.resolve_generator):
+                return False
+
+            new_node = internal.generated_node
+            if not self.resolve_generator and not internal.is_frozen():
+                return False
+            pos = self.positions.get(gen_node)
+            if pos is None or new_node in self.positions \
+                    or not isinstance(self._internals(gen_node), NodeInternals_Term) \
+                    or not isinstance(self._internals(new_node), NodeInternals_Term):
+                return False
+
+            self.nodes[pos] = new_node
+            del self.positions[gen_node]
+            self.positions[new_node] = pos
+            self.generators[idx] = (internal, new_node, True)
+            for key, subset in self.subsets.items():
+                if self._match(new_node, key):
+                    subset.add(pos)
+                else:
+                    subset.discard(pos)
+
+        return env.structure_version == self.structure_version
+
+    def _get_subset(self, key):
+        subset = self.subsets.get(key)
+        if subset is None:
+            subset = {i for i, node in enumerate(self.nodes) if self._match(node, key)}
+            self.subsets[key] = subset
+        return subset
+
+    def _get_union(self, kind, criteria):
+        return set().union(*[self._get_subset((kind, c)) for c in criteria])
+
+    def get_candidates(self, internals_criteria, semantics_criteria):
+        # Return the nodes that may match the criteria, and whether they are already checked
+        # against them, which is not the case when some of the criteria are not indexed
+        if self.env.attrs_version != self.attrs_version:
+            self.subsets = {}
+            self.attrs_version = self.env.attrs_version
+
+        subsets = []
+        excluded = []
+        checked = True
+        ic = internals_criteria
+        if ic:
+            if ic.node_kinds is not None:
+                subsets.append(self._get_union('kind', ic.node_kinds))
+            if ic.negative_node_kinds:
+                excluded.append(self._get_union('kind', ic.negative_node_kinds))
+            if ic.mandatory_attrs:
+                subsets.extend([self._get_subset(('attr', a)) for a in ic.mandatory_attrs])
+            if ic.negative_attrs:
+                excluded.append(self._get_union('attr', ic.negative_attrs))
+            if ic.mandatory_custo is not None or ic.negative_custo is not None \
+                    or ic.node_subkinds is not None or ic.negative_node_subkinds is not None \
+                    or ic.has_node_constraints():
+                checked = False
+
+        sc = semantics_criteria
+        if sc:
+            crit = sc.get_mandatory_criteria()
+            if crit:
+                subsets.extend([self._get_subset(('sem', c)) for c in crit])
+            crit = sc.get_optionalbut1_criteria()
+            if crit is not None:
+                subsets.append(self._get_union('sem', crit))
+            crit = sc.get_negative_criteria()
+            if crit:
+                excluded.append(self._get_union('sem', crit))
+            crit = sc.get_exclusive_criteria()
+            if crit is not None:
+                subsets.append(self._get_union('sem', crit))
+                checked = False
+
+        nodes = self.nodes
+        if subsets:
+            positions = set.intersection(*subsets)
+        elif excluded:
+            positions = set(range(len(nodes)))
+        else:
+            return nodes, checked
+        positions.difference_update(*excluded)
+
+        return [nodes[i] for i in sorted(positions)], checked
+
+
+class _CowNodeDico(object):
+    '''
+    Mapping from the nodes of a base graph to the nodes of its copy-on-write clone, which
+    behaves like the dictionary used by Node.set_contents() during a regular copy.
+    '''
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+        # nodes outside the base graph (e.g., separators, external node arguments)
+        self.extras = {}
+
+    def __contains__(self, node):
+        return node in self.extras or self._ctx.is_member(node)
+
+    def __getitem__(self, node):
+        new_node = self.extras.get(node, None)
+        if new_node is not None:
+            return new_node
+        if self._ctx.is_member(node):
+            return self._ctx.get_clone(node)
+        raise KeyError(node)
+
+    def __setitem__(self, node, new_node):
+        self.extras[node] = new_node
+
+    def get(self, node, default=None):
+        try:
+            return self[node]
+        except KeyError:
+            return default
+
+
+class _CowNodeIdMap(object):
+    '''
+    Mapping from the ids of the nodes of a base graph to the ids of the nodes of its
+    copy-on-write clone (cf. Env.id_map)
+    '''
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+
+    def get(self, node_id, default=None):
+        node = self._ctx.members.get(node_id, None)
+        if node is not None:
+            return id(self._ctx.pin(node))
+        for node, new_node in self._ctx.node_dico.extras.items():
+            if id(node) == node_id:
+                return id(new_node)
+        return default
+
+
+class _CowCloneContext(object):
+    '''
+    Shared state of a node graph cloned in a copy-on-write fashion (cf. the `cow` parameter
+    of :class:`Node`).
+
+    Every node of the clone starts as a placeholder which only references its base node.
+    It is materialized---that is, the base node is copied the same way Node.set_contents()
+    does, but without going down the graph---when it is accessed for the first time or when
+    its base node is about to change (cf. :meth:`Env.preserve_cow_clones`). Its subnodes are
+    then new placeholders. Thus, only the paths of the graphs that are accessed or that
+    diverge are actually copied.
+
+    .. note:: The changes performed through the :class:`Node` API and the ones performed
+      directly on the :class:`NodeInternals` (cf. NodeInternals._notify_value_change()) are
+      tracked. The value type objects of the base graph shall not be altered in place while
+      clones of it are in use, as they are only copied when their node is materialized.
+    '''
+
+    # Attributes of the materialized clones which are not taken from their base nodes
+    _reset_attrs = {'_paths_htable': None, '_paths_htable_key': None, '_paths_generators': None,
+                    '_paths_node_index': None, '_reachable_indexes': None}
+    _root_reset_attrs = dict(_reset_attrs, tmp_ref_count=1, abs_postpone_sent_back=None)
+
+    def __init__(self, root, name, base_node, ignore_frozen_state, accept_external_entanglement,
+                 acceptance_set, new_env):
+        self.base_root = base_node
+        self.ignore_frozen_state = ignore_frozen_state
+        self.accept_external_entanglement = accept_external_entanglement
+        self.acceptance_set = acceptance_set
+        self.depth_offset = -base_node.depth
+        self.node_dico = _CowNodeDico(self)
+
+        self._root_ref = weakref.ref(root)
+        self._clones = weakref.WeakValueDictionary()  # base node --> clone
+        self._pinned = {}  # clones which have to be kept even if the graph does not use them yet
+        self._members = None
+        self._owners = None  # id(base node internals) --> base node
+        self._drawn_node_attrs = None
+        # Set when a base node changes. From then on, the serialized values of the base nodes
+        # cannot be reused by the placeholders that are created.
+        self._diverged = False
+
+        base_env = base_node.env
+        if new_env:
+            self.env = Env() if ignore_frozen_state else copy.copy(base_env)
+            if ignore_frozen_state:
+                self.env.csp = copy.copy(base_env.csp)
+        else:
+            self.env = base_env
+
+        self._init_placeholder(root, base_node, name=name)
+        root._delayed_jobs_called = base_node._delayed_jobs_called
+
+        if base_env._cow_contexts is None:
+            base_env._cow_contexts = []
+        base_env._cow_contexts.append(weakref.ref(self))
+
+        if new_env:
+            self._update_env_refs()
+
+        if self.env.csp is not None:
+            for v in self.env.csp.iter_vars():
+                new_node = self.node_dico.get(self.env.csp.var_mapping[v], None)
+                if new_node is None:
+                    # cf. Node.set_contents()
+                    break
+                self.env.csp.map_var_to_node(v, new_node)
+
+    @staticmethod
+    def is_stable(node_internals):
+        # Tell if Node._get_value() leaves the node internals unchanged
+        if isinstance(node_internals, NodeInternals_GenFunc):
+            return node_internals._generated_node is not None \
+                   and node_internals.is_attr_set(NodeInternals.Freezable) \
+                   and (node_internals._trigger_registered or not node_internals.custo.trigger_last_mode)
+        elif isinstance(node_internals, NodeInternals_Empty):
+            return True
+        else:
+            return node_internals.is_frozen()
+
+    @property
+    def members(self):
+        # id(base node) --> base node, for every node of the base graph, except its root,
+        # which has a counterpart in the clone
+        if self._members is None:
+            self._members = self._collect_members()
+        return self._members
+
+    def _collect_members(self):
+        members = {}
+        owners = {}
+        node_list = [self.base_root]
+        while node_list:
+            node = node_list.pop()
+            for node_internals in node.internals.values():
+                owners[id(node_internals)] = node
+                if isinstance(node_internals, NodeInternals_NonTerm):
+                    subnodes = node_internals.subnodes_set
+                    if node_internals.frozen_node_list is not None and not self.ignore_frozen_state:
+                        subnodes = itertools.chain(subnodes, node_internals.frozen_node_list)
+                elif isinstance(node_internals, NodeInternals_GenFunc) \
+                        and node_internals._generated_node is not None and not self.ignore_frozen_state:
+                    subnodes = (node_internals._generated_node,)
+                else:
+                    continue
+                for n in subnodes:
+                    if n is not self.base_root and id(n) not in members:
+                        members[id(n)] = n
+                        node_list.append(n)
+        self._owners = owners
+        return members
+
+    def is_member(self, node):
+        return self.members.get(id(node), None) is node
+
+    def get_clone(self, node):
+        clone = self._clones.get(node, None)
+        if clone is None:
+            clone = self._pinned.get(node, None)
+            if clone is None:
+                clone = type(node).__new__(type(node))
+                self._init_placeholder(clone, node)
+            self._clones[node] = clone
+        return clone
+
+    def pin(self, node):
+        clone = self.get_clone(node)
+        self._pinned[node] = clone
+        return clone
+
+    def _init_placeholder(self, clone, base_node, name=None):
+        clone.name = base_node.name if name is None else name
+        clone.env = self.env
+        clone.depth = base_node.depth + self.depth_offset
+        clone._bytes_cache = None if self.ignore_frozen_state or self._diverged else base_node._bytes_cache
+        clone._bytes_cache_parents = None
+        clone._static_region = None
+        d = clone.__dict__
+        d['_cow_ctx'] = self
+        d['_cow_base'] = base_node
+        if self._drawn_node_attrs:
+            attrs = self._drawn_node_attrs.get(id(base_node), None)
+            if attrs is not None:
+                self.env.env4NT.drawn_node_attrs[id(clone)] = attrs
+
+    def _link_bytes_cache(self, clone, subnodes):
+        # The cached value of the clone is only valid as long as the ones of its subnodes
+        # are. The subnodes created after a change of the base graph have no cached value
+        # (cf. self._diverged), in which case the one of the clone is dropped too.
+        if clone._bytes_cache is None:
+            return
+        valid = True
+        for n in subnodes:
+            n._add_bytes_cache_parent(clone)
+            if n._bytes_cache is None:
+                valid = False
+        if not valid:
+            clone._invalidate_bytes_cache()
+
+    def _update_env_refs(self):
+        # Equivalent of Env.update_node_refs() where the node ids are mapped lazily
+        env = self.env
+        env.id_list = []
+        env._id_map = _CowNodeIdMap(self)
+
+        if env.exhausted_nodes or env.nodes_to_corrupt:
+            node_dico = self.node_dico
+            env.exhausted_nodes = [node_dico[n] for n in env.exhausted_nodes if n in node_dico]
+            env.nodes_to_corrupt = {node_dico[n]: op for n, op in env.nodes_to_corrupt.items()
+                                    if n in node_dico}
+
+        if env.env4NT.drawn_node_attrs and not self.ignore_frozen_state:
+            self._drawn_node_attrs = env.env4NT.drawn_node_attrs
+            env.env4NT.drawn_node_attrs = {}
+            env._cow_clone_ctx = self
+
+    def flush_env_info(self):
+        # Create the clones which are still referenced by the Env() information
+        if self._drawn_node_attrs:
+            for node_id in list(self._drawn_node_attrs):
+                node = self.members.get(node_id, None)
+                if node is not None:
+                    self.pin(node)
+            self._drawn_node_attrs = None
+        self.env._cow_clone_ctx = None
+
+    def preserve(self, node):
+        if isinstance(node, NodeInternals):
+            node_internals = node
+            self.members  # make sure self._owners is available
+            node = self._owners.get(id(node_internals), None)
+            if node is None or all(i is not node_internals for i in node.internals.values()):
+                return
+
+        if node is self.base_root:
+            clone = self._root_ref()
+            if clone is None:
+                return
+        elif self.members.get(id(node), None) is node:
+            clone = self._clones.get(node, None)
+            if clone is None:
+                clone = self.pin(node)
+        else:
+            return
+
+        self._diverged = True
+        if '_cow_ctx' in clone.__dict__:
+            clone._cow_materialize()
+
+    def materialize(self, clone, base_node):
+        if '_cow_ctx' in base_node.__dict__:
+            base_node._cow_materialize()
+
+        ignore_frozen_state = self.ignore_frozen_state
+        accept_external_entanglement = self.accept_external_entanglement
+        node_dico = self.node_dico
+        is_root = base_node is self.base_root
+
+        # The attributes already set on the placeholder are kept. Note that the unset
+        # slots of the placeholder shall not be read through getattr() which would
+        # trigger Node.__getattr__().
+        reset_attrs = self._root_reset_attrs if is_root else self._reset_attrs
+        for k in Node._slots:
+            try:
+                object.__getattribute__(clone, k)
+                continue
+            except AttributeError:
+                pass
+            if k in reset_attrs:
+                object.__setattr__(clone, k, reset_attrs[k])
+            else:
+                object.__setattr__(clone, k, object.__getattribute__(base_node, k))
+        d = clone.__dict__
+        for k, v in base_node.__dict__.items():
+            if k not in d:
+                d[k] = v
+
+        if base_node.semantics is not None:
+            clone.semantics = copy.copy(base_node.semantics)
+            clone.semantics.make_private()
+
+        entangled_set = set()
+        delayed_node_internals = set()
+        clone.internals = {}
+        for conf, base_internals in base_node.internals.items():
+            node_internals = copy.copy(base_internals)
+            clone.internals[conf] = node_internals
+            if node_internals is None:
+                continue
+            node_internals._env = self.env
+
+            if isinstance(node_internals, NodeInternals_NonTerm):
+                node_internals.import_private_subnodes(node_dico, ignore_frozen_state=ignore_frozen_state,
+                                                       node_getter=self.get_clone)
+                node_internals.make_private(ignore_frozen_state=ignore_frozen_state,
+                                            accept_external_entanglement=accept_external_entanglement,
+                                            delayed_node_internals=delayed_node_internals)
+                if node_internals.separator is not None:
+                    node_internals.separator.node._reset_depth(clone.depth)
+                if node_internals.frozen_node_list is not None:
+                    self._link_bytes_cache(clone, node_internals.frozen_node_list)
+
+            elif isinstance(node_internals, NodeInternals_GenFunc):
+                generated_node = node_internals._generated_node
+                trigger_registered = node_internals._trigger_registered
+                node_internals._generated_node = None
+                node_internals.make_private(ignore_frozen_state=ignore_frozen_state,
+                                            accept_external_entanglement=accept_external_entanglement,
+                                            delayed_node_internals=delayed_node_internals)
+                if generated_node is not None and not ignore_frozen_state:
+                    node_internals._generated_node = self.get_clone(generated_node)
+                    node_internals._trigger_registered = trigger_registered
+                    self._link_bytes_cache(clone, (node_internals._generated_node,))
+                node_internals.pdepth = clone.depth
+                if is_root or node_internals.node_arg is not None:
+                    node_internals.make_args_private(node_dico, entangled_set,
+                                                     ignore_frozen_state=ignore_frozen_state,
+                                                     accept_external_entanglement=accept_external_entanglement)
+
+            else:
+                node_internals.make_private(ignore_frozen_state=ignore_frozen_state,
+                                            accept_external_entanglement=accept_external_entanglement,
+                                            delayed_node_internals=delayed_node_internals)
+                if isinstance(node_internals, NodeInternals_Func) \
+                        and (is_root or node_internals.node_arg is not None):
+                    node_internals.make_args_private(node_dico, entangled_set,
+                                                     ignore_frozen_state=ignore_frozen_state,
+                                                     accept_external_entanglement=accept_external_entanglement)
+
+        for node_internals in delayed_node_internals:
+            node_internals._update_node_refs(node_dico, debug=node_internals)
+
+        if clone._bytes_cache is not None:
+            # cf. Node._get_bytes_from_cache()
+            clone.internals[clone.current_conf]._owner = clone
+
+        if base_node.entangled_nodes is not None \
+                and (not ignore_frozen_state or accept_external_entanglement):
+            entangled_nodes = set()
+            for e in base_node.entangled_nodes:
+                new_node = node_dico.get(e, None)
+                if new_node is not None:
+                    entangled_nodes.add(new_node)
+                elif e is self.base_root:
+                    if self._root_ref() is not None:
+                        entangled_nodes.add(self._root_ref())
+                elif accept_external_entanglement \
+                        or (self.acceptance_set is not None and e in self.acceptance_set):
+                    entangled_nodes.add(e)
+            clone.entangled_nodes = entangled_nodes
+        else:
+            clone.entangled_nodes = None
+
+        if self.env.djobs_exists(Node.DJOBS_PRIO_dynhelpers):
+            self.env.execute_basic_djobs(Node.DJOBS_PRIO_dynhelpers)
+
+
 class Env4NT(object):
     ''' 
     Define methods for non-terminal nodes
@@ -7336,9 +9010,33 @@ class Env(object):
         self._djob_groups = None
         self._dm = None
         self.id_list = None
+        self._id_map = None
         self._reentrancy_cpt = 0
         self._color_enabled = False
+        self.bytes_cache_enabled = True
+        # incremented each time the structure of a node graph using this Env changes,
+        # in order to invalidate the path index of its nodes (cf. Node.get_all_paths())
+        self.structure_version = 0
+        # incremented each time the attributes, the kind of internals or the semantics of a
+        # node using this Env change (cf. Node.iter_reachable_nodes())
+        self.attrs_version = 0
         self.csp: CSP = None
+        # weak references to the copy-on-write clone contexts of the nodes using this Env
+        # (cf. Node.__init__() 'cow' parameter), that are notified before any node change
+        self._cow_contexts = None
+        # copy-on-write clone context which still holds some information of this Env
+        self._cow_clone_ctx = None
+        # enable the memo of the absorption rejections (cf. Node.absorb())
+        self.absorption_memo_enabled = True
+        # state of the absorption in progress in a node graph using this Env
+        self._absorption = None
+
+    @property
+    def id_map(self):
+        # old node id --> new node id, lazily built from self.id_list
+        if self._id_map is None:
+            self._id_map = dict(self.id_list)
+        return self._id_map
 
     @property
     def delayed_jobs_pending(self):
@@ -7380,8 +9078,10 @@ class Env(object):
     def add_node_to_corrupt(self, node, corrupt_type=None, corrupt_op=lambda x: x):
         if node.entangled_nodes:
             for n in node.entangled_nodes:
+                n._notify_update()
                 self.nodes_to_corrupt[n] = (corrupt_type, corrupt_op)
         else:
+            node._notify_update()
             self.nodes_to_corrupt[node] = (corrupt_type, corrupt_op)
 
     def remove_node_to_corrupt(self, node):
@@ -7430,6 +9130,7 @@ class Env(object):
         exh_nodes = []
         new_nodes_to_corrupt = {}
         self.id_list = []
+        self._id_map = None
         for old_node, new_node in node_dico.items():
             self.id_list.append((id(old_node), id(new_node)))
             if old_node in self.exhausted_nodes:
@@ -7456,6 +9157,22 @@ class Env(object):
     #     for old_node, new_node in node_dico.items():
     #         self.id_list.append((id(old_node), id(new_node)))
 
+    def preserve_cow_clones(self, node):
+        """
+        Called before `node` is changed, so that the copy-on-write clones it is part of
+        keep the state `node` had when they were created.
+
+        Args:
+          node (Node or NodeInternals): the node to be changed, or its node internals
+        """
+        contexts = []
+        for ctx_ref in self._cow_contexts:
+            ctx = ctx_ref()
+            if ctx is not None:
+                ctx.preserve(node)
+                contexts.append(ctx_ref)
+        self._cow_contexts = contexts if contexts else None
+
     def register_djob(self, func, group, key, cleanup=None, args=None, prio=1):
         if self._sorted_jobs is None:
             self._sorted_jobs = {}
@@ -7550,8 +9267,13 @@ class Env(object):
         del self._djob_groups[prio]
 
     def __copy__(self):
+        if self._cow_clone_ctx is not None:
+            self._cow_clone_ctx.flush_env_info()
+
         new_env = type(self)()
         new_env.__dict__.update(self.__dict__)
+        new_env._cow_contexts = None
+        new_env._absorption = None
         new_env.exhausted_nodes = copy.copy(self.exhausted_nodes)
         new_env.nodes_to_corrupt = copy.copy(self.nodes_to_corrupt)
         new_env.env4NT = copy.copy(self.env4NT)
@@ -27,6 +27,7 @@ import os
 import traceback
 import random
 import collections
+import concurrent.futures
 
 import copy
 import re
@@ -332,6 +333,8 @@ class FmkPlumbing(object):
 
         self._fbk_timeout_max = 0
         self._fbk_timeout_default = 0.005
+        self._tg_polling_period = 0.005  # used for targets that do not notify their state changes
+        self._sending_executor = None  # used when data are sent concurrently to several targets
         self._last_sending_date = None
 
         self._current_sent_date = None
@@ -423,6 +426,8 @@ class FmkPlumbing(object):
     @EnforceOrder(accepted_states=['20_load_prj','25_load_dm','S1','S2'], reset_sm=True)
     def stop(self):
         self._stop_fmk_plumbing()
+        if self._sending_executor is not None:
+            self._sending_executor.shutdown()
         self.fmkDB.stop()
         self._reset_main_objects()
         self.printer.stop()
@@ -2300,7 +2305,7 @@ class FmkPlumbing(object):
     def process_data_and_send(self, data_desc=None, id_from_fmkdb=None, id_from_db=None,
                               max_loop=1, tg_ids=None,
                               verbose=False, console_display=True,
-                              save_generator_seed=False):
+                              save_generator_seed=False, pipelined=False):
         """
         Send data to the selected targets. These data can follow a specific processing before
         being emitted. The latter depends on what is provided in `data_desc`.
@@ -2322,6 +2327,11 @@ class FmkPlumbing(object):
             save_generator_seed: If random Generators are used, the generated data will be internally saved
               and will be reused next time this generator will be called, until
               FmkPlumbing.cleanup_dmaker(... reset_existing_seed=True) is called on this Generator.
+            pipelined: If `True` (and if `data_desc` is provided), the data of the next iteration
+              are generated once the current ones are sent, while the targets handle them. Thus,
+              the generation of the next data does not take into account the feedback related to
+              the current ones, and if the loop ends prematurely, the data generated in advance
+              are dropped. Sending, logging and data IDs are not affected.
 
         Returns:
             The list of data that have been sent. `None` if nothing was sent due to some error.
@@ -2350,10 +2360,8 @@ class FmkPlumbing(object):
                 data_desc.seed = data
 
             data_desc = data_desc if isinstance(data_desc, list) else [data_desc]
-            cpt = 0
-            data_to_send = []
-            while cpt < max_loop or max_loop == -1:
-                cpt += 1
+
+            def get_data_list():
                 data_list = []
                 for d_desc in data_desc:
                     data = self.handle_data_desc(d_desc, resolve_dataprocess=True,
@@ -2364,10 +2372,25 @@ class FmkPlumbing(object):
                     if tg_ids:
                         data.tg_ids = tg_ids
                     data_list.append(data)
+                return data_list
+
+            # in pipelined mode, it holds the data of the next iteration
+            next_data_lists = collections.deque(maxlen=1)
+
+            def prefetch_data_list():
+                if cpt < max_loop or max_loop == -1:
+                    next_data_lists.append(get_data_list())
+
+            cpt = 0
+            data_to_send = []
+            while cpt < max_loop or max_loop == -1:
+                cpt += 1
+                data_list = next_data_lists.popleft() if next_data_lists else get_data_list()
 
                 data_to_send += data_list
                 go_on = self.send_data_and_log(data_list, verbose=verbose,
-                                               console_display=console_display)
+                                               console_display=console_display,
+                                               prefetch=prefetch_data_list if pipelined else None)
                 if not go_on:
                     break
 
@@ -2386,7 +2409,11 @@ class FmkPlumbing(object):
 
 
     @EnforceOrder(accepted_states=['S2'])
-    def send_data_and_log(self, data_list, verbose=False, console_display=True):
+    def send_data_and_log(self, data_list, verbose=False, console_display=True, prefetch=None):
+        '''
+        @prefetch: callable called once the data are sent, before waiting for the targets,
+          so that its execution overlaps the handling of the data by the targets
+        '''
 
         if not console_display:
             lg_display_on_term_save = self.lg.display_on_term
@@ -2424,6 +2451,13 @@ class FmkPlumbing(object):
             #   in the scenario).
             return True
 
+        if prefetch is not None:
+            # The data are serialized (as they will be when logged) before the generation of the
+            # next ones, which may change the nodes they share with them
+            for dt in data_list:
+                dt.to_bytes()
+            prefetch()
+
         # All feedback entries that are available for relevant framework users (scenario
         # callbacks, operators, ...) are flushed just after sending a new data because it
         # means the previous feedback entries are obsolete.
@@ -2568,9 +2602,23 @@ class FmkPlumbing(object):
 
             self._currently_used_targets = used_targets
 
-            for tg in self._currently_used_targets:
+            concurrent_sending = self._sending_executor is not None and len(used_targets) > 1
+            if concurrent_sending:
+                # Targets are stimulated concurrently, but the outcome of each sending is
+                # handled below in the same order and from the same thread as otherwise.
+                # The data are serialized here once for all, as a node graph shall not be
+                # serialized from several threads at a time, thus the targets only get bytes.
+                for d in data_list:
+                    d.pin_value()
+                futures = [self._sending_executor.submit(tg.send_pending_data, from_fmk=True)
+                           for tg in used_targets]
+                sendings = [f.result for f in futures]
+            else:
+                sendings = [partial(tg.send_pending_data, from_fmk=True) for tg in used_targets]
+
+            for send in sendings:
                 try:
-                    tg.send_pending_data(from_fmk=True)
+                    send()
                 except TargetStuck as e:
                     self.lg.log_target_feedback_from(
                         source=FeedbackSource(self),
@@ -2587,6 +2635,10 @@ class FmkPlumbing(object):
                 else:
                     self.mon.notify_data_sending_event()
 
+            if concurrent_sending:
+                for d in data_list:
+                    d.unpin_value()
+
             self._do_after_sending_data(data_list)
 
         return data_list
@@ -2828,39 +2880,49 @@ class FmkPlumbing(object):
 
             tg = None
             try:
-                # Wait for potential feedback from enabled targets
-                for tg in self.targets.values():
+                # Wait for potential feedback from enabled targets, with a single deadline for all of
+                # them. Targets notifying their state changes wake us up as soon as feedback is
+                # received, the other ones are polled.
+                if fbk_timeout != 0:
+                    deadline = t0 + datetime.timedelta(seconds=fbk_timeout)
+                    pending_tgs = list(self.targets.values())
                     while True:
-                        # self.print('\n*** wait for target fbk busy loop')
-                        if fbk_timeout == 0:
-                            # self.print('\n*** DBG exit fast path1')
-                            break
-                        fbk_received = tg.is_feedback_received()
-                        if (tg.fbk_wait_until_recv_mode and fbk_received) or \
-                                (forced_feedback_timeout is not None and fbk_received):
-                            # self.print('\n*** DBG exit fast path2')
-                            break
-                        now = datetime.datetime.now()
-                        if (now - t0).total_seconds() > fbk_timeout:
-                            # if not fbk_received:
-                            #     self.lg.log_target_feedback_from(
-                            #         source=FeedbackSource(self),
-                            #         content='*** No feedback received from target {!s}.'
-                            #             .format(self.available_targets_desc[tg]),
-                            #         status_code=0,
-                            #         timestamp=now
-                            #     )
+                        version = Target.get_state_version()
+                        still_pending = []
+                        for tg in pending_tgs:
+                            fbk_received = tg.is_feedback_received()
+                            if (tg.fbk_wait_until_recv_mode and fbk_received) or \
+                                    (forced_feedback_timeout is not None and fbk_received):
+                                continue
+                            still_pending.append(tg)
+                        pending_tgs = still_pending
+                        remaining = (deadline - datetime.datetime.now()).total_seconds()
+                        if not pending_tgs or remaining <= 0:
                             break
-                        time.sleep(0.005)
+                        polling = any(not tg.is_state_change_notified('is_feedback_received') and
+                                      (tg.fbk_wait_until_recv_mode or forced_feedback_timeout is not None)
+                                      for tg in pending_tgs)
+                        Target.wait_for_state_change(version,
+                                                     min(remaining, self._tg_polling_period) if polling
+                                                     else remaining)
 
                 hc_timeout = self._hc_timeout_max
-                # Wait until the target is ready to send data or timeout expired
-                for tg in self.targets.values():
-                    while not tg.is_target_ready_for_new_data():
-                        # self.print('\n***DBG wait for target ready busy loop')
-                        time.sleep(0.005)
-                        now = datetime.datetime.now()
-                        if (now - t0).total_seconds() > hc_timeout:
+                hc_deadline = t0 + datetime.timedelta(seconds=hc_timeout)
+                # Wait until the targets are ready to send data or timeout expired
+                pending_tgs = list(self.targets.values())
+                while True:
+                    version = Target.get_state_version()
+                    still_pending = []
+                    for tg in pending_tgs:
+                        if not tg.is_target_ready_for_new_data():
+                            still_pending.append(tg)
+                    pending_tgs = still_pending
+                    if not pending_tgs:
+                        break
+                    now = datetime.datetime.now()
+                    remaining = (hc_deadline - now).total_seconds()
+                    if remaining <= 0:
+                        for tg in pending_tgs:
                             self.lg.log_target_feedback_from(
                                 source=FeedbackSource(self),
                                 content='*** Timeout! The target {!s} does not seem to be ready.'
@@ -2871,7 +2933,12 @@ class FmkPlumbing(object):
                             go_on = self._recover_target(tg)
                             ret = 0 if go_on else -1
                             # tg.cleanup()
-                            break
+                        break
+                    polling = any(not tg.is_state_change_notified('is_target_ready_for_new_data')
+                                  for tg in pending_tgs)
+                    Target.wait_for_state_change(version,
+                                                 min(remaining, self._tg_polling_period) if polling
+                                                 else remaining)
 
             except KeyboardInterrupt:
                 self.lg.log_comment("*** Waiting for target readiness has been cancelled by the user!\n")
@@ -2982,6 +3049,28 @@ class FmkPlumbing(object):
         self.fmkDB.disable()
         self._log_fmk_info('Disable FmkDB')
 
+    def enable_concurrent_sending(self, max_workers=None):
+        """
+        Send data concurrently to all the targets involved in an emission, rather than one
+        target after the other. Thus, the sending latency of a multi-target emission is
+        the one of the slowest target instead of the sum of all of them.
+
+        Args:
+            max_workers (int): maximum number of targets stimulated at the same time.
+              If None, the default of :class:`concurrent.futures.ThreadPoolExecutor` is used.
+        """
+        if self._sending_executor is not None:
+            self._sending_executor.shutdown()
+        self._sending_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                                       thread_name_prefix='FMK-SEND')
+        self._log_fmk_info('Enable concurrent sending to targets')
+
+    def disable_concurrent_sending(self):
+        if self._sending_executor is not None:
+            self._sending_executor.shutdown()
+            self._sending_executor = None
+        self._log_fmk_info('Disable concurrent sending to targets')
+
     @EnforceOrder(accepted_states=['S2'])
     def get_last_data(self):
         if not self.prj.wkspace_enabled:
@@ -5788,6 +5877,30 @@ class FmkShell(cmd.Cmd):
         self.fz.disable_fmkdb()
         return False
 
+    def do_enable_concurrent_sending(self, line):
+        '''
+        Send data concurrently to the targets involved in an emission
+        |  syntax: enable_concurrent_sending [max_workers]
+        '''
+        self.__error = True
+
+        args = line.split()
+        if len(args) > 1:
+            return False
+        try:
+            max_workers = int(args[0]) if args else None
+        except ValueError:
+            return False
+        self.fz.enable_concurrent_sending(max_workers=max_workers)
+
+        self.__error = False
+        return False
+
+    def do_disable_concurrent_sending(self, line):
+        """Send data to the targets involved in an emission one after the other"""
+        self.fz.disable_concurrent_sending()
+        return False
+
     def do_enable_fbk_handlers(self, line):
         """Enable Feedback Handlers"""
         self.fz.prj.enable_feedback_handlers()
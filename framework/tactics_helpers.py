@@ -583,13 +583,20 @@ class DynGenerator(Generator):
                     "this parameter is set to 'True', or maximum quantity if set to 'False'. "
                     "Otherwise if set to 'None', nothing is done.", None, bool),
         'freeze': ("Freeze the generated node.", False, bool),
-        'resolve_csp': ("Resolve any CSP if any", True, bool)
+        'resolve_csp': ("Resolve any CSP if any", True, bool),
+        'batch': ("Number of variants of the data to produce at once (refer to "
+                  "Node.freeze_batch()). If greater than 1, the variants are provided by "
+                  "this call and the next ones, until a new batch is needed.", 1, int)
     }
 
     def setup(self, dm, user_input):
+        self._variants = collections.deque()
         return True
 
     def generate_data(self, dm, monitor, target):
+        if self._variants:
+            return Data(self._variants.popleft())
+
         atom = dm.get_atom(self.data_id)
         if isinstance(atom, Node):
             if self.finite:
@@ -622,6 +629,13 @@ class DynGenerator(Generator):
                         min, max = node.get_subnode_minmax(snd)
                         node.set_subnode_default_qty(snd, min if self.min_def else max)
 
+            if self.batch > 1:
+                # the variants are provided as nodes, like the data produced one by one, for
+                # the disruptors to be able to work on them
+                self._variants.extend(atom.freeze_batch(self.batch, resolve_csp=self.resolve_csp,
+                                                        as_nodes=True))
+                return Data(self._variants.popleft())
+
         if self.freeze:
             atom.freeze(resolve_csp=self.resolve_csp)
 
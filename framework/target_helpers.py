@@ -22,6 +22,7 @@
 ################################################################################
 
 import datetime
+import os
 import threading
 
 from framework.data import Data
@@ -40,6 +41,16 @@ class Target(object):
     Feedback retrieved from a real target has to be provided to the user (i.e., the framework) through
     either after Target.send_data() is called or when Target.collect_unsolicited_feedback() is called.
 
+    About state change notification:
+    By default, the framework polls Target.is_feedback_received() and
+    Target.is_target_ready_for_new_data() while it waits for the target. A target class can
+    set `state_change_notification` to True to state that it calls Target.notify_state_change()
+    each time what these methods return changes. The framework then only waits for the
+    notifications. The statement only covers the implementations of these methods provided
+    by the class that sets the attribute: a subclass overriding one of them is polled for it,
+    unless it sets `state_change_notification` to True itself (after making sure its
+    implementation notifies the changes).
+
     """
     name = None
     feedback_timeout = None
@@ -62,7 +73,8 @@ class Target(object):
 
     _logger = None
     _extensions = None
-    _send_data_lock = threading.Lock()
+    _send_data_lock = threading.Lock()  # replaced by a per-target lock in Target.__init__()
+    _notification_lock = threading.Lock()  # serializes what is shared by all targets
 
     _altered_data_queued = None
 
@@ -71,12 +83,24 @@ class Target(object):
 
     _last_sending_date = None
 
+    # Shared by all the targets so that the framework can block on a single condition
+    # while waiting for any of them (refer to Target.notify_state_change())
+    _state_cond = threading.Condition()
+    _state_version = 0
+
+    # To be set to True by targets calling Target.notify_state_change() each time feedback is
+    # received or their readiness changes. The framework will then wait for their notifications
+    # instead of polling them (refer to Target.is_state_change_notified()).
+    state_change_notification = False
+
     display_feedback = False
 
     def __init__(self, name=None, display_feedback=True):
         self.name = name
         self.display_feedback = display_feedback
         self._started = False
+        # Targets can thus be sent data concurrently (refer to FmkPlumbing.enable_concurrent_sending())
+        self._send_data_lock = threading.Lock()
 
     @staticmethod
     def get_fbk_mode_desc(fbk_mode, short=False):
@@ -173,7 +197,8 @@ class Target(object):
     def is_target_ready_for_new_data(self):
         """
         To be overloaded if the target needs some time (for conditions to occur) before data can be sent.
-        Note: The FMK busy wait on this method() before sending a new data.
+        Note: The FMK waits on this method() before sending a new data. It is polled unless
+        the target notifies its readiness changes (refer to :meth:`notify_state_change`).
         """
         return True
 
@@ -182,9 +207,73 @@ class Target(object):
         """
         To be overloaded if the target implements FBK_WAIT_UNTIL_RECV mode, so that
         it can informs the framework about feedback reception.
+        Note: It is polled by the FMK unless the target notifies feedback reception
+        (refer to :meth:`notify_state_change`).
         """
         return True
 
+    def notify_state_change(self):
+        """
+        To be called by the target (from any thread) each time feedback is received or
+        its readiness for new data changes, so that the framework waiting on it wakes up at once.
+        The target has to update what :meth:`is_feedback_received` and
+        :meth:`is_target_ready_for_new_data` return before calling it.
+
+        Note: Only relied upon if `state_change_notification` is set to True, otherwise the
+        framework polls the target (refer to :meth:`is_state_change_notified`).
+        """
+        with Target._state_cond:
+            Target._state_version += 1
+            Target._state_cond.notify_all()
+
+    def is_state_change_notified(self, method_name):
+        """
+        Tell if the framework can wait for the notifications of the target (refer to
+        :meth:`notify_state_change`) instead of polling one of its methods.
+
+        The notifications are relied upon only if the method in use is the one of the class that
+        sets `state_change_notification` to True. Thus, a subclass overriding the method is
+        polled, unless it sets `state_change_notification` to True itself.
+
+        Args:
+            method_name (str): either `'is_feedback_received'` or `'is_target_ready_for_new_data'`
+
+        Returns:
+            bool: True if the method does not need to be polled
+        """
+        if 'state_change_notification' in vars(self):
+            return self.state_change_notification
+        cls = type(self)
+        for base in cls.__mro__:
+            if 'state_change_notification' in vars(base):
+                return base.state_change_notification \
+                       and getattr(cls, method_name) is getattr(base, method_name)
+        return False
+
+    @staticmethod
+    def get_state_version():
+        """
+        Returns:
+            int: a counter incremented by each call to :meth:`notify_state_change`, to be
+            provided to :meth:`wait_for_state_change`
+        """
+        return Target._state_version
+
+    @staticmethod
+    def wait_for_state_change(version, timeout):
+        """
+        Block until any target notifies a state change, or until `timeout` expires.
+        Notifications that occurred after `version` has been retrieved
+        (through :meth:`get_state_version`) are not missed.
+
+        Args:
+            version (int): value previously returned by :meth:`get_state_version`
+            timeout (float): maximum time to wait (in seconds)
+        """
+        with Target._state_cond:
+            if Target._state_version == version:
+                Target._state_cond.wait(timeout)
+
     def get_last_target_ack_date(self):
         '''
         If different from None the return value is used by the FMK to log the
@@ -320,14 +409,16 @@ class Target(object):
             if self.is_target_ready_for_new_data():
                 self._last_sending_date = datetime.datetime.now()
                 self.send_data(data, from_fmk=from_fmk)
-                self._project.notify_data_sending([data], self._last_sending_date, self)
+                with self._notification_lock:
+                    self._project.notify_data_sending([data], self._last_sending_date, self)
                 if from_fmk:
                     self._pending_data_id = data.estimated_data_id
                 if not from_fmk:
-                    self._logger.log_async_data(data, sent_date=self._last_sending_date,
-                                                target_ref=FeedbackSource(self),
-                                                prj_name=self._project.name,
-                                                current_data_id=self._pending_data_id)
+                    with self._notification_lock:
+                        self._logger.log_async_data(data, sent_date=self._last_sending_date,
+                                                    target_ref=FeedbackSource(self),
+                                                    prj_name=self._project.name,
+                                                    current_data_id=self._pending_data_id)
             else:
                 self._logger.print_console(f'*** Target {self!s} Not ready ***\n',
                                            nl_before=False, rgb=Color.WARNING)
@@ -344,14 +435,16 @@ class Target(object):
             if self.is_target_ready_for_new_data():
                 self._last_sending_date = datetime.datetime.now()
                 self.send_multiple_data(data_list, from_fmk=from_fmk)
-                self._project.notify_data_sending(data_list, self._last_sending_date, self)
+                with self._notification_lock:
+                    self._project.notify_data_sending(data_list, self._last_sending_date, self)
                 if from_fmk:
                     self._pending_data_id = data_list[-1].estimated_data_id
                 if not from_fmk:
-                    self._logger.log_async_data(data_list, sent_date=self._last_sending_date,
-                                                target_ref=FeedbackSource(self),
-                                                prj_name=self._project.name,
-                                                current_data_id=self._pending_data_id)
+                    with self._notification_lock:
+                        self._logger.log_async_data(data_list, sent_date=self._last_sending_date,
+                                                    target_ref=FeedbackSource(self),
+                                                    prj_name=self._project.name,
+                                                    current_data_id=self._pending_data_id)
             else:
                 self._logger.print_console(f'*** Target {self!s} Not ready ***\n',
                                            nl_before=False, rgb=Color.WARNING)
@@ -389,3 +482,103 @@ class EmptyTarget(Target):
     def send_multiple_data(self, data_list, from_fmk=False):
         pass
 
+
+
+# Maximum number of buffers handed over to os.writev() or socket.sendmsg() in one call
+IOV_MAX = os.sysconf('SC_IOV_MAX') if 'SC_IOV_MAX' in os.sysconf_names else 1024
+
+
+def consume_segments(segments, size):
+    """
+    Remove the first `size` bytes from a list of buffers (in place), after they have been
+    written out.
+    """
+    i = 0
+    while size > 0 and size >= len(segments[i]):
+        size -= len(segments[i])
+        i += 1
+    del segments[:i]
+    if size > 0:
+        segments[0] = memoryview(segments[0])[size:]
+
+
+def write_segments(fd, segments, offset=None):
+    """
+    Write the segments of a data (refer to :meth:`framework.data.Data.to_segments`) to a file
+    descriptor without concatenating them, through :func:`os.writev`, or :func:`os.pwritev`
+    if `offset` is provided.
+
+    Returns:
+        int: the number of bytes written
+    """
+    segments = [seg for seg in segments if seg]
+    total = 0
+    while segments:
+        if offset is None:
+            written = os.writev(fd, segments[:IOV_MAX])
+        else:
+            written = os.pwritev(fd, segments[:IOV_MAX], offset + total)
+        total += written
+        consume_segments(segments, written)
+    return total
+
+
+class PayloadFile(object):
+    """
+    File through which data is provided to a program (or to any API requiring a file name).
+    It is opened once and then rewritten in place for each new data.
+
+    Args:
+        path (str): path of the file. If `in_memory` is True, only its basename is used.
+        in_memory (bool): if True, the file is an anonymous memory file (memfd) reachable through
+          ``/proc/self/fd/<fd>``, or a tmpfs-backed file if memfd is not supported.
+          Thus, nothing is written on disk.
+    """
+
+    tmpfs_folder = '/dev/shm'
+
+    def __init__(self, path, in_memory=False):
+        self.fd = None
+        self.is_memfd = False
+        self._size = 0
+        self._to_remove = False
+
+        if in_memory:
+            try:
+                self.fd = os.memfd_create(os.path.basename(path))
+            except (AttributeError, OSError):
+                if os.path.isdir(self.tmpfs_folder):
+                    path = os.path.join(self.tmpfs_folder, os.path.basename(path))
+                    self._to_remove = True
+            else:
+                # Processes inheriting the file descriptor can open it through this path
+                self.is_memfd = True
+                path = '/proc/self/fd/{:d}'.format(self.fd)
+
+        if self.fd is None:
+            self.fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        self.path = path
+
+    def write(self, data):
+        """
+        Args:
+            data (bytes or list): the data, or its segments (refer to
+              :meth:`framework.data.Data.to_segments`)
+        """
+        if isinstance(data, bytes):
+            os.pwrite(self.fd, data, 0)
+            size = len(data)
+        else:
+            size = write_segments(self.fd, data, offset=0)
+        if size < self._size:
+            os.ftruncate(self.fd, size)
+        self._size = size
+
+    def rewind(self):
+        os.lseek(self.fd, 0, os.SEEK_SET)
+
+    def close(self):
+        os.close(self.fd)
+        self.fd = None
+        if self._to_remove:
+            os.remove(self.path)
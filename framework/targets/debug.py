@@ -43,8 +43,12 @@ class TestTarget(Target):
 
     _feedback_mode = Target.FBK_WAIT_FULL_TIME
     supported_feedback_mode = [Target.FBK_WAIT_UNTIL_RECV, Target.FBK_WAIT_FULL_TIME]
+    state_change_notification = True
     _last_ack_date = None
 
+    # range of the delay (in seconds) after which feedback is simulated as received
+    fbk_delay_range = (0.005, 0.04)
+
     # shared memory constants
     dlen_start = 0
     dlen_stop = 4
@@ -60,7 +64,7 @@ class TestTarget(Target):
     def __init__(self, name=None, recover_ratio=100, fbk_samples=None, repeat_input=False,
                  fbk_timeout=0.05, shmem_mode=False, shmem_timeout=10):
         Target.__init__(self, name)
-        self._cpt = None
+        self._fbk_arrival_date = None
         self._recover_ratio = recover_ratio
         self._fbk_samples = fbk_samples
         self._repeat_input = repeat_input
@@ -68,6 +72,9 @@ class TestTarget(Target):
         if shmem_mode and not name:
             raise ValueError('name parameter should be specified in shmem_mode')
         self._shmem_mode= shmem_mode
+        if shmem_mode:
+            # feedback is produced by other processes, thus its reception is not notified
+            self.state_change_notification = False
         self.output_shmem = None
         self.input_shmem_list = None
         self.fbk_sources = None
@@ -89,7 +96,7 @@ class TestTarget(Target):
         self.set_feedback_timeout(fbk_timeout)
 
     def start(self):
-        self._cpt = 0
+        self._fbk_arrival_date = None
         if self._shmem_mode:
             self._target_ready = False
             if self.fbk_sources is not None:
@@ -171,6 +178,7 @@ class TestTarget(Target):
 
         if shmem_ok:
             self._target_ready = True
+            self.notify_state_change()
             self._logger.print_console("*** Shared memory from feedback sources have been mapped ***",
                                      rgb=Color.COMMENTS,
                                      nl_before=True, nl_after=True)
@@ -321,9 +329,11 @@ class TestTarget(Target):
             if self._bound_targets:
                 for tg in self._bound_targets:
                     tg._shared_queue.put((data.to_bytes(), str(self)))
+                    tg.notify_state_change()
             else:
                 self._logger.collect_feedback(content=self._handle_fbk(data),
                                               status_code=random.randint(-3, 3))
+                self._simulate_fbk_reception()
 
             self._last_ack_date = datetime.datetime.now() + datetime.timedelta(microseconds=random.randint(20, 40))
 
@@ -351,12 +361,14 @@ class TestTarget(Target):
             return not self._shared_queue.empty()
 
         else:
-            self._cpt += 1
-            if self._cpt > 5 and random.choice([True, False]):
-                self._cpt = 0
-                return True
-            else:
-                return False
+            return self._fbk_arrival_date is None or datetime.datetime.now() >= self._fbk_arrival_date
+
+    def _simulate_fbk_reception(self):
+        delay = random.uniform(*self.fbk_delay_range)
+        self._fbk_arrival_date = datetime.datetime.now() + datetime.timedelta(seconds=delay)
+        timer = threading.Timer(delay, self.notify_state_change)
+        timer.daemon = True
+        timer.start()
 
     def get_feedback(self):
         fbk = None
@@ -21,27 +21,81 @@
 #
 ################################################################################
 
+import collections
+import datetime
 import fcntl
 import os
+import queue
 import random
 import select
 import signal
+import struct
 import subprocess
+import sys
+import threading
 
+from framework.coverage import SharedMemoryBitmap, virgin_map
 from framework.global_resources import workspace_folder
-from framework.target_helpers import Target
+from framework.target_helpers import Target, TargetStuck, PayloadFile, write_segments
 from framework.knowledge.feedback_collector import FeedbackCollector
 
+# File descriptors used by the target program to talk with us in fork server mode
+# (same protocol as the AFL fork server)
+FORKSRV_FD = 198
+
+# Moves the fork server pipes (whose fds are given as first arguments) to FORKSRV_FD and
+# FORKSRV_FD+1, then executes the program. This is done from a new process, as neither the
+# fds of the framework nor a preexec_fn (unsafe with threads) can be used for that purpose.
+_FORK_SERVER_LAUNCHER = '''
+import os, sys
+ctl_fd, status_fd = int(sys.argv[1]), int(sys.argv[2])
+if status_fd == {fd:d}:
+    status_fd = os.dup(status_fd)
+os.dup2(ctl_fd, {fd:d})
+os.dup2(status_fd, {fd:d} + 1)
+for fd in {{ctl_fd, status_fd}} - {{{fd:d}, {fd:d} + 1}}:
+    os.close(fd)
+try:
+    os.execvp(sys.argv[3], sys.argv[3:])
+except OSError as e:
+    sys.stderr.write('cannot execute {{!r}} ({{!s}})\\n'.format(sys.argv[3], e))
+    sys.exit(127)
+'''.format(fd=FORKSRV_FD)
+
 
 class LocalTarget(Target):
 
     _feedback_mode = Target.FBK_WAIT_UNTIL_RECV
     supported_feedback_mode = [Target.FBK_WAIT_UNTIL_RECV]
+    # Readiness and feedback reception never change (the end of the application is waited for
+    # within get_feedback()), thus the framework has no need to poll them.
+    state_change_notification = True
 
     def __init__(self, target_path=None, pre_args=None, post_args=None,
                  tmpfile_ext='.bin', send_via_stdin=False, send_via_cmdline=False,
-                 error_samples=None, error_parsing_func=lambda x: (False, '')):
+                 error_samples=None, error_parsing_func=lambda x: (False, ''),
+                 fork_server=False, fork_server_timeout=5, in_memory_file=False, coverage=False):
+        '''
+        Args:
+          fork_server (bool): if True, the program is started only once and has to implement the
+            AFL fork server protocol (e.g., by being compiled with an AFL instrumenting compiler).
+            At each test case, the program will then fork itself, rather than being launched
+            again from scratch. The test case is provided the same way as the regular mode
+            (either through a file or through stdin, but not through the command line).
+          fork_server_timeout (float): maximum time to wait for the fork server to be
+            up and running.
+          in_memory_file (bool): if True, the file providing the test cases to the program is
+            an anonymous memory file (refer to :class:`framework.target_helpers.PayloadFile`)
+            rather than a file of the workspace.
+          coverage (bool): if True, the program has to be instrumented for AFL (compiled with
+            an AFL instrumenting compiler). Its edge coverage is retrieved from a shared memory
+            bitmap after each test case, and provided as feedback (refer to
+            :class:`framework.coverage.CoverageFeedback`). The feedback tells whether new
+            coverage has been reached with respect to all the previous test cases.
+        '''
         Target.__init__(self)
+        if fork_server and send_via_cmdline:
+            raise ValueError('the fork server mode cannot be used with send_via_cmdline')
         self._suffix = '{:0>12d}'.format(random.randint(2 ** 16, 2 ** 32))
         self._app = None
         self._pre_args = pre_args
@@ -53,6 +107,17 @@ class LocalTarget(Target):
         self._data_sent = None
         self._feedback_computed = None
         self._feedback = FeedbackCollector()
+        self._fork_server = fork_server
+        self._fork_server_timeout = fork_server_timeout
+        self._fs_ctl_fd = None
+        self._fs_status_fd = None
+        self._fs_child_pid = None
+        self._in_memory_file = in_memory_file
+        self._payload_file = None
+        self._coverage = coverage
+        self._cov_bitmap = None
+        self._env = None
+        self.last_coverage = None
         self.set_target_path(target_path)
         self.set_tmp_file_extension(tmpfile_ext)
 
@@ -104,28 +169,53 @@ class LocalTarget(Target):
             return False
 
         self._data_sent = False
+        self.last_coverage = None
+
+        if self._coverage:
+            try:
+                self._cov_bitmap = SharedMemoryBitmap()
+            except OSError as e:
+                print('/!\\ ERROR /!\\: the LocalTarget coverage bitmap cannot be allocated ({!s})'.format(e))
+                return False
+            self._env = dict(os.environ, **self._cov_bitmap.env)
+
+        # The test case file is opened once and then rewritten in place for each test case.
+        # In fork server mode, it is also the one provided through stdin.
+        if self._fork_server or not (self._send_via_stdin or self._send_via_cmdline):
+            self._payload_file = PayloadFile(self._get_testcase_path(), in_memory=self._in_memory_file)
+            if self._payload_file.is_memfd:
+                # the program reaches it through /proc/self/fd/ (thus it has to inherit it)
+                os.set_inheritable(self._payload_file.fd, True)
+
+        if self._fork_server and not self._start_fork_server():
+            self._close_payload_file()
+            self._close_coverage_bitmap()
+            return False
 
         return self.initialize()
 
     def stop(self):
+        if self._fork_server:
+            self._stop_fork_server()
+        self._close_payload_file()
+        self._close_coverage_bitmap()
         return self.terminate()
 
-    def _before_sending_data(self):
-        self._feedback_computed = False
+    def _close_payload_file(self):
+        if self._payload_file is not None:
+            self._payload_file.close()
+            self._payload_file = None
 
-    def send_data(self, data, from_fmk=False):
-        self._before_sending_data()
-        data = data.to_bytes()
+    def _close_coverage_bitmap(self):
+        if self._cov_bitmap is not None:
+            self._cov_bitmap.close()
+            self._cov_bitmap = None
+            self._env = None
 
-        if self._send_via_stdin:
-            name = ''
-        elif self._send_via_cmdline:
-            name = data
-        else:
-            name = os.path.join(workspace_folder, 'fuzz_test_' + self._suffix + self._tmpfile_ext)
-            with open(name, 'wb') as f:
-                 f.write(data)
+    def _get_testcase_path(self):
+        return os.path.join(workspace_folder, 'fuzz_test_' + self._suffix + self._tmpfile_ext)
 
+    def _get_cmd(self, name):
         if self._pre_args is not None and self._post_args is not None:
             if self._send_via_stdin:
                 cmd = [self._target_path] + self._pre_args.split() + self._post_args.split()
@@ -141,25 +231,184 @@ class LocalTarget(Target):
         else:
             cmd = [self._target_path] if self._send_via_stdin else [self._target_path, name]
 
+        return cmd
+
+    def _before_sending_data(self):
+        self._feedback_computed = False
+
+    def send_data(self, data, from_fmk=False):
+        # the data is written without being concatenated (refer to Data.to_segments())
+        self._send_segments(data.to_segments())
+
+    def _send_segments(self, data):
+        self._before_sending_data()
+        if self._cov_bitmap is not None:
+            self._cov_bitmap.reset()
+
+        if self._fork_server:
+            self._send_data_to_fork_server(data)
+            self._data_sent = True
+            return
+
+        if self._send_via_stdin:
+            name = ''
+        elif self._send_via_cmdline:
+            name = b''.join(data)
+        else:
+            name = self._payload_file.path
+            self._payload_file.write(data)
+
+        cmd = self._get_cmd(name)
+
         stdin_arg = subprocess.PIPE if self._send_via_stdin else None
+        pass_fds = (self._payload_file.fd,) if self._payload_file and self._payload_file.is_memfd else ()
         self._app = subprocess.Popen(args=cmd, stdin=stdin_arg, stdout=subprocess.PIPE,
-                                     stderr=subprocess.PIPE)
+                                     stderr=subprocess.PIPE, pass_fds=pass_fds, env=self._env)
 
         if self._send_via_stdin:
             with self._app.stdin as f:
-                f.write(data)
+                write_segments(f.fileno(), data)
 
-        if not self._send_via_stdin and not self._send_via_cmdline:
-            fl = fcntl.fcntl(self._app.stderr, fcntl.F_GETFL)
-            fcntl.fcntl(self._app.stderr, fcntl.F_SETFL, fl | os.O_NONBLOCK)
+        fl = fcntl.fcntl(self._app.stderr, fcntl.F_GETFL)
+        fcntl.fcntl(self._app.stderr, fcntl.F_SETFL, fl | os.O_NONBLOCK)
 
-            fl = fcntl.fcntl(self._app.stdout, fcntl.F_GETFL)
-            fcntl.fcntl(self._app.stdout, fcntl.F_SETFL, fl | os.O_NONBLOCK)
+        fl = fcntl.fcntl(self._app.stdout, fcntl.F_GETFL)
+        fcntl.fcntl(self._app.stdout, fcntl.F_SETFL, fl | os.O_NONBLOCK)
 
         self._data_sent = True
 
+    def _start_fork_server(self):
+        ctl_r, self._fs_ctl_fd = os.pipe()
+        self._fs_status_fd, status_w = os.pipe()
+
+        # In stdin mode, the test case file is shared with the forked processes,
+        # thus its offset is rewound for each test case
+        stdin_arg = self._payload_file.fd if self._send_via_stdin else subprocess.DEVNULL
+        pass_fds = (ctl_r, status_w)
+        if self._payload_file.is_memfd:
+            pass_fds += (self._payload_file.fd,)
+        cmd = [sys.executable, '-I', '-c', _FORK_SERVER_LAUNCHER, str(ctl_r), str(status_w)]
+        cmd += self._get_cmd(self._payload_file.path)
+        try:
+            self._app = subprocess.Popen(args=cmd, stdin=stdin_arg,
+                                         stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                         pass_fds=pass_fds, env=self._env)
+        except OSError as e:
+            print('/!\\ ERROR /!\\: the LocalTarget program cannot be launched ({!s})'.format(e))
+            self._stop_fork_server()
+            return False
+        finally:
+            os.close(ctl_r)
+            os.close(status_w)
+
+        os.set_blocking(self._app.stdout.fileno(), False)
+        os.set_blocking(self._app.stderr.fileno(), False)
+
+        # the fork server says hello when it is ready
+        if self._read_fork_server_status(self._fork_server_timeout) is None:
+            print('/!\\ ERROR /!\\: the LocalTarget program does not implement the fork server protocol')
+            self._stop_fork_server()
+            return False
+
+        return True
+
+    def _stop_fork_server(self):
+        if self._app is not None:
+            self._kill_fork_server_child()
+            self._app.kill()
+            self._app.wait()
+            self._app.stdout.close()
+            self._app.stderr.close()
+            self._app = None
+        self._fs_child_pid = None
+        for fd in (self._fs_ctl_fd, self._fs_status_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fs_ctl_fd = self._fs_status_fd = None
+
+    def _read_fork_server_status(self, timeout):
+        buf = b''
+        deadline = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+        while len(buf) < 4:
+            remaining = max((deadline - datetime.datetime.now()).total_seconds(), 0)
+            if not select.select([self._fs_status_fd], [], [], remaining)[0]:
+                return None
+            chunk = os.read(self._fs_status_fd, 4 - len(buf))
+            if not chunk:
+                # the fork server has terminated
+                return None
+            buf += chunk
+
+        return struct.unpack('I', buf)[0]
+
+    def _send_data_to_fork_server(self, data):
+        self._kill_fork_server_child()
+        # outputs not retrieved through get_feedback() should not be related to the new test case
+        self._read_available(self._app.stdout)
+        self._read_available(self._app.stderr)
+
+        for attempt in range(2):
+            if attempt > 0:
+                # the fork server seems dead, thus we try to restart it once
+                self._stop_fork_server()
+                if not self._start_fork_server():
+                    break
+
+            self._payload_file.write(data)
+            if self._send_via_stdin:
+                self._payload_file.rewind()
+
+            try:
+                os.write(self._fs_ctl_fd, struct.pack('I', 0))
+            except OSError:
+                continue
+            pid = self._read_fork_server_status(self._fork_server_timeout)
+            if pid is not None:
+                self._fs_child_pid = pid
+                return
+
+        raise TargetStuck('the LocalTarget fork server does not answer')
+
+    def _wait_fork_server_child(self, timeout):
+        status = self._read_fork_server_status(timeout)
+        if status is not None:
+            self._fs_child_pid = None
+        return status
+
+    def _kill_fork_server_child(self):
+        if self._fs_child_pid is None or self._wait_fork_server_child(0) is not None:
+            return
+
+        try:
+            os.kill(self._fs_child_pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        if self._wait_fork_server_child(self._fork_server_timeout) is None:
+            self._fs_child_pid = None
+            print("\n*** WARNING: the LocalTarget fork server does not answer")
+
+    @staticmethod
+    def _read_available(pipe):
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(pipe.fileno(), 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+
     def cleanup(self):
-        if self._app is None:
+        if self._fork_server:
+            # the fork server is kept alive, only the current test case is terminated
+            self._kill_fork_server_child()
+            self._data_sent = False
+            return
+
+        if self._app is None or self._app.poll() is not None:
+            self._data_sent = False
             return
 
         try:
@@ -169,6 +418,133 @@ class LocalTarget(Target):
         finally:
             self._data_sent = False
 
+    def _check_exit_status(self, pid, return_code):
+        proc_killed = False
+        exit_error = False
+        if return_code < 0:
+            # process terminated by a signal (python behavior for POSIX system)
+            proc_killed = True
+            self._feedback.add_fbk_from(f"Application[{pid}]",
+                                        f"Application terminated by a signal (ID: {-return_code})",
+                                        status=-3)
+
+        else:
+            if self.is_processed_data_altered() and return_code == 0:
+                exit_error = True
+                msg = f"Wrong exit status ({return_code}) - expecting != 0 (as altered data was provided)"
+            elif not self.is_processed_data_altered() and return_code != 0:
+                exit_error = True
+                msg = f"Wrong exit status ({return_code}) - expecting 0 (as valid data was provided)"
+            else:
+                msg = f'Expected exit status ({return_code})'
+
+            self._feedback.add_fbk_from(f"Application[{pid}]", msg, status=-1 if exit_error else 0)
+
+        return proc_killed, exit_error
+
+    def _check_stdout(self, byte_string):
+        console_error, msg = self._error_parsing_func(byte_string)
+        if console_error:
+            self._feedback.add_fbk_from("LocalTarget[stdout]",
+                                        f"Error detected on stdout (by provided parsing function)\n --> {msg}",
+                                        status=-1)
+
+        for err_msg in self._error_samples:
+            if err_msg in byte_string:
+                console_error = True
+                self._feedback.add_fbk_from("LocalTarget[stdout]",
+                                            f"Error detected on stdout (from provided samples): '{err_msg.decode()}'",
+                                            status=-1)
+
+        return console_error
+
+    def _check_stderr(self, stderr_msg):
+        if stderr_msg:
+            self._feedback.add_fbk_from("LocalTarget[stderr]",
+                                        "Application outputs on stderr",
+                                        status=-2)
+            return True
+        else:
+            return False
+
+    def _check_coverage(self):
+        if self._cov_bitmap is not None:
+            self.last_coverage = virgin_map.update(self._cov_bitmap.read())
+            self._feedback.add_fbk_from("LocalTarget[coverage]", self.last_coverage.to_bytes(), status=0)
+
+    def _check_outputs(self, stdout_msg, stderr_msg):
+        console_error = False
+        if stdout_msg or stderr_msg:
+            byte_string = stdout_msg + b'\n\n'
+            console_error = self._check_stdout(byte_string)
+            if self._check_stderr(stderr_msg):
+                console_error = True
+                byte_string += stderr_msg
+            else:
+                byte_string = byte_string[:-2]  # remove '\n\n'
+        else:
+            byte_string = b''
+
+        return console_error, byte_string
+
+    @staticmethod
+    def _open_pidfd(pid):
+        try:
+            return os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            # pidfd not supported (python < 3.9 or linux < 5.3)
+            return None
+
+    def _wait_app(self, timeout):
+        '''
+        Wait for the end of the application, or until `timeout` expires, while
+        collecting its outputs (so that it cannot be stuck on a full pipe).
+        The end of the application is detected through a pidfd if supported, or else
+        through the closing of its outputs.
+
+        Returns:
+            tuple: stdout and stderr outputs
+        '''
+        outputs = {self._app.stdout: [], self._app.stderr: []}
+        pipes = list(outputs)
+        # the pid cannot be watched anymore if the application has been reaped
+        pidfd = None if self._app.returncode is not None else self._open_pidfd(self._app.pid)
+        over = self._app.returncode is not None
+        deadline = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+        try:
+            while not over and (pipes or pidfd is not None):
+                remaining = max((deadline - datetime.datetime.now()).total_seconds(), 0)
+                watched = pipes if pidfd is None else pipes + [pidfd]
+                ready = select.select(watched, [], [], remaining)[0]
+                if not ready:
+                    break
+                for fd in ready:
+                    if fd is pidfd:
+                        over = True
+                        continue
+                    chunk = self._read_available(fd)
+                    if chunk:
+                        outputs[fd].append(chunk)
+                    else:
+                        # end of file
+                        pipes.remove(fd)
+                if not pipes and pidfd is None:
+                    over = True
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+        if over:
+            # outputs written right before exiting
+            for pipe in pipes:
+                outputs[pipe].append(self._read_available(pipe))
+            try:
+                self._app.wait(max((deadline - datetime.datetime.now()).total_seconds(), 0))
+            except subprocess.TimeoutExpired:
+                pass
+
+        return b''.join(outputs[self._app.stdout]), b''.join(outputs[self._app.stderr])
+
     def get_feedback(self, timeout=0.2):
         timeout = self.feedback_timeout if timeout is None else timeout
         if self._feedback_computed:
@@ -176,68 +552,214 @@ class LocalTarget(Target):
         else:
             self._feedback_computed = True
 
+        if self._fork_server:
+            return self._get_fork_server_feedback(timeout)
+
         if self._app is None:
             # application not yet started
             return self._feedback
 
         exit_error = False
         proc_killed = False
+        # Return as soon as the application is over. If it is not after the timeout,
+        # it will be terminated by cleanup()
+        stdout_msg, stderr_msg = self._wait_app(timeout)
         return_code = self._app.poll()
         if return_code is not None: # process has terminate
-            if return_code < 0:
-                # process terminated by a signal (python behavior for POSIX system)
-                proc_killed = True
-                self._feedback.add_fbk_from(f"Application[{self._app.pid}]",
-                                            f"Application terminated by a signal (ID: {-return_code})",
-                                            status=-3)
+            proc_killed, exit_error = self._check_exit_status(self._app.pid, return_code)
+        self._check_coverage()
 
-            else:
-                if self.is_processed_data_altered() and return_code == 0:
-                    exit_error = True
-                    msg = f"Wrong exit status ({return_code}) - expecting != 0 (as altered data was provided)"
-                elif not self.is_processed_data_altered() and return_code != 0:
-                    exit_error = True
-                    msg = f"Wrong exit status ({return_code}) - expecting 0 (as valid data was provided)"
-                else:
-                    msg = f'Expected exit status ({return_code})'
-
-                self._feedback.add_fbk_from(f"Application[{self._app.pid}]", msg, status=-1 if exit_error else 0)
+        console_error, byte_string = self._check_outputs(stdout_msg, stderr_msg)
 
-        console_error = False
-        ret = select.select([self._app.stdout, self._app.stderr], [], [], timeout)
-        if ret[0]:
-            byte_string = b''
-            for fd in ret[0][:-1]:
-                byte_string += fd.read() + b'\n\n'
+        if proc_killed or exit_error or console_error:
+            self._feedback.set_error_code(-1)
+        self._feedback.set_bytes(byte_string)
 
-            console_error, msg = self._error_parsing_func(byte_string)
-            if console_error:
-                self._feedback.add_fbk_from("LocalTarget[stdout]",
-                                            f"Error detected on stdout (by provided parsing function)\n --> {msg}",
-                                            status=-1)
+        return self._feedback
 
-            for err_msg in self._error_samples:
-                if err_msg in byte_string:
-                    console_error = True
-                    self._feedback.add_fbk_from("LocalTarget[stdout]",
-                                                f"Error detected on stdout (from provided samples): '{err_msg.decode()}'",
-                                                status=-1)
+    def _get_fork_server_feedback(self, timeout):
+        pid = self._fs_child_pid
+        if pid is None:
+            # nothing has been sent yet
+            return self._feedback
 
-            stderr_msg = ret[0][-1].read()
-            if stderr_msg:
-                console_error = True
-                self._feedback.add_fbk_from("LocalTarget[stderr]",
-                                            "Application outputs on stderr",
-                                            status=-2)
-                byte_string += stderr_msg
-            else:
-                byte_string = byte_string[:-2]  # remove '\n\n'
+        exit_error = False
+        proc_killed = False
+        # If the test case is not over after the timeout, it will be killed by cleanup()
+        status = self._wait_fork_server_child(timeout)
+        if status is not None:
+            return_code = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+            proc_killed, exit_error = self._check_exit_status(pid, return_code)
+        self._check_coverage()
 
-        else:
-            byte_string = b''
+        stdout_msg = self._read_available(self._app.stdout)
+        stderr_msg = self._read_available(self._app.stderr)
+        console_error, byte_string = self._check_outputs(stdout_msg, stderr_msg)
 
         if proc_killed or exit_error or console_error:
             self._feedback.set_error_code(-1)
         self._feedback.set_bytes(byte_string)
 
-        return self._feedback
\ No newline at end of file
+        return self._feedback
+
+
+class PooledLocalTarget(LocalTarget):
+    '''
+    Run several instances of the program concurrently, each one with its own test case file.
+    Data are dispatched to the free instances and the feedback of each test case is
+    collected in background (through :meth:`framework.logger.Logger.collect_feedback`),
+    attached to the data it is related to.
+
+    A test case is killed if it is not over after the feedback timeout (or after
+    `default_exec_timeout` if no feedback timeout is set).
+
+    Note: the feedback of the test cases still running when the framework stops sending data
+    will be logged as residual feedback at the next sending.
+    '''
+
+    default_exec_timeout = 1
+    # The readiness changes each time a test case is over, which is notified
+    state_change_notification = True
+
+    def __init__(self, *args, pool_size=None, **kwargs):
+        '''
+        Args:
+          pool_size (int): number of program instances to run concurrently.
+            If None, the number of CPUs is used.
+          *args, **kwargs: refer to :class:`LocalTarget`
+        '''
+        LocalTarget.__init__(self, *args, **kwargs)
+        self.pool_size = os.cpu_count() if pool_size is None else pool_size
+        self._slots = None
+        self._slot_threads = None
+        self._free_slots = None
+        self._slots_cond = threading.Condition()
+
+    def get_description(self):
+        return LocalTarget.get_description(self) + f' [Pool size: {self.pool_size}]'
+
+    def _new_slot(self):
+        return LocalTarget(target_path=self._target_path, pre_args=self._pre_args,
+                           post_args=self._post_args, tmpfile_ext=self._tmpfile_ext,
+                           send_via_stdin=self._send_via_stdin, send_via_cmdline=self._send_via_cmdline,
+                           error_samples=self._error_samples, error_parsing_func=self._error_parsing_func,
+                           fork_server=self._fork_server, fork_server_timeout=self._fork_server_timeout,
+                           in_memory_file=self._in_memory_file, coverage=self._coverage)
+
+    def start(self):
+        if not self._target_path:
+            print('/!\\ ERROR /!\\: the LocalTarget path has not been set')
+            return False
+
+        self._slots = []
+        self._slot_threads = []
+        self._free_slots = collections.deque()
+        for i in range(self.pool_size):
+            slot = self._new_slot()
+            if not slot.start():
+                self._stop_slots()
+                return False
+            self._slots.append((slot, queue.Queue()))
+            self._free_slots.append(i)
+
+        for i in range(self.pool_size):
+            th = threading.Thread(None, self._run_slot, name=f'LocalTarget-slot#{i}', args=(i,))
+            th.start()
+            self._slot_threads.append(th)
+
+        return self.initialize()
+
+    def stop(self):
+        self._stop_slots()
+        return self.terminate()
+
+    def _stop_slots(self):
+        if self._slots is None:
+            return
+        # the test cases in progress are completed before stopping
+        for _, q in self._slots:
+            q.put(None)
+        for th in self._slot_threads:
+            th.join()
+        for slot, _ in self._slots:
+            slot.stop()
+        self._slots = None
+        self._slot_threads = None
+        self._free_slots = None
+
+    def _run_slot(self, slot_idx):
+        slot, q = self._slots[slot_idx]
+        while True:
+            test_case = q.get()
+            if test_case is None:
+                break
+
+            segments, altered, data = test_case
+            try:
+                self._run_test_case(slot, segments, altered, data)
+            except Exception as e:
+                self._logger.collect_feedback(content=f'Exception raised while running the test case: {e!r}',
+                                              status_code=-1, subref='Internals', fbk_src=self,
+                                              related_data=data)
+            finally:
+                with self._slots_cond:
+                    self._free_slots.append(slot_idx)
+                    self._slots_cond.notify()
+                self.notify_state_change()
+
+    def _run_test_case(self, slot, segments, altered, data):
+        # Only the segments and the attributes snapshotted by send_data() are used here, as
+        # the framework keeps on using the data in the meantime. The data itself is only
+        # given to the logger for the feedback to be attached to it.
+        timeout = self.default_exec_timeout if self.feedback_timeout is None else self.feedback_timeout
+
+        slot._altered_data_queued = altered
+        slot._send_segments(segments)
+        if slot._fork_server:
+            fbk = slot.get_feedback(timeout=timeout)
+            # kill the test case if it is not over
+            slot.cleanup()
+        else:
+            fbk = slot.get_feedback(timeout=timeout)
+            if slot._app.poll() is None:
+                slot.cleanup()
+                slot._app.wait()
+                self._logger.collect_feedback(content=f'Test case not over after {timeout}s, thus terminated',
+                                              status_code=0, subref=f'Application[{slot._app.pid}]',
+                                              fbk_src=self, related_data=data)
+            slot._app.stdout.close()
+            slot._app.stderr.close()
+
+        for ref, fbk_list, status, _ in fbk.iter_and_cleanup_collector():
+            for content in fbk_list:
+                self._logger.collect_feedback(content=content, status_code=status, subref=ref,
+                                              fbk_src=self, related_data=data)
+        raw_fbk = fbk.get_bytes()
+        if raw_fbk:
+            self._logger.collect_feedback(content=raw_fbk, status_code=fbk.get_error_code(),
+                                          fbk_src=self, related_data=data)
+        fbk.cleanup()
+
+    def send_data(self, data, from_fmk=False):
+        # the data is serialized from the caller thread, as a node graph is not thread-safe
+        test_case = (tuple(data.to_segments()), data.altered, data)
+        with self._slots_cond:
+            while not self._free_slots:
+                self._slots_cond.wait()
+            slot_idx = self._free_slots.popleft()
+        self._slots[slot_idx][1].put(test_case)
+
+    def send_multiple_data(self, data_list, from_fmk=False):
+        for data in data_list:
+            self.send_data(data, from_fmk=from_fmk)
+
+    def is_target_ready_for_new_data(self):
+        return bool(self._free_slots)
+
+    def cleanup(self):
+        # test cases are cleaned up by the slots themselves once over
+        pass
+
+    def get_feedback(self, timeout=0.2):
+        # feedback is provided through Logger.collect_feedback()
+        return None
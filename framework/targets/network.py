@@ -21,10 +21,12 @@
 #
 ################################################################################
 
+import asyncio
 import collections
 import copy
 import datetime
 import fcntl
+import os
 import select
 import socket
 import struct
@@ -36,7 +38,7 @@ from _socket import error as socket_error
 
 from framework.data import Data
 from framework.node import Node, NodeSemanticsCriteria
-from framework.target_helpers import Target, TargetStuck
+from framework.target_helpers import Target, TargetStuck, IOV_MAX, consume_segments
 from framework.knowledge.feedback_collector import FeedbackCollector
 
 from framework.value_types import *
@@ -58,6 +60,267 @@ eth_hdr_desc = \
 eth_hdr_node = NodeBuilder(add_env=True).create_graph_from_desc(eth_hdr_desc)
 
 
+class ConnectionPool(object):
+    """
+    Connections established in advance to a stream interface of a :class:`NetworkTarget`,
+    so that no connection has to be established when data is sent. The pool is refilled by
+    a background thread, thus while the feedback of the previous test case is collected.
+
+    Args:
+      host (str): IP address of the target
+      port (int): port of the target
+      socket_type (tuple): socket address family and socket type
+      size (int): number of connections maintained by the pool
+      keepalive (bool): If `True`, the connections still alive after a test case are handed
+        out again for the next ones, and `size` is the total number of connections. Otherwise,
+        each connection is used for only one test case and `size` is the number of idle
+        connections waiting for the next test cases.
+      connect_timeout (float): maximum time (in seconds) for establishing a connection
+    """
+
+    RETRY_DELAY = 0.5  # delay before a new attempt when the target refuses connections
+    HEALTH_CHECK_PERIOD = 1
+
+    def __init__(self, host, port, socket_type, size, keepalive=True, connect_timeout=1):
+        self.host = host
+        self.port = port
+        self.socket_type = socket_type
+        self.size = size
+        self.keepalive = keepalive
+        self.connect_timeout = connect_timeout
+
+        self._idle = collections.deque()
+        self._busy = 0
+        self._connect_failed = False
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(None, self._fill, name='POOL-{!s}:{:d}'.format(host, port))
+        self._thread.daemon = True
+        self._thread.start()
+
+    @staticmethod
+    def is_alive(s):
+        """
+        An idle connection is usable if the peer has neither closed it nor sent anything on
+        it, as such data would be taken for the feedback of the next test case.
+        """
+        try:
+            s.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return True
+        except OSError:
+            pass
+        return False
+
+    def _is_full(self):
+        return len(self._idle) + (self._busy if self.keepalive else 0) >= self.size
+
+    def _connect(self):
+        s = socket.socket(*self.socket_type)
+        s.settimeout(self.connect_timeout)
+        try:
+            s.connect((self.host, self.port))
+        except socket_error:
+            s.close()
+            return None
+        s.setblocking(0)
+        return s
+
+    def _fill(self):
+        while True:
+            with self._cond:
+                while not self._stop_event.is_set() and self._is_full():
+                    if not self._cond.wait(self.HEALTH_CHECK_PERIOD):
+                        dead = [s for s in self._idle if not self.is_alive(s)]
+                        for s in dead:
+                            self._idle.remove(s)
+                            s.close()
+                if self._stop_event.is_set():
+                    break
+
+            s = self._connect()
+
+            with self._cond:
+                self._connect_failed = s is None
+                if s is not None:
+                    if self._stop_event.is_set():
+                        s.close()
+                        break
+                    self._idle.append(s)
+                self._cond.notify_all()
+
+            if s is None:
+                self._stop_event.wait(self.RETRY_DELAY)
+
+    def get(self, timeout):
+        """
+        Returns:
+          socket: a connected socket (in non-blocking mode), or `None` if none is available
+          within `timeout` seconds or if the target currently refuses connections
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                while self._idle:
+                    s = self._idle.popleft()
+                    self._cond.notify_all()
+                    if self.is_alive(s):
+                        self._busy += 1
+                        return s
+                    s.close()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._connect_failed or self._stop_event.is_set():
+                    return None
+                self._cond.wait(remaining)
+
+    def release(self, s):
+        """
+        To be called when the feedback related to a connection provided by :meth:`get` has been
+        collected. The connection is closed unless it can be reused.
+        """
+        with self._cond:
+            self._busy -= 1
+            self._cond.notify_all()
+            if self.keepalive and not self._stop_event.is_set() and self.is_alive(s):
+                self._idle.append(s)
+                return
+        s.close()
+
+    def close(self):
+        with self._cond:
+            self._stop_event.set()
+            self._cond.notify_all()
+            for s in self._idle:
+                s.close()
+            self._idle.clear()
+        self._thread.join()
+
+
+class DatagramBurst(object):
+    """
+    Datagrams serialized in one preallocated buffer, so that they can be sent in a row
+    (refer to the parameter `burst_mode` of :class:`NetworkTarget`).
+
+    Args:
+      datagrams (list): the segments of each datagram (refer to :meth:`framework.data.Data.to_segments`)
+    """
+
+    def __init__(self, datagrams):
+        sizes = [sum(len(seg) for seg in segments) for segments in datagrams]
+        self.buffer = bytearray(sum(sizes))
+        view = memoryview(self.buffer)
+        self.datagrams = []
+        offset = 0
+        for segments, size in zip(datagrams, sizes):
+            start = offset
+            for seg in segments:
+                view[offset:offset+len(seg)] = seg
+                offset += len(seg)
+            self.datagrams.append(view[start:offset])
+
+    def __len__(self):
+        return len(self.datagrams)
+
+
+class _FeedbackBuffer(object):
+    """
+    Buffer the feedback of a socket is received into (through ``recv_into()``), which is reused
+    from one feedback collection to the next. The boundaries of the received chunks are kept
+    so that the feedback can be materialized in one go when it is committed.
+    """
+
+    INITIAL_SIZE = 64 * 1024
+    MIN_READ_SIZE = 2048  # the buffer is enlarged when less than this is free
+    MAX_RETAINED_SIZE = 1024 * 1024  # bigger buffers are not reused
+
+    def __init__(self):
+        self._buf = bytearray(self.INITIAL_SIZE)
+        self._view = memoryview(self._buf)
+        self.length = 0
+        self._chunk_ends = []
+
+    @property
+    def size(self):
+        return len(self._buf)
+
+    def recv_from(self, s, max_size=None):
+        """
+        Receive at most `max_size` bytes from the socket `s` (as many as the buffer can hold
+        if None), and return the number of bytes received (0 meaning the peer has closed the
+        connection).
+        """
+        if len(self._buf) - self.length < self.MIN_READ_SIZE:
+            self._grow()
+        end = len(self._buf) if max_size is None else min(len(self._buf), self.length + max_size)
+        nb = s.recv_into(self._view[self.length:end])
+        if nb:
+            self.length += nb
+            self._chunk_ends.append(self.length)
+        return nb
+
+    def _grow(self):
+        buf = bytearray(2 * len(self._buf))
+        view = memoryview(buf)
+        view[:self.length] = self._view[:self.length]
+        self._view.release()
+        self._buf, self._view = buf, view
+
+    def to_bytes(self, prefix=None, sep=b'\n'):
+        chunks = [] if prefix is None else [prefix]
+        start = 0
+        for end in self._chunk_ends:
+            chunks.append(self._view[start:end])
+            start = end
+        return sep.join(chunks)
+
+    def clear(self):
+        self.length = 0
+        self._chunk_ends = []
+
+
+class _FeedbackCollection(object):
+    """
+    Feedback gathered from some sockets after data has been sent, until the sockets are closed,
+    the expected amount of data has been received or the timeout has elapsed.
+    """
+
+    FLUSH_DELAY = 0.001  # when flushing, we stop as soon as nothing is received within this delay
+
+    def __init__(self, sockets, fbk_ids, fbk_lengths, timeout, flush_received_fbk, pre_fbk):
+        self.sockets = sockets
+        self.fbk_ids = fbk_ids
+        self.fbk_lengths = fbk_lengths
+        self.flush_received_fbk = flush_received_fbk
+        self.timeout_date = time.monotonic() + timeout
+        self.last_read = time.monotonic()
+        self.has_read = False
+        self.socket_errors = []
+        self.all_sockets = list(sockets)
+        self.pre_fbk = {} if pre_fbk is None else pre_fbk
+        self.bytes_recd = {}
+        self.buffers = {}  # provided by the reactor on the first read from a socket
+        for s in sockets:
+            self.bytes_recd[s] = 0
+
+    @property
+    def deadline(self):
+        if self.flush_received_fbk:
+            return min(self.timeout_date, self.last_read + self.FLUSH_DELAY)
+        return self.timeout_date
+
+    def is_over(self, now, wait_full_time_slot):
+        if now >= self.deadline or not self.sockets:
+            return True
+        if self.flush_received_fbk:
+            return False
+        if self.has_read and not wait_full_time_slot:
+            return True
+        for s in self.sockets:
+            if self.fbk_lengths[s] is None or self.bytes_recd[s] < self.fbk_lengths[s]:
+                return False
+        return True
+
+
 class NetworkTarget(Target):
     """
     Generic target class for interacting with a network resource. Can
@@ -73,12 +336,14 @@ class NetworkTarget(Target):
 
     _feedback_mode = Target.FBK_WAIT_FULL_TIME
     supported_feedback_mode = [Target.FBK_WAIT_FULL_TIME, Target.FBK_WAIT_UNTIL_RECV]
+    state_change_notification = True
 
     def __init__(self, host='localhost', port=12345, socket_type=(socket.AF_INET, socket.SOCK_STREAM),
                  data_semantics=UNKNOWN_SEMANTIC,
                  server_mode=False, listen_on_start=True, target_address=None, wait_for_client=True,
                  hold_connection=False, keep_first_client=True,
                  mac_src=None, mac_dst=None, add_eth_header=False,
+                 connection_pool=0, pool_keepalive=True, burst_mode=False,
                  fbk_timeout=2, fbk_mode=Target.FBK_WAIT_FULL_TIME, sending_delay=1, recover_timeout=0.5):
         """
         Args:
@@ -130,6 +395,20 @@ class NetworkTarget(Target):
             these nodes will be overwritten (through absorption) with this parameter.
           add_eth_header (bool): Add an ethernet header to the data to send. Only possible in
             combination with a SOCK_RAW socket type.
+          connection_pool (int): Only for client mode interfaces with `SOCK_STREAM` socket type
+            and `hold_connection` set to `False`. If greater than 0, this number of connections
+            to the target are established in advance by a background thread (refer to
+            :class:`ConnectionPool`), so that data can be sent right away through a
+            ready connection.
+          pool_keepalive (bool): Used only if `connection_pool` is greater than 0. If `True`,
+            the connections still alive after the feedback collection are reused for the next data.
+            Set it to `False` for protocols requiring one connection per test case.
+          burst_mode (bool): Only for `SOCK_DGRAM` and `SOCK_RAW` socket types. If `True`, all the
+            data routed to this interface by one call to ``send_multiple_data()`` are sent as a
+            burst: they are serialized beforehand into one buffer (refer to :class:`DatagramBurst`)
+            then sent in a row, and the feedback is collected once for the whole burst.
+            Otherwise, only the last one is sent. The sending rate is provided as feedback
+            and through the attribute ``last_burst_rate`` (in packets per second).
           fbk_timeout (float): maximum time duration for collecting the feedback
           sending_delay (float): maximum time (in seconds) taken to send data
             once the method ``send_(multiple_)data()`` has been called.
@@ -185,12 +464,17 @@ class NetworkTarget(Target):
         self._default_fbk_id = {}
 
         self.hold_connection = {}
+        self.connection_pool = {}
+        self.burst_mode = {}
+        self.last_burst_rate = None
 
         self.register_new_interface(host=host, port=port, socket_type=socket_type, data_semantics=data_semantics,
                                     server_mode=server_mode, target_address=target_address,
                                     wait_for_client=wait_for_client, hold_connection=hold_connection,
                                     keep_first_client=keep_first_client, mac_src=mac_src,
-                                    mac_dst=mac_dst, add_eth_header=add_eth_header)
+                                    mac_dst=mac_dst, add_eth_header=add_eth_header,
+                                    connection_pool=connection_pool, pool_keepalive=pool_keepalive,
+                                    burst_mode=burst_mode)
         self.multiple_destination = False
 
         self._additional_fbk_desc = {}
@@ -227,10 +511,16 @@ class NetworkTarget(Target):
     def register_new_interface(self, host, port, socket_type, data_semantics, server_mode=False,
                                target_address = None, wait_for_client=True,
                                hold_connection=False, keep_first_client=True,
-                               mac_src=None, mac_dst=None, add_eth_header=False):
+                               mac_src=None, mac_dst=None, add_eth_header=False,
+                               connection_pool=0, pool_keepalive=True, burst_mode=False):
 
         if not self._is_valid_socket_type(socket_type):
             raise ValueError("Unrecognized socket type")
+        if connection_pool and (server_mode or hold_connection or socket_type[1] != socket.SOCK_STREAM):
+            raise ValueError("Connection pools are only supported by client mode SOCK_STREAM "
+                             "interfaces without hold_connection")
+        if burst_mode and socket_type[1] == socket.SOCK_STREAM:
+            raise ValueError("Burst mode is only supported by SOCK_DGRAM and SOCK_RAW interfaces")
 
         self.multiple_destination = True
         self._host[data_semantics] = host
@@ -243,6 +533,8 @@ class NetworkTarget(Target):
         self._server_mode_additional_info[(host, port)] = (target_address, wait_for_client, keep_first_client)
         self._default_fbk_id[(host, port)] = self._default_fbk_socket_id + ' - {:s}:{:d}'.format(host, port)
         self.hold_connection[(host, port)] = hold_connection
+        self.connection_pool[(host, port)] = (socket_type, connection_pool, pool_keepalive)
+        self.burst_mode[(host, port)] = burst_mode
         if socket_type[1] == socket.SOCK_RAW:
             self._mac_src[(host, port)] = self.get_mac_addr(host) if mac_src is None else mac_src
             self._mac_dst[(host, port)] = b'\xff\xff\xff\xff\xff\xff' if mac_dst is None else mac_dst
@@ -472,11 +764,18 @@ class NetworkTarget(Target):
         self._hclient_sock2hp = {}  # only for hold_connection
         self._hclient_hp2sock = {}  # only for hold_connection
 
+        self._connection_pools = {}
+        self._pooled_sock2hp = {}  # sockets provided by a connection pool, until released
+        for (host, port), (socket_type, pool_size, keepalive) in self.connection_pool.items():
+            if pool_size > 0:
+                self._connection_pools[(host, port)] = \
+                    ConnectionPool(host, port, socket_type, pool_size, keepalive=keepalive,
+                                   connect_timeout=self.sending_delay)
+
         self._additional_fbk_sockets = []
         self._additional_fbk_ids = {}
         self._additional_fbk_lengths = {}
         self._dynamic_interfaces = {}
-        self._feedback_thread_qty = 0
         self._fbk_collector_finished_cpt = 0
         self._fbk_collector_to_launch_cpt = 0
         self._first_send_data_call = True
@@ -486,6 +785,7 @@ class NetworkTarget(Target):
                                     # used.
         self._flush_feedback_delay = None
 
+        self._start_reactor()
         self._connect_to_additional_feedback_sockets()
 
         if self._listen_on_start:
@@ -509,6 +809,7 @@ class NetworkTarget(Target):
 
     def stop(self):
         self.stop_event.set()
+        self._stop_reactor()
         for ev, _ in self._raw_server_private.values():
             ev.set()
         for s in self._server_sock2hp.keys():
@@ -519,6 +820,8 @@ class NetworkTarget(Target):
             s.close()
         for s in self._additional_fbk_sockets:
             s.close()
+        for pool in self._connection_pools.values():
+            pool.close()
 
         self._server_sock2hp = None
         self._server_thread_share = None
@@ -526,6 +829,8 @@ class NetworkTarget(Target):
         self._last_client_hp2sock = None
         self._hclient_sock2hp = None
         self._hclient_hp2sock = None
+        self._connection_pools = None
+        self._pooled_sock2hp = None
         self._additional_fbk_sockets = None
         self._additional_fbk_ids = None
         self._additional_fbk_lengths = None
@@ -534,13 +839,15 @@ class NetworkTarget(Target):
         return self.terminate()
 
     def recover_target(self):
-        t0 = datetime.datetime.now()
-        while not self.is_feedback_received():
-            time.sleep(0.0001)
-            now = datetime.datetime.now()
-            if (now - t0).total_seconds() > self._recover_timeout:
+        deadline = datetime.datetime.now() + datetime.timedelta(seconds=self._recover_timeout)
+        while True:
+            version = self.get_state_version()
+            if self.is_feedback_received():
+                return True
+            remaining = (deadline - datetime.datetime.now()).total_seconds()
+            if remaining < 0:
                 return False
-        return True
+            self.wait_for_state_change(version, remaining)
 
     def send_data(self, data, from_fmk=False):
         self.send_multiple_data(data_list=[data], from_fmk=from_fmk)
@@ -562,9 +869,16 @@ class NetworkTarget(Target):
         else:
             fbk_timeout = self.feedback_timeout
             data_to_send = {intf: None for intf in self._semantics_to_intf.values()}
+            bursts = {}
             for data in data_list:
                 intf = self._get_net_info_from(data)
-                data_to_send[intf] = data.to_bytes()
+                # the data is sent without being concatenated (refer to Data.to_segments())
+                if self.burst_mode.get(intf[:2]):
+                    bursts.setdefault(intf, []).append(data.to_segments())
+                else:
+                    data_to_send[intf] = data.to_segments()
+            for intf, datagrams in bursts.items():
+                data_to_send[intf] = DatagramBurst(datagrams)
             for intf, data in data_to_send.items():
                 sending_list.append((data,)+intf)
 
@@ -669,6 +983,15 @@ class NetworkTarget(Target):
             else:
                 return self._hclient_hp2sock[(host, port)]
 
+        pool = self._connection_pools.get((host, port))
+        if pool is not None:
+            s = pool.get(timeout=self.sending_delay)
+            if s is not None:
+                with self.socket_desc_lock:
+                    self._pooled_sock2hp[s] = (host, port)
+                return s
+            # otherwise we try by ourselves, which will report the connection error if any
+
         skt_sz = len(socket_type)
         if skt_sz == 2:
             family, sock_type = socket_type
@@ -911,188 +1234,211 @@ class NetworkTarget(Target):
                             pre_fbk={clientsocket: pre_fbk})
 
 
-    def _collect_feedback_from(self, thread_id, fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
-                               fbk_timeout, flush_received_fbk, pre_fbk):
-
-        def _check_and_handle_obsolete_socket(skt, error=None, error_list=None):
-            # print('\n*** NOTE: Remove obsolete socket {!r}'.format(socket))
-            try:
-                epobj.unregister(skt)
-            except ValueError as e:
-                # in python3, file descriptor == -1 witnessed (!?)
-                print('\n*** ERROR(check obsolete socket): ' + str(e))
-            except socket.error as serr:
-                # in python2, bad file descriptor (errno 9) witnessed
-                print('\n*** ERROR(check obsolete socket): ' + str(serr))
-
-            self._server_thread_lock.acquire()
-            if skt in self._last_client_sock2hp.keys():
-                if error is not None:
-                    error_list.append((fbk_ids[skt], error))
-                host, port = self._last_client_sock2hp[skt]
-                del self._last_client_sock2hp[skt]
-                del self._last_client_hp2sock[(host, port)]
-                self._server_thread_lock.release()
-            else:
-                self._server_thread_lock.release()
-                with self.socket_desc_lock:
-                    if skt in self._hclient_sock2hp.keys():
-                        if error is not None:
-                            error_list.append((fbk_ids[skt], error))
-                        host, port = self._hclient_sock2hp[skt]
-                        del self._hclient_sock2hp[skt]
-                        del self._hclient_hp2sock[(host, port)]
-                    if skt in self._additional_fbk_sockets:
-                        if error is not None:
-                            error_list.append((self._additional_fbk_ids[skt], error))
-                        self._additional_fbk_sockets.remove(skt)
-                        del self._additional_fbk_ids[skt]
-                        del self._additional_fbk_lengths[skt]
-
-        # print('\n*** DBG: start - collect_thread {:d}'.format(thread_id))
-
-        chunks = collections.OrderedDict()
-        t0 = datetime.datetime.now()
-        duration = 0
-        first_pass = True
-        ack_date = None
-        dont_stop = True
-
-        bytes_recd = {}
-        for fd in fbk_sockets:
-            bytes_recd[fd] = 0
-            chunks[fd] = []
-            if pre_fbk is not None and fd in pre_fbk and pre_fbk[fd] is not None:
-                chunks[fd].append(pre_fbk[fd])
-
-        socket_errors = []
-        has_read = False
-
-        while dont_stop:
-            ready_to_read = []
-            for fd, ev in epobj.poll(timeout=0.001):
-                skt = fileno2fd[fd]
-                if ev != select.EPOLLIN:
-                    _check_and_handle_obsolete_socket(skt, error=ev, error_list=socket_errors)
-                    if skt in fbk_sockets:
-                        fbk_sockets.remove(skt)
-                    continue
-                ready_to_read.append(skt)
-
-            now = datetime.datetime.now()
-            duration = (now - t0).total_seconds()
-
-            if flush_received_fbk:
-                if not ready_to_read or duration > fbk_timeout:
-                    break
-
-            if ready_to_read:
-                if first_pass:
-                    first_pass = False
-                    self._register_last_ack_date(now)
-                for s in ready_to_read:
-                    if fbk_lengths[s] is None:
-                        sz = NetworkTarget.CHUNK_SZ
-                    else:
-                        sz = min(fbk_lengths[s] - bytes_recd[s], NetworkTarget.CHUNK_SZ)
-
-                    retry = 0
-                    socket_timed_out = False
-                    while retry < 10:
-                        try:
-                            chunk = s.recv(sz)
-                        except socket.timeout:
-                            chunk = b''
-                            print('\n*** Socket timeout')
-                            socket_timed_out = True  # for UDP we keep the socket
-                            break
-                        except socket.error as serr:
-                            chunk = b''
-                            print('\n*** ERROR[{!s}] (while receiving): {:s}'.format(
-                                serr.errno, str(serr)))
-                            if serr.errno == socket.errno.EAGAIN:
-                                retry += 1
-                                time.sleep(2)
-                                continue
-                            else:
-                                break
-                        else:
-                            break
-
-                    if chunk == b'':
-                        print('\n*** NOTE: Nothing more to receive from: {!r}'.format(fbk_ids[s]))
-                        fbk_sockets.remove(s)
-                        _check_and_handle_obsolete_socket(s)
-                        if not socket_timed_out:
-                            s.close()
-                        continue
-                    else:
-                        bytes_recd[s] = bytes_recd[s] + len(chunk)
-                        chunks[s].append(chunk)
+    def _start_reactor(self):
+        self._reactor = select.epoll()
+        self._reactor_wakeup_r, self._reactor_wakeup_w = os.pipe()
+        os.set_blocking(self._reactor_wakeup_r, False)
+        self._reactor.register(self._reactor_wakeup_r, select.EPOLLIN)
+        self._reactor_fd2sock = {}
+        self._reactor_collections = []  # feedback collections in progress, oldest first
+        self._reactor_lock = threading.Lock()
+        self._reactor_buffers = []  # free feedback buffers, only handled by the reactor thread
+        self._reactor_stop = False
+        self._reactor_thread = threading.Thread(None, self._reactor_main, name='FBK-Reactor')
+        self._reactor_thread.daemon = True
+        self._reactor_thread.start()
+
+    def _stop_reactor(self):
+        with self._reactor_lock:
+            self._reactor_stop = True
+        self._wake_up_reactor()
+        self._reactor_thread.join()
+        self._reactor.close()
+        os.close(self._reactor_wakeup_r)
+        os.close(self._reactor_wakeup_w)
+
+    def _wake_up_reactor(self):
+        try:
+            os.write(self._reactor_wakeup_w, b'\x00')
+        except BlockingIOError:
+            # the reactor has already a pending wake-up
+            pass
+
+    def _reactor_unregister(self, skt):
+        # Should be called with the lock self._reactor_lock.
+        for fd, s in list(self._reactor_fd2sock.items()):
+            if s is skt:
+                del self._reactor_fd2sock[fd]
+                try:
+                    self._reactor.unregister(fd)
+                except OSError:
+                    # the socket has been closed in the meantime, which already unregistered it
+                    pass
 
-                has_read = True
+    def _reactor_main(self):
+        while True:
+            with self._reactor_lock:
+                in_progress = list(self._reactor_collections)
+                stop = self._reactor_stop
+
+            if stop:
+                # we provide what has been received so far
+                for coll in in_progress:
+                    self._finish_feedback_collection(coll)
+                break
 
-            if flush_received_fbk:
-                dont_stop = True
+            if in_progress:
+                timeout = max(0, min(coll.deadline for coll in in_progress) - time.monotonic())
+            else:
+                timeout = -1
+            events = self._reactor.poll(timeout)
 
-            elif fbk_sockets:
-                for s in fbk_sockets:
-                    if s in ready_to_read:
-                        s_fbk_len = fbk_lengths[s]
-                        if s_fbk_len is None or bytes_recd[s] < s_fbk_len:
-                            dont_stop = True
-                            break
-                    else:
-                        dont_stop = True
-                        break
+            for fd, ev in events:
+                if fd == self._reactor_wakeup_r:
+                    os.read(self._reactor_wakeup_r, 4096)
+                    continue
+                with self._reactor_lock:
+                    skt = self._reactor_fd2sock.get(fd)
+                    # the data are dispatched to the most recent collection related to the socket
+                    coll = next((c for c in reversed(self._reactor_collections) if skt in c.sockets), None)
+                if coll is None:
+                    # not awaited, the data will be read by the next collection related to this socket
+                    with self._reactor_lock:
+                        self._reactor_unregister(skt)
+                elif ev & select.EPOLLIN:
+                    self._read_feedback(coll, skt)
                 else:
-                    dont_stop = False
+                    coll.sockets.remove(skt)
+                    self._handle_obsolete_socket(skt, coll.fbk_ids, error=ev, error_list=coll.socket_errors)
+
+            now = time.monotonic()
+            with self._reactor_lock:
+                in_progress = list(self._reactor_collections)
+            for coll in in_progress:
+                if coll.is_over(now, self.fbk_wait_full_time_slot_mode):
+                    self._finish_feedback_collection(coll)
+
+    def _handle_obsolete_socket(self, skt, fbk_ids, error=None, error_list=None):
+        # print('\n*** NOTE: Remove obsolete socket {!r}'.format(socket))
+        with self._reactor_lock:
+            self._reactor_unregister(skt)
+
+        self._server_thread_lock.acquire()
+        if self._last_client_sock2hp is not None and skt in self._last_client_sock2hp.keys():
+            if error is not None:
+                error_list.append((fbk_ids[skt], error))
+            host, port = self._last_client_sock2hp[skt]
+            del self._last_client_sock2hp[skt]
+            del self._last_client_hp2sock[(host, port)]
+            self._server_thread_lock.release()
+        else:
+            self._server_thread_lock.release()
+            with self.socket_desc_lock:
+                if self._hclient_sock2hp is not None and skt in self._hclient_sock2hp.keys():
+                    if error is not None:
+                        error_list.append((fbk_ids[skt], error))
+                    host, port = self._hclient_sock2hp[skt]
+                    del self._hclient_sock2hp[skt]
+                    del self._hclient_hp2sock[(host, port)]
+                if self._additional_fbk_sockets is not None and skt in self._additional_fbk_sockets:
+                    if error is not None:
+                        error_list.append((self._additional_fbk_ids[skt], error))
+                    self._additional_fbk_sockets.remove(skt)
+                    del self._additional_fbk_ids[skt]
+                    del self._additional_fbk_lengths[skt]
+
+    def _read_feedback(self, coll, s):
+        if not coll.has_read:
+            self._register_last_ack_date(datetime.datetime.now())
+        coll.has_read = True
+        coll.last_read = time.monotonic()
+
+        if coll.fbk_lengths[s] is None:
+            sz = None
+        else:
+            sz = coll.fbk_lengths[s] - coll.bytes_recd[s]
 
-                if duration > fbk_timeout or \
-                        (has_read and not self.fbk_wait_full_time_slot_mode):
-                    dont_stop = False
+        buf = coll.buffers.get(s)
+        if buf is None:
+            buf = self._reactor_buffers.pop() if self._reactor_buffers else _FeedbackBuffer()
+            coll.buffers[s] = buf
 
+        socket_timed_out = False
+        try:
+            nb = buf.recv_from(s, sz)
+        except socket.timeout:
+            nb = 0
+            print('\n*** Socket timeout')
+            socket_timed_out = True  # for UDP we keep the socket
+        except socket.error as serr:
+            if serr.errno == socket.errno.EAGAIN:
+                # nothing to read yet, we wait for the next event
+                return
+            nb = 0
+            print('\n*** ERROR[{!s}] (while receiving): {:s}'.format(serr.errno, str(serr)))
+
+        if nb == 0:
+            print('\n*** NOTE: Nothing more to receive from: {!r}'.format(coll.fbk_ids[s]))
+            coll.sockets.remove(s)
+            self._handle_obsolete_socket(s, coll.fbk_ids)
+            if not socket_timed_out:
+                s.close()
+        else:
+            coll.bytes_recd[s] += nb
+
+    def _finish_feedback_collection(self, coll):
+        with self._reactor_lock:
+            self._reactor_collections.remove(coll)
+            # sockets that remain open are no more watched until data is sent through them again
+            in_use = set(s for c in self._reactor_collections for s in c.sockets)
+            for s in coll.all_sockets:
+                if s not in in_use:
+                    self._reactor_unregister(s)
+
+        for s in coll.all_sockets:
+            buf = coll.buffers.get(s)
+            pre_fbk = coll.pre_fbk.get(s)
+            if buf is not None:
+                fbk = buf.to_bytes(prefix=pre_fbk)
+                buf.clear()
+                if buf.size <= _FeedbackBuffer.MAX_RETAINED_SIZE:
+                    self._reactor_buffers.append(buf)
             else:
-                dont_stop = False
-
-        for s, chks in chunks.items():
-            fbk = b'\n'.join(chks)
+                fbk = b'' if pre_fbk is None else pre_fbk
             with self._fbk_handling_lock:
                 if fbk != b'':
-                    fbkid = fbk_ids[s]
+                    fbkid = coll.fbk_ids[s]
                     fbk, err = self._feedback_handling(fbk, fbkid)
                     self._feedback_collect(fbk, fbkid, error=err)
                 if (self._additional_fbk_sockets is None or s not in self._additional_fbk_sockets) and \
                         (self._hclient_sock2hp is None or s not in self._hclient_sock2hp.keys()) and \
                         (self._last_client_sock2hp is None or s not in self._last_client_sock2hp.keys()):
-                    s.close()
+                    if not self._release_pooled_socket(s):
+                        s.close()
 
         with self._fbk_handling_lock:
-            for fbkid, ev in socket_errors:
+            for fbkid, ev in coll.socket_errors:
                 self._feedback_collect(">>> ERROR[{:d}]: unable to interact with '{:s}' "
                                        "<<<".format(ev,fbkid), fbkid, error=-ev)
             self._feedback_complete()
 
-        # print('\n*** DBG: stop - collect_thread {:d}'.format(thread_id))
-
-        return
+    def _release_pooled_socket(self, s):
+        with self.socket_desc_lock:
+            if self._pooled_sock2hp is None or s not in self._pooled_sock2hp:
+                return False
+            hp = self._pooled_sock2hp.pop(s)
+            pool = self._connection_pools[hp]
+        pool.release(s)
+        return True
 
     def _send_data(self, sockets, data_refs, fbk_timeout, from_fmk, pre_fbk=None):
         # Should be called with the lock self_network_send_lock.
         # Especially needed in the context of self.send_multiple_data() as different threads can reach
         # this code simultaneously (_raw_server_main, _server_main and the main framework thread).
 
-        epobj = select.epoll()
-        fileno2fd = {}
-
         if self._first_send_data_call:
             self._first_send_data_call = False
-
             fbk_sockets, fbk_ids, fbk_lengths = self._get_additional_feedback_sockets()
-            if fbk_sockets:
-                for fd in fbk_sockets:
-                    epobj.register(fd, select.EPOLLIN)
-                    fileno2fd[fd.fileno()] = fd
         else:
             fbk_sockets, fbk_ids, fbk_lengths = None, None, None
 
@@ -1108,14 +1454,12 @@ class NetworkTarget(Target):
 
             for s in sockets:
                 data, host, port, address = data_refs[s]
-                epobj.register(s, select.EPOLLIN)
-                fileno2fd[s.fileno()] = s
                 fbk_sockets.append(s)
                 fbk_ids[s] = self._default_fbk_id[(host, port)]
                 fbk_lengths[s] = self.feedback_length
 
             assert from_fmk
-            self._start_fbk_collector(fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
+            self._start_fbk_collector(fbk_sockets, fbk_ids, fbk_lengths,
                                       pre_fbk=pre_fbk, timeout=fbk_timeout, flush_received_fbk=True)
 
             return
@@ -1125,19 +1469,29 @@ class NetworkTarget(Target):
 
             for s in ready_to_write:
                 data, host, port, address = data_refs[s]
-                epobj.register(s, select.EPOLLIN)
-                fileno2fd[s.fileno()] = s
 
-                raw_data = data.to_bytes() if isinstance(data, Data) else data
-                totalsent = 0
+                if isinstance(data, DatagramBurst):
+                    self._send_burst(s, data, host, port, address)
+                    segments = []
+                elif isinstance(data, Data):
+                    segments = data.to_segments()
+                elif isinstance(data, bytes):
+                    segments = [data]
+                else:
+                    segments = list(data)
+                segments = [seg for seg in segments if seg]
+                if s.type != socket.SOCK_STREAM and len(segments) > IOV_MAX:
+                    # a datagram has to be sent through one call
+                    segments = [b''.join(segments)]
                 send_retry = 0
-                while totalsent < len(raw_data) and send_retry < 10:
+                while segments and send_retry < 10:
                     try:
                         if address is None:
-                            sent = s.send(raw_data[totalsent:])
+                            # scatter-gather emission
+                            sent = s.sendmsg(segments[:IOV_MAX])
                         else:
                             # with SOCK_RAW, address is ignored
-                            sent = s.sendto(raw_data[totalsent:], address)
+                            sent = s.sendto(b''.join(segments), address)
                     except socket.error as serr:
                         send_retry += 1
                         print('\n*** ERROR(while sending): ' + str(serr))
@@ -1159,7 +1513,7 @@ class NetworkTarget(Target):
                             if from_fmk:
                                 self._fbk_collector_to_launch_cpt -= 1
                             raise TargetStuck("socket connection broken")
-                        totalsent = totalsent + sent
+                        consume_segments(segments, sent)
 
                 if fbk_sockets is None:
                     assert fbk_ids is None
@@ -1175,24 +1529,73 @@ class NetworkTarget(Target):
                 fbk_lengths[s] = self.feedback_length
 
             if from_fmk:
-                self._start_fbk_collector(fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
+                self._start_fbk_collector(fbk_sockets, fbk_ids, fbk_lengths,
                                           pre_fbk=pre_fbk, timeout=fbk_timeout)
 
         else:
             raise TargetStuck("system not ready for sending data!")
 
 
-    def _start_fbk_collector(self, fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
+    def _send_burst(self, s, burst, host, port, address):
+        # Tight loop without select() nor locking. We only wait for the socket when
+        # its buffer is full.
+        sent = 0
+        dropped = 0
+        error = None
+        t0 = time.perf_counter()
+        for datagram in burst.datagrams:
+            while True:
+                try:
+                    if address is None:
+                        s.send(datagram)
+                    else:
+                        s.sendto(datagram, address)
+                except (BlockingIOError, socket.timeout):
+                    _, ready_to_write, _ = select.select([], [s], [], self.sending_delay)
+                    if ready_to_write:
+                        continue
+                    error = 'socket not ready'
+                except OSError as serr:
+                    if serr.errno == socket.errno.EMSGSIZE:
+                        dropped += 1
+                    else:
+                        error = str(serr)
+                else:
+                    sent += 1
+                break
+            if error is not None:
+                break
+        duration = time.perf_counter() - t0
+
+        self.last_burst_rate = sent / duration if duration > 0 else None
+        msg = 'Burst of {:d} datagrams sent to {!s}:{:d}'.format(sent, host, port)
+        if self.last_burst_rate is not None:
+            msg += ' ({:.0f} packets/s)'.format(self.last_burst_rate)
+        self._feedback.add_fbk_from(self._INTERNALS_ID, msg, status=0)
+        if dropped:
+            self._feedback.add_fbk_from(self._INTERNALS_ID,
+                                        '{:d} datagrams were not sent because they were too long!'
+                                        .format(dropped), status=-1)
+        if error is not None:
+            self._feedback.add_fbk_from(self._INTERNALS_ID,
+                                        '>>> ERROR: burst interrupted after {:d}/{:d} datagrams ({:s}) <<<'
+                                        .format(sent, len(burst), error), status=-1)
+
+    def _start_fbk_collector(self, fbk_sockets, fbk_ids, fbk_lengths,
                              pre_fbk=None, timeout=None, flush_received_fbk=False):
-
-        self._feedback_thread_qty += 1
-        feedback_thread = threading.Thread(None, self._collect_feedback_from,
-                                           name='FBK-#' + repr(self._feedback_thread_qty),
-                                           args=(self._feedback_thread_qty,
-                                                 fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
-                                                 timeout, flush_received_fbk,
-                                                 pre_fbk))
-        feedback_thread.start()
+        coll = _FeedbackCollection(fbk_sockets, fbk_ids, fbk_lengths, timeout, flush_received_fbk, pre_fbk)
+        with self._reactor_lock:
+            for s in fbk_sockets:
+                fd = s.fileno()
+                if self._reactor_fd2sock.get(fd) is s:
+                    continue
+                if fd in self._reactor_fd2sock:
+                    # stale reference to a socket closed elsewhere whose descriptor has been reused
+                    self._reactor_unregister(self._reactor_fd2sock[fd])
+                self._reactor.register(fd, select.EPOLLIN)
+                self._reactor_fd2sock[fd] = s
+            self._reactor_collections.append(coll)
+        self._wake_up_reactor()
 
     def _feedback_collect(self, fbk, ref, error=0):
         if error < 0:
@@ -1201,6 +1604,7 @@ class NetworkTarget(Target):
 
     def _feedback_complete(self):
         self._fbk_collector_finished_cpt += 1
+        self.notify_state_change()
         # print('\n***DBG _fc: {} {}'.format(self._fbk_collector_to_launch_cpt, self._fbk_collector_finished_cpt))
 
     def _before_sending_data(self, data_list, from_fmk):
@@ -1223,7 +1627,12 @@ class NetworkTarget(Target):
 
         new_data_list = []
         for data in data_list:
-            if isinstance(data.content, Node):
+            # The value of the data is pinned when it is sent concurrently to several targets
+            # (refer to Data.pin_value()). Its node graph shall then neither be changed nor
+            # serialized from here.
+            pinned = data.is_value_pinned()
+            node_content = isinstance(data.content, Node) and not pinned
+            if node_content:
                 data.content.freeze()
             host, port, socket_type, _ = self._get_net_info_from(data)
             if socket_type[1] == socket.SOCK_RAW:
@@ -1235,7 +1644,7 @@ class NetworkTarget(Target):
                     eth_hdr[self._mac_src_semantic] = mac_src
                     eth_hdr[self._mac_dst_semantic] = mac_dst
 
-                    if isinstance(data.content, Node):
+                    if node_content:
                         payload = data.content
                     else:
                         payload = Node('payload', values=[data.to_bytes()])
@@ -1243,7 +1652,11 @@ class NetworkTarget(Target):
                     n = Node(name='eth_packet', subnodes=[eth_hdr, payload])
                     data = Data(n)
 
-                elif isinstance(data.content, Node):
+                elif pinned and (mac_src is not None or mac_dst is not None):
+                    self._logger.log_comment('WARNING: Unable to set the MAC addresses on data '
+                                             'sent concurrently to several targets')
+
+                elif node_content:
                     if mac_src is not None:
                         try:
                             data.content[self._mac_src_semantic] = mac_src
@@ -1311,4 +1724,239 @@ class NetworkTarget(Target):
             desc += '{:s}:{:d}#{!s} (serv:{!r},hold:{!r}), '.format(
                 host, port, socket_type, server_mode, hold_connection)
 
-        return desc[:-2]
\ No newline at end of file
+        return desc[:-2]
+
+
+class _DatagramSession(asyncio.DatagramProtocol):
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    def datagram_received(self, data, addr):
+        self.queue.put_nowait(data)
+
+    def error_received(self, exc):
+        self.queue.put_nowait(exc)
+
+    def connection_lost(self, exc):
+        self.queue.put_nowait(b'')
+
+
+class AsyncNetworkTarget(Target):
+    """
+    Target for interacting with a network server through many concurrent sessions, multiplexed
+    on one asyncio event loop (run by a dedicated thread).
+
+    A session is a TCP connection (or a UDP socket) opened by each call to ``send_data()``
+    or ``send_multiple_data()``. The data of a session are sent one after the other, each one
+    after the feedback of the previous one has been collected (as for a stateful protocol
+    exchange), then the session is closed. The framework can send new data as soon as fewer
+    than `max_sessions` sessions are in progress.
+
+    The feedback received after sending a data (and before sending the next one) is attached to
+    it (through :meth:`framework.logger.Logger.collect_feedback`), so that it is recorded in
+    the FmkDB along with the data it relates to.
+    """
+
+    CHUNK_SZ = 2048
+
+    _feedback_mode = Target.FBK_WAIT_FULL_TIME
+    supported_feedback_mode = [Target.FBK_WAIT_FULL_TIME, Target.FBK_WAIT_UNTIL_RECV]
+    state_change_notification = True
+
+    def __init__(self, host='localhost', port=12345, socket_type=(socket.AF_INET, socket.SOCK_STREAM),
+                 max_sessions=100, fbk_timeout=2, fbk_mode=Target.FBK_WAIT_FULL_TIME, sending_delay=1):
+        """
+        Args:
+          host (str): IP address of the target to connect to
+          port (int): port of the target
+          socket_type (tuple): Tuple composed of the socket address family
+            and socket type (`SOCK_STREAM` or `SOCK_DGRAM`)
+          max_sessions (int): maximum number of sessions in progress at the same time
+          fbk_timeout (float): maximum time duration for collecting the feedback of each data
+          fbk_mode (int): feedback mode (refer to :class:`framework.target_helpers.Target`)
+          sending_delay (float): maximum time (in seconds) taken to establish a session
+            and to send each data
+        """
+        Target.__init__(self)
+        if socket_type[1] not in [socket.SOCK_STREAM, socket.SOCK_DGRAM]:
+            raise ValueError("Unrecognized socket type")
+        self.host = host
+        self.port = port
+        self.socket_type = socket_type
+        self.max_sessions = max_sessions
+
+        self._loop = None
+        self._loop_thread = None
+        self._sessions = None
+        self._session_cpt = 0
+        self._sessions_cond = threading.Condition()
+
+        self.set_sending_delay(sending_delay)
+        self.set_feedback_timeout(fbk_timeout)
+        self.set_feedback_mode(fbk_mode)
+
+    def get_description(self):
+        sock_type = 'STREAM' if self.socket_type[1] == socket.SOCK_STREAM else 'DGRAM'
+        return f'{self.host}:{self.port}#{sock_type} [Max sessions: {self.max_sessions}]'
+
+    def start(self):
+        self._sessions = set()
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(None, self._loop.run_forever, name='AsyncNetworkTarget-loop')
+        self._loop_thread.start()
+        return self.initialize()
+
+    def stop(self):
+        # the sessions in progress are completed before stopping
+        with self._sessions_cond:
+            while self._sessions:
+                self._sessions_cond.wait()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = None
+        self._loop_thread = None
+        self._sessions = None
+        return self.terminate()
+
+    def initialize(self):
+        '''
+        To be overloaded if some intial setup for the target is necessary.
+        '''
+        return True
+
+    def terminate(self):
+        '''
+        To be overloaded if some cleanup is necessary for stopping the target.
+        '''
+        return True
+
+    def send_data(self, data, from_fmk=False):
+        self.send_multiple_data([data], from_fmk=from_fmk)
+
+    def send_multiple_data(self, data_list, from_fmk=False):
+        # The data are serialized from the caller thread, as the framework keeps on using them
+        # while the session is running. The sessions only get the segments of each data,
+        # along with the data itself for the feedback to be attached to it.
+        segments_list = [(tuple(data.to_segments()), data) for data in data_list]
+        with self._sessions_cond:
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions_cond.wait()
+            self._session_cpt += 1
+            session_id = self._session_cpt
+            self._sessions.add(session_id)
+        asyncio.run_coroutine_threadsafe(self._run_session(session_id, segments_list), self._loop)
+
+    def is_target_ready_for_new_data(self):
+        return len(self._sessions) < self.max_sessions
+
+    def get_feedback(self):
+        # feedback is provided through Logger.collect_feedback()
+        return None
+
+    def _feedback_handling(self, fbk, ref):
+        '''To be overloaded if feedback from the target need to be filtered
+        before being logged. Refer to :meth:`NetworkTarget._feedback_handling`.
+
+        Args:
+          fbk (bytes): feedback received through the session referenced by `ref`.
+          ref (string): reference of the session (``Session#<n>``).
+
+        Returns:
+          tuple: a tuple `(new_fbk, status)`
+        '''
+        return fbk, 0
+
+    def _feedback_collect(self, content, status, session_id, data):
+        self._logger.collect_feedback(content=content, status_code=status, subref=f'Session#{session_id}',
+                                      fbk_src=self, related_data=data)
+
+    async def _run_session(self, session_id, segments_list):
+        try:
+            if self.socket_type[1] == socket.SOCK_STREAM:
+                await self._run_stream_session(session_id, segments_list)
+            else:
+                await self._run_datagram_session(session_id, segments_list)
+        except Exception as e:
+            self._feedback_collect(f'Exception raised during the session: {e!r}', -1,
+                                   session_id, segments_list[0][1])
+        finally:
+            with self._sessions_cond:
+                self._sessions.discard(session_id)
+                self._sessions_cond.notify_all()
+            self.notify_state_change()
+
+    async def _run_stream_session(self, session_id, segments_list):
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, family=self.socket_type[0]),
+                self.sending_delay)
+        except (OSError, asyncio.TimeoutError) as e:
+            self._feedback_collect(f'>>> ERROR: unable to connect to {self.host}:{self.port} ({e!r}) <<<',
+                                   -1, session_id, segments_list[0][1])
+            return
+
+        try:
+            for segments, data in segments_list:
+                writer.writelines(segments)
+                await asyncio.wait_for(writer.drain(), self.sending_delay)
+                if not await self._collect_feedback(reader.read, session_id, data):
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _run_datagram_session(self, session_id, segments_list):
+        transport, protocol = await self._loop.create_datagram_endpoint(
+            _DatagramSession, remote_addr=(self.host, self.port), family=self.socket_type[0])
+
+        async def read(size):
+            chunk = await protocol.queue.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            return chunk
+
+        try:
+            for segments, data in segments_list:
+                transport.sendto(b''.join(segments))
+                if not await self._collect_feedback(read, session_id, data):
+                    break
+        finally:
+            transport.close()
+
+    async def _collect_feedback(self, read, session_id, data):
+        """
+        Returns:
+            bool: False if the session has been closed by the target
+        """
+        chunks = []
+        deadline = self._loop.time() + self.feedback_timeout
+        alive = True
+        while True:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                chunk = await asyncio.wait_for(read(self.CHUNK_SZ), remaining)
+            except asyncio.TimeoutError:
+                break
+            except OSError as e:
+                self._feedback_collect(f'>>> ERROR: unable to interact with {self.host}:{self.port} '
+                                       f'({e!r}) <<<', -1, session_id, data)
+                alive = False
+                break
+            if chunk == b'':
+                alive = False
+                break
+            chunks.append(chunk)
+            if self.fbk_wait_until_recv_mode:
+                break
+
+        if chunks:
+            fbk, status = self._feedback_handling(b''.join(chunks), f'Session#{session_id}')
+            self._feedback_collect(fbk, status, session_id, data)
+        return alive
@@ -25,7 +25,7 @@ import os
 import random
 
 from framework.global_resources import workspace_folder
-from framework.target_helpers import Target
+from framework.target_helpers import Target, PayloadFile
 from framework.knowledge.feedback_collector import FeedbackCollector
 from libs.external_modules import cups_module, cups
 
@@ -35,7 +35,14 @@ class PrinterTarget(Target):
     _feedback_mode = None
     supported_feedback_mode = []
 
-    def __init__(self, tmpfile_ext):
+    def __init__(self, tmpfile_ext, in_memory_file=False):
+        '''
+        Args:
+          tmpfile_ext (str): extension of the file to be printed.
+          in_memory_file (bool): if True, the file to be printed is an anonymous memory file
+            (refer to :class:`framework.target_helpers.PayloadFile`) rather than a file of
+            the workspace.
+        '''
         Target.__init__(self)
         self._suffix = '{:0>12d}'.format(random.randint(2 ** 16, 2 ** 32))
         self._feedback = FeedbackCollector()
@@ -43,6 +50,8 @@ class PrinterTarget(Target):
         self._target_port = None
         self._printer_name = None
         self._cpt = None
+        self._in_memory_file = in_memory_file
+        self._payload_file = None
         self.set_tmp_file_extension(tmpfile_ext)
 
     def get_description(self):
@@ -106,16 +115,21 @@ class PrinterTarget(Target):
 
         print("\nDevice-URI: %s\nPrinter Name: %s" % (params["device-uri"], self._printer_name))
 
+        file_name = os.path.join(workspace_folder, 'fuzz_test_' + self._suffix + self._tmpfile_ext)
+        self._payload_file = PayloadFile(file_name, in_memory=self._in_memory_file)
+
         return True
 
-    def send_data(self, data, from_fmk=False):
+    def stop(self):
+        if self._payload_file is not None:
+            self._payload_file.close()
+            self._payload_file = None
+        return True
 
-        data = data.to_bytes()
-        wkspace = workspace_folder
-        file_name = os.path.join(wkspace, 'fuzz_test_' + self._suffix + self._tmpfile_ext)
+    def send_data(self, data, from_fmk=False):
 
-        with open(file_name, 'wb') as f:
-             f.write(data)
+        file_name = self._payload_file.path
+        self._payload_file.write(data.to_segments())
 
         inc = '_{:0>5d}'.format(self._cpt)
         self._cpt += 1
@@ -48,6 +48,28 @@ import libs.debug_facility as dbg
 
 DEBUG = dbg.VT_DEBUG
 
+# The blobs provided for absorption may be memoryviews (cf. Node.absorb()),
+# which do not offer the search methods of bytes.
+
+def _blob_startswith(blob, prefix):
+    return blob[:len(prefix)] == prefix
+
+_BLOB_FIND_CHUNK_SZ = 65536
+
+def _blob_find(blob, sub):
+    if not isinstance(blob, memoryview):
+        return blob.find(sub)
+    elif not sub:
+        return 0
+    # the search is performed chunk by chunk to avoid copying the whole blob
+    # when the pattern is found at its beginning
+    step = builtins.max(_BLOB_FIND_CHUNK_SZ, len(sub))
+    for start in range(0, len(blob), step):
+        off = bytes(blob[start:start+step+len(sub)-1]).find(sub)
+        if off > -1:
+            return start + off
+    return -1
+
 class VT(object):
     """
     Base class to implement Types that are leveraged by typed nodes
@@ -111,6 +133,15 @@ class VT(object):
     def is_exhausted(self):
         return False
 
+    def is_constant(self):
+        """
+        Tell if the object can only produce one value, whatever its state.
+
+        Returns: bool
+
+        """
+        return False
+
     def set_size_from_constraints(self, size=None, encoded_size=None):
         raise NotImplementedError
 
@@ -283,9 +314,9 @@ class String(VT_Alt):
 
     def _bytes2str(self, val):
         if isinstance(val, (list, tuple)):
-            b = [v.decode(self.codec, 'replace') for v in val]
+            b = [str(v, self.codec, 'replace') for v in val]
         else:
-            b = val.decode(self.codec, 'replace')
+            b = str(val, self.codec, 'replace')
         return b
 
     UTF16LE = codecs.lookup('utf-16-le').name
@@ -406,16 +437,18 @@ class String(VT_Alt):
         # If no such constraints are provided, we assume off==0
         # and let do_absorb() decide if it's OK (via size constraints
         # for instance).
+        if self.encoded_string:
+            blob = bytes(blob)
         blob_dec = self.decode(blob)
         if constraints[AbsCsts.Contents] and self.is_values_provided and self.alphabet is None:
             for v in self.values:
-                if blob_dec.startswith(v):
+                if _blob_startswith(blob_dec, v):
                     break
             else:
                 for v in self.values:
                     if self.encoded_string:
                         v = self.encode(v)
-                    off = blob.find(v)
+                    off = _blob_find(blob, v)
                     if off > -1:
                         size = len(v)
                         break
@@ -432,7 +465,7 @@ class String(VT_Alt):
                 off = sup_sz
                 for l in alp:
                     l = self.encode(self._str2bytes(l))
-                    new_off = blob.find(l)
+                    new_off = _blob_find(blob, l)
                     if new_off < off and new_off > -1:
                         off = new_off
                 if off == sup_sz:
@@ -442,7 +475,7 @@ class String(VT_Alt):
             g = re.search(self.regexp, self._bytes2str(blob_dec), re.S)
             if g is not None:
                 pattern_enc = self.encode(self._str2bytes(g.group(0)))
-                off = blob.find(pattern_enc)
+                off = _blob_find(blob, pattern_enc)
                 size = len(pattern_enc)
             else:
                 off = -1
@@ -479,7 +512,7 @@ class String(VT_Alt):
             sz = size if size is not None and size < self.max_encoded_sz else self.max_encoded_sz
 
             # if encoded string, val is returned decoded
-            val = self._read_value_from(blob[off:sz+off], constraints)
+            val = self._read_value_from(bytes(blob[off:sz+off]), constraints)
 
             val_enc_sz = len(self.encode(val)) # maybe different from sz if blob is smaller
             if val_enc_sz < self.min_encoded_sz:
@@ -487,7 +520,7 @@ class String(VT_Alt):
 
             val_sz = val_enc_sz if not self.encoded_string else None
         else:
-            blob = blob[off:] #blob[off:size+off] if size is not None else blob[off:]
+            blob = bytes(blob[off:]) #blob[off:size+off] if size is not None else blob[off:]
             val = self._read_value_from(blob, constraints)
             val_sz = len(val)
 
@@ -1163,6 +1196,9 @@ class String(VT_Alt):
         else:
             return True
 
+    def is_constant(self):
+        return not self._fuzzy_mode and self.values is not None and len(self.values) == 1
+
     def set_size_from_constraints(self, size=None, encoded_size=None):
         # This method is used only for absorption purpose, thus no modification
         # is performed on self.values. To be reconsidered in the case the method
@@ -1420,11 +1456,11 @@ class INT(VT):
         # and let do_absorb() decide if it's OK.
         if constraints[AbsCsts.Contents] and self.values is not None:
             for v in self.values:
-                if blob.startswith(self._convert_value(v)):
+                if _blob_startswith(blob, self._convert_value(v)):
                     break
             else:
                 for v in self.values:
-                    off = blob.find(self._convert_value(v))
+                    off = _blob_find(blob, self._convert_value(v))
                     if off > -1:
                         break
 
@@ -1692,6 +1728,12 @@ class INT(VT):
     def is_exhausted(self):
         return self.exhausted
 
+    def is_constant(self):
+        if self.values is not None:
+            return len(self.values) == 1
+        else:
+            return self.mini_gen == self.maxi_gen
+
 
 class Filename(String):
 
@@ -2834,7 +2876,7 @@ class BitField(VT_Alt):
 
         self.reset_state()
 
-        blob = blob[off:self.nb_bytes]
+        blob = bytes(blob[off:self.nb_bytes])
 
         self.drawn_val, orig_val = self._read_value_from(blob, self.nb_bytes, self.endian, constraints)
 
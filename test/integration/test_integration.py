@@ -37,7 +37,7 @@ from framework.plumbing import *
 from framework.data_model import *
 from framework.encoders import *
 
-from test import ignore_data_model_specifics, run_long_tests, exit_on_import_error
+from test import ignore_data_model_specifics, run_long_tests, exit_on_import_error, mock
 
 def setUpModule():
     global fmk, dm, results, node_nterm, node_simple, node_typed
@@ -4245,6 +4245,123 @@ class TestFMK(unittest.TestCase):
 
         fmk.cleanup_all_dmakers(reset_existing_seed=True)
 
+    def test_generator_batch(self):
+        outcomes = []
+        for i in range(5):
+            d = fmk.process_data([('OFF_GEN', UI(batch=3))])
+            self.assertIsNotNone(d)
+            self.assertIsInstance(d.content, Node)
+            outcomes.append(d.to_bytes())
+
+        self.assertGreater(len(set(outcomes)), 1)
+        fmk.cleanup_all_dmakers(reset_existing_seed=True)
+
+        # node disruptors can be chained to the generator
+        for i in range(4):
+            d = fmk.process_data([('OFF_GEN', UI(batch=3)), ('C', UI(nb=1))])
+            self.assertIsNotNone(d)
+            self.assertIsInstance(d.content, Node)
+        fmk.cleanup_all_dmakers(reset_existing_seed=True)
+
+        # the variants of a batch are the data that copies of the atom would provide, and
+        # they do not depend on each other
+        random.seed(11)
+        expected = [fmk.dm.get_atom('off_gen').to_bytes() for _ in range(6)]
+        self.assertGreater(len(set(expected)), 1)
+        random.seed(11)
+        atom = fmk.dm.get_atom('off_gen')
+        self.assertEqual(atom.freeze_batch(6), expected)
+        random.seed(11)
+        atom = fmk.dm.get_atom('off_gen')
+        variants = atom.freeze_batch(6, as_nodes=True)
+        self.assertEqual(len(set(map(id, variants))), 6)
+        self.assertEqual([v.to_bytes() for v in variants], expected)
+        for v in variants[::2]:
+            v.unfreeze(recursive=True)
+            v.freeze()
+        self.assertEqual([v.to_bytes() for v in variants[1::2]], expected[1::2])
+        self.assertEqual(atom.to_bytes(), expected[-1])
+
+    def test_pipelined_sending(self):
+        outcomes = {}
+        for pipelined in (False, True):
+            data_list = fmk.process_data_and_send(DataProcess(['SEPARATOR', 'tSEP']), max_loop=5,
+                                                  console_display=False, pipelined=pipelined)
+            self.assertEqual(len(data_list), 5)
+            data_ids = [d.get_data_id() for d in data_list]
+            self.assertEqual(data_ids, sorted(data_ids))
+            outcomes[pipelined] = [d.to_bytes() for d in data_list]
+            fmk.cleanup_all_dmakers(reset_existing_seed=True)
+
+        self.assertEqual(outcomes[True], outcomes[False])
+
+    def test_target_state_notification(self):
+        tg_id = 7
+        fmk.reload_all(tg_ids=[tg_id])
+        fmk.set_feedback_mode(Target.FBK_WAIT_UNTIL_RECV, tg_id=tg_id, do_show=False)
+        fmk.set_feedback_timeout(5, tg_id=tg_id, do_record=False, do_show=False)
+
+        t0 = datetime.datetime.now()
+        data_list = fmk.process_data_and_send(DataProcess(['SEPARATOR', 'tSEP']), max_loop=5,
+                                              console_display=False)
+        duration = (datetime.datetime.now() - t0).total_seconds()
+        self.assertEqual(len(data_list), 5)
+        # feedback reception is notified, thus the feedback timeout is never reached
+        self.assertLess(duration, 5)
+
+        version = Target.get_state_version()
+        threading.Timer(0.1, fmk.targets[tg_id].notify_state_change).start()
+        t0 = datetime.datetime.now()
+        Target.wait_for_state_change(version, timeout=5)
+        self.assertLess((datetime.datetime.now() - t0).total_seconds(), 5)
+        self.assertGreater(Target.get_state_version(), version)
+
+    def test_concurrent_sending(self):
+        tg_ids = [7, 8]
+        fmk.reload_all(tg_ids=tg_ids)
+        sending_threads = []
+        pinned_values = []
+
+        def slow_sending(tg):
+            send_data = tg.send_data
+            def _send_data(data, from_fmk=False):
+                sending_threads.append(threading.current_thread())
+                pinned_values.append(data.is_value_pinned())
+                time.sleep(0.2)
+                send_data(data, from_fmk=from_fmk)
+            return _send_data
+
+        def stuck_sending(data, from_fmk=False):
+            raise TargetStuck('test')
+
+        tg1, tg2 = [fmk.targets[tg_id] for tg_id in tg_ids]
+        fmk.enable_concurrent_sending()
+        try:
+            with mock.patch.object(tg1, 'send_data', slow_sending(tg1)), \
+                    mock.patch.object(tg2, 'send_data', slow_sending(tg2)):
+                t0 = datetime.datetime.now()
+                data_list = fmk.process_data_and_send(DataProcess(['SEPARATOR', 'tSEP'], tg_ids=tg_ids),
+                                                      max_loop=2, console_display=False)
+                duration = (datetime.datetime.now() - t0).total_seconds()
+            self.assertEqual(len(data_list), 2)
+            self.assertEqual(len(sending_threads), 4)
+            self.assertNotIn(threading.main_thread(), sending_threads)
+            self.assertLess(duration, 0.8)
+            # the targets are only given already serialized data
+            self.assertTrue(all(pinned_values))
+            self.assertFalse(any(d.is_value_pinned() for d in data_list))
+
+            # A stuck target does not prevent the other ones from being sent data
+            with mock.patch.object(tg1, 'send_data', stuck_sending), \
+                    mock.patch.object(tg2, 'send_data', slow_sending(tg2)):
+                data = fmk.process_data(['SEPARATOR', 'tSEP'])
+                data.tg_ids = tg_ids
+                fmk._send_data([data])
+            self.assertTrue(fmk._sending_error)
+            self.assertEqual(len(sending_threads), 5)
+        finally:
+            fmk.disable_concurrent_sending()
+
     def test_separator_disruptor(self):
         for i in range(100):
             d = fmk.process_data(['SEPARATOR', 'tSEP'])
@@ -4550,6 +4667,47 @@ class TestFMK(unittest.TestCase):
         fmk.process_data_and_send(DataProcess(['SC_EVOL1']), verbose=False, max_loop=-1)
         fmk.process_data_and_send(DataProcess(['SC_EVOL2']), verbose=False, max_loop=-1)
 
+    def test_feedback_driven_population(self):
+        from framework.coverage import CoverageFeedback
+        from framework.evolutionary_helpers import DefaultPopulation
+
+        fmk.reload_all(tg_ids=[7])
+        population = DefaultPopulation(fmk, init_process=DataProcess([('tTYPE', UI(fuzz_mag=0.2))],
+                                                                     seed='exist_cond'),
+                                       max_size=6, max_energy=3)
+        population.reset()
+        self.assertEqual(len(population), 6)
+
+        now = datetime.datetime.now()
+        for ind in population[:]:
+            ind.feedback = [('TestTarget', 0, now, b'parsed')]
+        population[0].feedback = [('TestTarget', -1, now, b'crash')]
+        population[1].feedback.append(('TestTarget - LocalTarget[coverage]', 0, now,
+                                       CoverageFeedback(10, True).to_bytes()))
+        # coverage-like feedback from another source is not taken for coverage
+        for ind in population[2:]:
+            ind.feedback.append(('TestProbe', 0, now, CoverageFeedback(1000, True).to_bytes()))
+        self.assertIsNone(population._analyze_feedback(population[2].feedback)[1])
+        self.assertEqual(population._analyze_feedback(population[1].feedback)[1].edges, 10)
+
+        population._compute_scores()
+        population._compute_probability_of_survival()
+        population._compute_energy()
+        scores = [ind.score for ind in population[:]]
+        self.assertEqual(len(set(scores[2:])), 1)
+        self.assertGreater(min(scores[:2]), scores[2])
+        self.assertEqual([ind.energy for ind in population[2:]], [1] * 4)
+        self.assertEqual(max(ind.energy for ind in population[:2]), 3)
+
+        # the individuals with energy fill the room left by the killed ones
+        del population[5]
+        del population[4]
+        seeds = [ind.data for ind in population[:]]
+        population._mutate()
+        self.assertEqual(len(population), 6)
+        for ind, seed in zip(population[:], seeds):
+            self.assertIsNot(ind.data, seed)
+
 
 class TestConstBackend(unittest.TestCase):
     @classmethod
@@ -26,3 +26,4 @@ __all__ = []
 from test.unit.test_node import *
 from test.unit.test_node_builder import *
 from test.unit.test_monitor import *
+from test.unit.test_targets import *
@@ -21,11 +21,17 @@
 #
 ################################################################################
 
+import copy
+import mmap
+import random
+import tempfile
 import unittest
 import ddt
 from test import mock
 
 from framework.node import *
+from framework.data import Data
+import framework.value_types as vt
 
 @ddt.ddt
 class TestBitFieldCondition(unittest.TestCase):
@@ -81,3 +87,565 @@ class TestBitFieldCondition(unittest.TestCase):
     @ddt.unpack
     def test_invalid_with_both_arguments(self, sf, val, neg_val):
         self.assertRaises(Exception, BitFieldCondition, sf=sf, val=val, neg_val=neg_val)
+
+
+class TestNodeBytesCache(unittest.TestCase):
+
+    def setUp(self):
+        self.a = Node('a', values=['AA'])
+        self.b = Node('b', values=['BB', 'CC'])
+        self.c = Node('c', values=['XX', 'YY'])
+        self.sub = Node('sub', subnodes=[self.a, self.b])
+        self.top = Node('top', subnodes=[self.sub, self.c])
+        self.top.set_env(Env())
+        self.top.make_determinist(all_conf=True, recursive=True)
+
+    def test_cached_value(self):
+        self.assertEqual(self.top.to_bytes(), b'AABBXX')
+        self.assertEqual(self.top._bytes_cache, b'AABBXX')
+        self.assertEqual(self.sub._bytes_cache, b'AABB')
+
+        self.top.env.bytes_cache_enabled = False
+        self.assertEqual(self.top.to_bytes(), b'AABBXX')
+
+    def test_dirty_path_invalidation(self):
+        self.top.to_bytes()
+
+        self.b.unfreeze()
+        self.assertIsNone(self.b._bytes_cache)
+        self.assertIsNone(self.sub._bytes_cache)
+        self.assertIsNone(self.top._bytes_cache)
+        self.assertEqual(self.a._bytes_cache, b'AA')
+        self.assertEqual(self.c._bytes_cache, b'XX')
+
+        self.assertEqual(self.top.to_bytes(), b'AACCXX')
+
+        self.a.set_frozen_value(b'ZZ')
+        self.assertEqual(self.top.to_bytes(), b'ZZCCXX')
+        self.assertEqual(self.sub.to_bytes(), b'ZZCC')
+
+        self.c.absorb(b'YY')
+        self.assertEqual(self.top.to_bytes(), b'ZZCCYY')
+
+    def test_node_internals_changes(self):
+        self.top.to_bytes()
+
+        # changes performed directly on the node internals
+        self.b.cc.import_value_type(vt.String(values=['DD']))
+        self.assertIsNone(self.top._bytes_cache)
+        self.b.cc.unfreeze()
+        self.assertEqual(self.top.to_bytes(), b'AADDXX')
+
+        self.c.cc._set_frozen_value(b'ZZ')
+        self.assertEqual(self.top.to_bytes(), b'AADDZZ')
+
+        self.sub.cc.custo.full_combinatory_mode = True
+        self.assertIsNone(self.sub._bytes_cache)
+        self.assertEqual(self.top.to_bytes(), b'AADDZZ')
+        self.sub.cc.customize(NonTermCusto(items_to_set=NonTermCusto.CollapsePadding))
+        self.assertIsNone(self.top._bytes_cache)
+        self.assertEqual(self.top.to_bytes(), b'AADDZZ')
+
+        self.a.cc.set_attr(NodeInternals.DISABLED)
+        self.assertIsNone(self.top._bytes_cache)
+        self.assertEqual(self.top.to_bytes(), b'DDZZ')
+
+    def test_segments(self):
+        self.assertEqual(self.top.to_segments(), [b'AA', b'BB', b'XX'])
+        self.assertEqual(self.top.to_bytes(), b'AABBXX')
+        # the cached value is provided as is
+        self.assertEqual(self.top.to_segments(), [b'AABBXX'])
+
+        self.b.unfreeze()
+        self.assertEqual(self.top.to_segments(), [b'AA', b'CC', b'XX'])
+        self.assertIsNone(self.top._bytes_cache)
+        self.assertEqual(self.top.to_bytes(), b'AACCXX')
+
+        self.top.env.bytes_cache_enabled = False
+        self.top.unfreeze(recursive=True)
+        self.assertEqual(b''.join(self.top.to_segments()), self.top.to_bytes())
+
+    def test_unfrozen_subtree(self):
+        self.top.to_bytes()
+        self.sub.unfreeze(recursive=True)
+        self.assertEqual(self.top.to_bytes(), b'AACCXX')
+        self.top.unfreeze(recursive=True)
+        self.assertEqual(self.top.to_bytes(), b'AABBYY')
+
+        self.top.env.bytes_cache_enabled = False
+        self.assertEqual(self.top.to_bytes(), b'AABBYY')
+
+
+class TestNodeAttributes(unittest.TestCase):
+
+    def setUp(self):
+        self.a = Node('a', values=['AA', 'BB'])
+        self.b = Node('b', values=['CC'])
+        self.top = Node('top', subnodes=[self.a, self.b])
+        self.top.set_env(Env())
+
+    def test_default_attributes(self):
+        self.assertTrue(self.a.is_attr_set(NodeInternals.Freezable))
+        self.assertTrue(self.a.is_attr_set(NodeInternals.Mutable))
+        self.assertFalse(self.a.is_attr_set(NodeInternals.Highlight))
+        self.assertFalse(self.a.is_attr_set(NodeInternals.DISABLED))
+        self.assertRaises(ValueError, self.a.cc.is_attr_set, 42)
+        self.assertRaises(ValueError, self.a.cc.set_attr, 42)
+
+        # attributes which are not part of the node slots are still supported
+        self.a.extra_info = 'info'
+        self.assertEqual(self.a.extra_info, 'info')
+
+    def test_set_and_clear(self):
+        self.a.set_attr(NodeInternals.Highlight)
+        self.a.clear_attr(NodeInternals.Mutable)
+        self.assertTrue(self.a.is_attr_set(NodeInternals.Highlight))
+        self.assertFalse(self.a.is_attr_set(NodeInternals.Mutable))
+        self.assertTrue(self.a.is_attr_set(NodeInternals.Freezable))
+        self.assertFalse(self.b.is_attr_set(NodeInternals.Highlight))
+
+        attrs = self.a.cc.get_attrs_copy()
+        self.a.clear_attr(NodeInternals.Highlight)
+        self.a.cc.set_attrs_from(attrs)
+        self.assertTrue(self.a.is_attr_set(NodeInternals.Highlight))
+
+    def test_clone(self):
+        self.a.set_attr(NodeInternals.Highlight)
+        for cow in (False, True):
+            clone = self.top.get_clone(cow=cow)
+            a = clone['top/a$'][0]
+            self.assertTrue(a.is_attr_set(NodeInternals.Highlight))
+            a.clear_attr(NodeInternals.Highlight)
+            self.assertFalse(a.is_attr_set(NodeInternals.Highlight))
+            self.assertTrue(self.a.is_attr_set(NodeInternals.Highlight))
+
+
+class TestNodeCowClone(unittest.TestCase):
+
+    def setUp(self):
+        self.a = Node('a', values=['AA'])
+        self.b = Node('b', values=['BB', 'CC'])
+        self.c = Node('c', values=['XX', 'YY'])
+        self.d = Node('d', values=['11', '22'])
+        self.sub1 = Node('sub1', subnodes=[self.a, self.b])
+        self.sub2 = Node('sub2', subnodes=[self.c, self.d])
+        self.top = Node('top', subnodes=[self.sub1, self.sub2])
+        self.top.set_env(Env())
+        self.top.make_determinist(all_conf=True, recursive=True)
+        self.top.freeze()
+
+    def test_same_value_as_regular_clone(self):
+        clone = self.top.get_clone(cow=True)
+        self.assertEqual(clone.to_bytes(), b'AABBXX11')
+        self.assertEqual(clone.to_bytes(), self.top.get_clone().to_bytes())
+        clone.unfreeze(recursive=True)
+        self.assertEqual(clone.to_bytes(), b'AACCYY22')
+        self.assertEqual(self.top.to_bytes(), b'AABBXX11')
+
+    def test_base_node_change(self):
+        clone = self.top.get_clone(cow=True)
+        self.b.unfreeze()
+        self.c.set_frozen_value(b'ZZ')
+        self.assertEqual(self.top.to_bytes(), b'AACCZZ11')
+        self.assertEqual(clone.to_bytes(), b'AABBXX11')
+
+    def test_base_node_internals_change(self):
+        self.top.to_bytes()
+        clone = self.top.get_clone(cow=True)
+        # changes performed directly on the node internals, as some disruptors do
+        self.b.cc.import_value_type(vt.String(values=['DD']))
+        self.b.cc.unfreeze()
+        self.c.cc._set_frozen_value(b'ZZ')
+        self.d.cc.set_attr(NodeInternals.DISABLED)
+        self.assertEqual(self.top.to_bytes(), b'AADDZZ')
+        self.assertEqual(clone.to_bytes(), b'AABBXX11')
+
+        clone.unfreeze(recursive=True)
+        self.assertEqual(clone.to_bytes(), b'AACCYY22')
+
+    def test_clone_change(self):
+        clone = self.top.get_clone(cow=True)
+        clone['top/sub2/c$'][0].set_frozen_value(b'ZZ')
+        self.assertEqual(clone.to_bytes(), b'AABBZZ11')
+        self.assertEqual(self.top.to_bytes(), b'AABBXX11')
+        self.assertEqual(self.c.to_bytes(), b'XX')
+
+    def test_lazy_copy(self):
+        self.top.to_bytes()
+        clone = self.top.get_clone(cow=True)
+        self.a.set_frozen_value(b'ZZ')
+        self.assertEqual(self.top.to_bytes(), b'ZZBBXX11')
+
+        # the serialized value of the base node is reused
+        self.assertEqual(clone.to_bytes(), b'AABBXX11')
+        self.assertIn('_cow_ctx', clone.__dict__)
+
+        # only the accessed nodes are copied
+        sub1, sub2 = clone.cc.frozen_node_list
+        self.assertNotIn('_cow_ctx', clone.__dict__)
+        self.assertEqual(sub1.cc.frozen_node_list[0].to_bytes(), b'AA')
+        self.assertIn('_cow_ctx', sub2.__dict__)
+
+    def test_pinned_data_value(self):
+        data = Data(self.top.get_clone(cow=True))
+        self.assertEqual(b''.join(data.pin_value()), b'AABBXX11')
+        self.assertTrue(data.is_value_pinned())
+        self.assertEqual(data.to_bytes(), b'AABBXX11')
+        self.assertEqual(data.to_segments(), list(data.pin_value()))
+        self.assertFalse(copy.copy(data).is_value_pinned())
+
+        data.content['top/sub2/c$'][0].set_frozen_value(b'ZZ')
+        self.assertEqual(data.to_bytes(), b'AABBXX11')
+        data.unpin_value()
+        self.assertFalse(data.is_value_pinned())
+        self.assertEqual(data.to_bytes(), b'AABBZZ11')
+
+
+class TestNodePathIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.a = Node('a', values=['AA'])
+        self.b = Node('b', values=['BB', 'CC'])
+        self.c = Node('c', values=['XX', 'YY'])
+        self.gen = Node('gen')
+        self.gen.set_generator_func(lambda: Node('g', values=['GG']))
+        self.sub = Node('sub', subnodes=[self.a, self.b])
+        self.top = Node('top', subnodes=[self.sub, self.c, self.gen])
+        self.top.set_env(Env())
+        self.top.make_determinist(all_conf=True, recursive=True)
+        self.top.freeze()
+
+    def test_index_reused(self):
+        self.assertEqual(self.b.get_path_from(self.top), 'top/sub/b')
+        htable = self.top._paths_htable
+
+        self.b.unfreeze()
+        self.c.set_frozen_value(b'ZZ')
+        self.assertEqual(self.top.to_bytes(), b'AACCZZGG')
+        self.assertEqual(self.c.get_path_from(self.top), 'top/c')
+        self.assertIs(self.top._paths_htable, htable)
+
+    def test_generated_node(self):
+        g1 = self.top['top/gen/g$'][0]
+        htable = self.top._paths_htable
+
+        self.gen.unfreeze()
+        self.top.freeze()
+        g2 = self.gen.cc.generated_node
+        self.assertIsNot(g1, g2)
+        self.assertEqual(g2.get_path_from(self.top), 'top/gen/g')
+        self.assertIsNone(g1.get_path_from(self.top))
+        self.assertIs(self.top._paths_htable, htable)
+
+    def test_structure_change(self):
+        self.assertEqual(self.a.get_path_from(self.top), 'top/sub/a')
+
+        self.sub.set_subnodes_basic([self.b])
+        self.assertIsNone(self.a.get_path_from(self.top))
+        self.assertEqual(self.b.get_path_from(self.top), 'top/sub/b')
+
+        self.top.cc.add(self.a)
+        self.assertEqual(self.a.get_path_from(self.top), 'top/a')
+
+    def test_alternate_conf(self):
+        self.sub.add_conf('ALT')
+        self.sub.set_values(['ZZ'], conf='ALT')
+        self.assertEqual(self.a.get_path_from(self.top), 'top/sub/a')
+
+        self.top.set_current_conf('ALT')
+        self.assertIsNone(self.a.get_path_from(self.top))
+        self.assertEqual(self.sub.get_path_from(self.top), 'top/sub')
+
+        self.top.set_current_conf('MAIN')
+        self.assertEqual(self.a.get_path_from(self.top), 'top/sub/a')
+
+
+class TestNodeReachableNodes(unittest.TestCase):
+
+    def setUp(self):
+        self.a = Node('a', values=['AA'])
+        self.b = Node('b', values=['BB', 'CC'])
+        self.c = Node('c', values=['XX', 'YY'])
+        self.gen = Node('gen')
+        self.gen.set_generator_func(lambda: Node('g', values=['GG']))
+        self.sub = Node('sub', subnodes=[self.a, self.b])
+        self.top = Node('top', subnodes=[self.sub, self.c, self.gen])
+        self.top.set_env(Env())
+        self.top.make_determinist(all_conf=True, recursive=True)
+        self.top.freeze()
+        self.g = self.gen.cc.generated_node
+
+    def test_order(self):
+        nodes = [self.top, self.sub, self.a, self.b, self.c, self.gen, self.g]
+        self.assertEqual(self.top.get_reachable_nodes(respect_order=True), nodes)
+        self.assertEqual(list(self.top.iter_reachable_nodes()), nodes)
+        self.assertEqual(list(self.top.iter_reachable_nodes(exclude_self=True)), nodes[1:])
+        self.assertEqual(set(self.top.get_reachable_nodes()), set(nodes))
+
+    def test_relative_depth(self):
+        x = Node('x', subnodes=[self.a])
+        y = Node('y', subnodes=[x])
+        root = Node('root', subnodes=[y, x])
+        root.set_env(Env())
+        root.freeze()
+
+        self.assertEqual(root.get_reachable_nodes(relative_depth=1, respect_order=True),
+                         [root, y, x])
+        # 'x' is reached again with more depth left through 'root'
+        self.assertEqual(root.get_reachable_nodes(relative_depth=2, respect_order=True),
+                         [root, y, x, self.a])
+
+    def test_criteria(self):
+        ic = NodeInternalsCriteria(mandatory_attrs=[NodeInternals.Mutable],
+                                   node_kinds=[NodeInternals_Term])
+        self.b.set_semantics(['sem1', 'sem2'])
+        self.c.set_semantics('sem1')
+        sc = NodeSemanticsCriteria(mandatory_criteria='sem1')
+
+        self.assertEqual(list(self.top.iter_reachable_nodes(internals_criteria=ic)),
+                         [self.a, self.b, self.c, self.g])
+        self.assertEqual(list(self.top.iter_reachable_nodes(semantics_criteria=sc)),
+                         [self.b, self.c])
+        self.assertEqual(list(self.top.iter_reachable_nodes(path_regexp='sub/')),
+                         [self.a, self.b])
+        index = self.top._reachable_indexes[(None, False, False)]
+
+        self.b.clear_attr(NodeInternals.Mutable)
+        self.c.set_semantics('sem2')
+        self.assertEqual(list(self.top.iter_reachable_nodes(internals_criteria=ic)),
+                         [self.a, self.c, self.g])
+        self.assertEqual(list(self.top.iter_reachable_nodes(semantics_criteria=sc)),
+                         [self.b])
+        self.assertIs(self.top._reachable_indexes[(None, False, False)], index)
+
+    def test_structure_change(self):
+        self.assertIn(self.a, self.top.get_reachable_nodes())
+
+        self.sub.set_subnodes_basic([self.b])
+        self.assertNotIn(self.a, self.top.get_reachable_nodes())
+        self.assertIn(self.b, self.top.get_reachable_nodes())
+
+        self.top.cc.add(self.a)
+        self.assertIn(self.a, self.top.get_reachable_nodes())
+
+    def test_generated_node(self):
+        self.assertIn(self.g, self.top.get_reachable_nodes())
+        index = self.top._reachable_indexes[(None, False, False)]
+
+        self.gen.unfreeze()
+        self.top.freeze()
+        g2 = self.gen.cc.generated_node
+        self.assertEqual(self.top.get_reachable_nodes(respect_order=True)[-1], g2)
+        self.assertNotIn(self.g, self.top.get_reachable_nodes())
+        self.assertIs(self.top._reachable_indexes[(None, False, False)], index)
+
+        # generator nodes that are not frozen are not resolved
+        self.gen.unfreeze()
+        self.assertNotIn(g2, self.top.get_reachable_nodes())
+        self.assertIn(self.gen, self.top.get_reachable_nodes())
+        self.assertIn(self.gen.cc.generated_node,
+                      self.top.get_reachable_nodes(resolve_generator=True))
+
+
+class TestNodeStateSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.a = Node('a', values=['AA', 'BB', 'CC'])
+        self.b = Node('b', values=['11', '22', '33'])
+        self.gen = Node('gen')
+        self.gen.set_generator_func(lambda node: Node('g', values=[node.to_bytes()]),
+                                    func_node_arg=self.b)
+        self.top = Node('top', subnodes=[self.a, self.b, self.gen])
+        self.top.set_env(Env())
+        self.top.make_determinist(all_conf=True, recursive=True)
+        self.top.freeze()
+
+    def test_restore_values(self):
+        self.top.unfreeze(recursive=True)
+        self.top.freeze()
+        value = self.top.to_bytes()
+        snapshot = self.top.get_state_snapshot()
+
+        for _ in range(3):
+            self.top.unfreeze(recursive=True)
+            self.top.freeze()
+            self.assertNotEqual(self.top.to_bytes(), value)
+            self.top.restore_state_snapshot(snapshot)
+            self.assertEqual(self.top.to_bytes(), value)
+
+    def test_restore_sequence(self):
+        snapshot = self.top.get_state_snapshot()
+        values = []
+        for _ in range(3):
+            self.top.unfreeze(recursive=True)
+            values.append(self.top.to_bytes())
+
+        self.top.restore_state_snapshot(snapshot)
+        for v in values:
+            self.top.unfreeze(recursive=True)
+            self.assertEqual(self.top.to_bytes(), v)
+
+    def test_attributes(self):
+        snapshot = self.top.get_state_snapshot()
+        self.a.set_attr(NodeInternals.Highlight)
+        self.b.clear_attr(NodeInternals.Mutable)
+        self.top.restore_state_snapshot(snapshot)
+        self.assertFalse(self.a.is_attr_set(NodeInternals.Highlight))
+        self.assertTrue(self.b.is_attr_set(NodeInternals.Mutable))
+
+    def test_other_node(self):
+        snapshot = self.a.get_state_snapshot()
+        self.assertRaises(ValueError, self.top.restore_state_snapshot, snapshot)
+
+    def test_freeze_batch(self):
+        self.top.unfreeze(recursive=True)
+        self.assertEqual(self.top.freeze_batch(3), [b'BB2222'] * 3)
+        self.assertEqual(self.top.to_bytes(), b'BB2222')
+
+        self.top.unfreeze(recursive=True)
+        variants = self.top.freeze_batch(2, as_nodes=True)
+        self.assertIsNot(variants[0], variants[1])
+        self.assertEqual([v.to_bytes() for v in variants], [b'CC3333'] * 2)
+
+    def test_freeze_batch_random(self):
+        self.top.make_random(all_conf=True, recursive=True)
+
+        for as_nodes in (False, True):
+            self.top.reset_state(recursive=True)
+            # the variants shall be the ones that copies of the node would provide
+            random.seed(7)
+            expected = [self.top.get_clone().to_bytes() for _ in range(6)]
+            self.assertGreater(len(set(expected)), 1)
+            random.seed(7)
+            variants = self.top.freeze_batch(6, as_nodes=as_nodes)
+            if as_nodes:
+                self.assertEqual([v.to_bytes() for v in variants], expected)
+            else:
+                self.assertEqual(variants, expected)
+
+        # the variants are independent from each other and from the node
+        variants[0]['top/a$'][0].set_frozen_value(b'XX')
+        self.assertEqual(variants[0].to_bytes(), b'XX' + expected[0][2:])
+        self.assertEqual([v.to_bytes() for v in variants[1:]], expected[1:])
+        self.assertEqual(self.top.to_bytes(), expected[-1])
+        self.top.unfreeze(recursive=True)
+        self.assertEqual([v.to_bytes() for v in variants], [b'XX' + expected[0][2:]] + expected[1:])
+
+
+class TestNodeCompile(unittest.TestCase):
+
+    def setUp(self):
+        self.h1 = Node('h1', values=['HH'])
+        self.h2 = Node('h2', vt=vt.UINT8(values=[1]))
+        self.header = Node('header', subnodes=[self.h1, self.h2])
+        self.a = Node('a', values=['AA', 'BB', 'CC'])
+        self.top = Node('top', subnodes=[self.header, self.a])
+        self.top.set_env(Env())
+        self.top.make_determinist(all_conf=True, recursive=True)
+
+    def test_static_subtrees(self):
+        self.assertEqual(self.top.compile(), 3)
+        self.assertIsNotNone(self.h1._static_region)
+        self.assertIs(self.h1._static_region.root, self.header)
+        self.assertIsNone(self.a._static_region)
+        self.assertIsNone(self.top._static_region)
+
+        self.assertEqual(self.top.to_bytes(), b'HH\x01AA')
+        self.top.unfreeze(recursive=True)
+        self.assertEqual(self.top.to_bytes(), b'HH\x01BB')
+        self.top.unfreeze_all()
+        self.assertEqual(self.top.to_bytes(), b'HH\x01CC')
+
+    def test_change_within_static_subtree(self):
+        self.top.compile()
+        self.h2.set_frozen_value(b'\x02')
+        self.assertIsNone(self.h2._static_region.value)
+        self.assertEqual(self.top.to_bytes(), b'HH\x02AA')
+        self.top.unfreeze(recursive=True)
+        self.assertEqual(self.top.to_bytes(), b'HH\x01BB')
+
+        self.top.compile()
+        self.top.env.add_node_to_corrupt(self.h1)
+        self.assertIsNone(self.h1._static_region.value)
+
+    def test_clone(self):
+        self.top.compile()
+        clone = self.top.get_clone()
+        self.assertIsNone(clone['top/header$'][0]._static_region)
+        self.assertEqual(clone.to_bytes(), self.top.to_bytes())
+
+
+class TestNodeAbsorptionMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.opt = Node('opt', subnodes=[Node('o1', values=['OPT']), Node('o2', values=['!'])])
+        end_a = Node('endA', values=['A'])
+        end_b = Node('endB', values=['B'])
+        self.top = Node('top')
+        self.top.set_subnodes_with_csts([
+            2, ['u>', [self.opt, 0, 1], [end_a, 1]],
+            1, ['u>', [self.opt, 0, 1], [end_b, 1]]
+        ])
+        self.top.set_env(Env())
+
+    def test_memoized_rejection(self):
+        profiler = AbsorptionProfiler()
+        status, off, size, name = self.top.absorb(b'OPT?B', constraints=AbsFullCsts(),
+                                                  profiler=profiler)
+        self.assertEqual(status, AbsorbStatus.Reject)
+        status, off, size, name = self.top.absorb(b'B', constraints=AbsFullCsts(),
+                                                  profiler=profiler)
+        self.assertEqual(status, AbsorbStatus.FullyAbsorbed)
+        self.assertEqual(self.top.to_bytes(), b'B')
+
+        attempts, rejected, memoized, _ = profiler.stats['opt']
+        self.assertEqual((attempts, rejected, memoized), (4, 4, 2))
+        self.assertIn('opt', profiler.get_report())
+
+    def test_memo_disabled(self):
+        self.top.env.absorption_memo_enabled = False
+        profiler = AbsorptionProfiler()
+        status, off, size, name = self.top.absorb(b'B', constraints=AbsFullCsts(),
+                                                  profiler=profiler)
+        self.assertEqual(status, AbsorbStatus.FullyAbsorbed)
+        self.assertEqual(profiler.stats['opt'][2], 0)
+
+
+class TestNodeAbsorptionBuffers(unittest.TestCase):
+
+    def setUp(self):
+        self.data = b'HDR\x00\x2a\xc3abc;PAYLOAD'
+        self.top = Node('top', subnodes=[
+            Node('hdr', values=['HDR']),
+            Node('len', vt=vt.UINT16_be()),
+            Node('flags', vt=vt.BitField(subfield_sizes=[4, 4], endian=vt.VT.BigEndian)),
+            Node('name', vt=vt.String(alphabet='abc', min_sz=1, max_sz=10)),
+            Node('sep', values=[';']),
+            Node('payload', vt=vt.String(max_sz=20))
+        ])
+        self.top.set_env(Env())
+
+    def _check_absorption(self, buff):
+        status, off, size, name = self.top.absorb(buff, constraints=AbsFullCsts())
+        self.assertEqual(status, AbsorbStatus.FullyAbsorbed)
+        self.assertEqual(size, len(self.data))
+        self.assertEqual(self.top.to_bytes(), self.data)
+        self.assertEqual(self.top['top/len$'][0].get_raw_value(), 42)
+        self.assertIsInstance(self.top['top/payload$'][0].to_bytes(), bytes)
+
+    def test_bytearray(self):
+        self._check_absorption(bytearray(self.data))
+
+    def test_memoryview(self):
+        self._check_absorption(memoryview(b'XX' + self.data)[2:])
+
+    def test_mmap(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(self.data)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self._check_absorption(m)
+            # no view on the mapping remains after the absorption,
+            # otherwise closing it would have failed
+            self.assertTrue(m.closed)
+
@@ -0,0 +1,592 @@
+################################################################################
+#
+#  Copyright 2014-2016 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import asyncio
+import datetime
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+from framework.coverage import CoverageFeedback, VirginMap, virgin_map
+from framework.data import Data
+from framework.node import Env, Node
+from framework.target_helpers import IOV_MAX, PayloadFile, Target
+from framework.targets.local import LocalTarget, PooledLocalTarget
+from framework.targets.network import AsyncNetworkTarget, NetworkTarget
+from test import mock
+
+# Program understanding the fork server protocol, which fails on b'error', crashes on b'crash'
+# and takes its time on b'sleep'. Its coverage is one edge per distinct byte of the test case.
+FORK_SERVER_PROG = '''
+import ctypes
+import os
+import signal
+import struct
+import sys
+import time
+
+FORKSRV_FD = 198
+
+def record_coverage(data):
+    shm_id = os.environ.get('__AFL_SHM_ID')
+    if shm_id is None:
+        return
+    libc = ctypes.CDLL(None)
+    libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+    libc.shmat.restype = ctypes.c_void_p
+    bitmap = (ctypes.c_ubyte * 65536).from_address(libc.shmat(int(shm_id), None, 0))
+    for b in data:
+        bitmap[b] = min(bitmap[b] + 1, 255)
+
+def run():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as f:
+            data = f.read()
+    else:
+        data = sys.stdin.buffer.read()
+    record_coverage(data)
+    if b'sleep' in data:
+        time.sleep(0.3)
+    if b'crash' in data:
+        os.kill(os.getpid(), signal.SIGSEGV)
+    elif b'error' in data:
+        sys.stderr.write('parsing error')
+        sys.exit(1)
+    sys.stdout.write('parsed ' + data.decode())
+    sys.exit(0)
+
+if len(sys.argv) > 2 and sys.argv[2] == 'no_fork_server':
+    run()
+
+os.write(FORKSRV_FD + 1, struct.pack('I', 0))
+while True:
+    if len(os.read(FORKSRV_FD, 4)) != 4:
+        sys.exit(0)
+    pid = os.fork()
+    if pid == 0:
+        os.close(FORKSRV_FD)
+        os.close(FORKSRV_FD + 1)
+        run()
+    os.write(FORKSRV_FD + 1, struct.pack('I', pid))
+    _, status = os.waitpid(pid, 0)
+    os.write(FORKSRV_FD + 1, struct.pack('I', status))
+'''
+
+
+class TestLocalTarget(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.prog_path = tempfile.mkstemp(suffix='.py')
+        with os.fdopen(fd, 'w') as f:
+            f.write(FORK_SERVER_PROG)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.prog_path)
+
+    def _get_target(self, **kwargs):
+        tg = LocalTarget(target_path=sys.executable, pre_args=self.prog_path, **kwargs)
+        self.assertTrue(tg.start())
+        self.addCleanup(tg.stop)
+        return tg
+
+    def _send(self, tg, content):
+        tg.send_data(Data(content))
+        fbk = tg.get_feedback(timeout=5)
+        result = fbk.get_error_code(), fbk.get_bytes(), \
+                 sorted(status for _, _, status, _ in fbk.iter_and_cleanup_collector())
+        fbk.cleanup()
+        tg.cleanup()
+        return result
+
+    def test_feedback(self):
+        for send_via_stdin in (False, True):
+            tg = self._get_target(fork_server=True, send_via_stdin=send_via_stdin)
+            for _ in range(3):
+                self.assertEqual(self._send(tg, b'abc'), (0, b'parsed abc', [0]))
+                self.assertEqual(self._send(tg, b'an error'), (-1, b'\n\nparsing error', [-2, -1]))
+                self.assertEqual(self._send(tg, b'crash'), (-1, b'', [-3]))
+
+    def test_fork_server_restart(self):
+        tg = self._get_target(fork_server=True)
+        server_pid = tg._app.pid
+        tg._app.kill()
+        tg._app.wait()
+        self.assertEqual(self._send(tg, b'abc'), (0, b'parsed abc', [0]))
+        self.assertNotEqual(tg._app.pid, server_pid)
+
+    def test_fork_server_fds(self):
+        r, w = os.pipe()
+        self.addCleanup(os.close, r)
+        self.addCleanup(os.close, w)
+        os.set_inheritable(w, True)
+        tg = self._get_target(fork_server=True)
+        fds = {int(fd) for fd in os.listdir(f'/proc/{tg._app.pid}/fd')}
+        # only the standard streams and the fork server pipes are inherited
+        self.assertEqual(fds, {0, 1, 2, 198, 199})
+        self.assertEqual(self._send(tg, b'abc'), (0, b'parsed abc', [0]))
+
+    def test_no_fork_server(self):
+        tg = LocalTarget(target_path=sys.executable, pre_args=self.prog_path,
+                         post_args='no_fork_server', fork_server=True, fork_server_timeout=0.5)
+        self.assertFalse(tg.start())
+        self.assertRaises(ValueError, LocalTarget, send_via_cmdline=True, fork_server=True)
+
+    def test_exit_detection(self):
+        open_pidfd = LocalTarget._open_pidfd
+        for pidfd_support in (True, False):
+            with mock.patch.object(LocalTarget, '_open_pidfd',
+                                   side_effect=open_pidfd if pidfd_support else lambda pid: None):
+                tg = self._get_target(post_args='no_fork_server')
+                t0 = datetime.datetime.now()
+                self.assertEqual(self._send(tg, b'abc'), (0, b'parsed abc', [0]))
+                self.assertEqual(self._send(tg, b'an error'), (-1, b'\n\nparsing error', [-2, -1]))
+                self.assertEqual(self._send(tg, b'crash'), (-1, b'', [-3]))
+                # the feedback timeout (5s) is not waited for
+                self.assertLess((datetime.datetime.now() - t0).total_seconds(), 5)
+
+        tg = self._get_target(post_args='no_fork_server')
+        tg.send_data(Data(b'sleep'))
+        fbk = tg.get_feedback(timeout=0.05)
+        self.assertEqual((fbk.get_error_code(), list(fbk.iter_and_cleanup_collector())), (0, []))
+        tg.cleanup()
+
+    def test_coverage(self):
+        for kwargs in (dict(post_args='no_fork_server'), dict(fork_server=True)):
+            virgin_map.reset()
+            tg = self._get_target(coverage=True, **kwargs)
+            # content, edges hit, new coverage
+            expected = [(b'abc', 3, True), (b'cba', 3, False), (b'abcd', 4, True),
+                        (b'aabc', 3, True), (b'aabc', 3, False), (b'bbaa', 2, True)]
+            for content, edges, new_coverage in expected:
+                tg.send_data(Data(content))
+                fbk = tg.get_feedback(timeout=5)
+                cov_fbk = [CoverageFeedback.from_bytes(f[0]) for ref, f, _, _ in fbk.iter_and_cleanup_collector()
+                           if ref == 'LocalTarget[coverage]']
+                self.assertEqual(cov_fbk, [CoverageFeedback(edges, new_coverage)])
+                self.assertEqual(tg.last_coverage, CoverageFeedback(edges, new_coverage))
+                fbk.cleanup()
+                tg.cleanup()
+        self.assertIsNone(CoverageFeedback.from_bytes(b'parsed abc'))
+
+    def test_in_memory_file(self):
+        configs = [dict(post_args='no_fork_server'),
+                   dict(fork_server=True),
+                   dict(fork_server=True, send_via_stdin=True)]
+        for kwargs in configs:
+            tg = self._get_target(in_memory_file=True, **kwargs)
+            self.assertFalse(os.path.exists(tg._get_testcase_path()))
+            for _ in range(3):
+                for content in (b'a longer content', b'abc'):
+                    self.assertEqual(self._send(tg, content), (0, b'parsed ' + content, [0]))
+            self.assertFalse(os.path.exists(tg._get_testcase_path()))
+
+
+class TestVirginMap(unittest.TestCase):
+
+    def test_known_traces(self):
+        vmap = VirginMap(size=16, max_known_traces=2)
+        traces = [bytes([1, 0, 2] + [0] * 13), bytes([0, 3] + [0] * 14), bytes([1, 0, 3] + [0] * 13)]
+        # bitmap, edges hit, new coverage
+        expected = [(traces[0], 2, True), (traces[1], 1, True), (traces[0], 2, False),
+                    (traces[2], 2, True), (traces[1], 1, False), (bytes([4] + [0] * 15), 1, True),
+                    (traces[2], 2, False)]
+        for trace, edges, new_coverage in expected:
+            self.assertEqual(vmap.update(trace), CoverageFeedback(edges, new_coverage))
+            self.assertLessEqual(len(vmap._known_traces), 2)
+
+        vmap.reset()
+        self.assertEqual(vmap.update(traces[1]), CoverageFeedback(1, True))
+
+
+class TestPayloadFile(unittest.TestCase):
+
+    def test_segments(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        f = PayloadFile(path)
+        self.addCleanup(f.close)
+
+        segments = [b'%d,' % i for i in range(IOV_MAX * 2 + 10)] + [b'', b'end']
+        f.write(segments)
+        with open(path, 'rb') as g:
+            self.assertEqual(g.read(), b''.join(segments))
+        f.write([b'sh', b'ort'])
+        with open(path, 'rb') as g:
+            self.assertEqual(g.read(), b'short')
+
+
+class TestStateChangeNotification(unittest.TestCase):
+
+    def test_overridden_methods(self):
+        class PolledNetworkTarget(NetworkTarget):
+            def is_feedback_received(self):
+                return True
+
+        class NotifyingNetworkTarget(PolledNetworkTarget):
+            state_change_notification = True
+
+        tg = NetworkTarget()
+        self.assertTrue(tg.is_state_change_notified('is_feedback_received'))
+        self.assertTrue(tg.is_state_change_notified('is_target_ready_for_new_data'))
+
+        tg = PolledNetworkTarget()
+        self.assertFalse(tg.is_state_change_notified('is_feedback_received'))
+        self.assertTrue(tg.is_state_change_notified('is_target_ready_for_new_data'))
+
+        tg = NotifyingNetworkTarget()
+        self.assertTrue(tg.is_state_change_notified('is_feedback_received'))
+
+        self.assertFalse(Target().is_state_change_notified('is_feedback_received'))
+        self.assertTrue(PooledLocalTarget(target_path='true').is_state_change_notified(
+            'is_target_ready_for_new_data'))
+
+        tg = NetworkTarget()
+        tg.state_change_notification = False
+        self.assertFalse(tg.is_state_change_notified('is_target_ready_for_new_data'))
+
+
+class TestPooledLocalTarget(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.prog_path = tempfile.mkstemp(suffix='.py')
+        with os.fdopen(fd, 'w') as f:
+            f.write(FORK_SERVER_PROG)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.prog_path)
+
+    def _run(self, contents, **kwargs):
+        tg = PooledLocalTarget(target_path=sys.executable, pre_args=self.prog_path, pool_size=4, **kwargs)
+        tg.set_logger(mock.Mock())
+        self.assertTrue(tg.start())
+        try:
+            sent = []
+            for c in contents:
+                while not tg.is_target_ready_for_new_data():
+                    tg.wait_for_state_change(tg.get_state_version(), 0.1)
+                d = Data(c)
+                tg.send_data(d)
+                sent.append(d)
+        finally:
+            # wait for the test cases in progress
+            tg.stop()
+
+        fbk = {}
+        for call in tg._logger.collect_feedback.call_args_list:
+            fbk.setdefault(call.kwargs['related_data'], []).append(
+                (call.kwargs['content'], call.kwargs['status_code']))
+        return sent, fbk
+
+    def test_feedback(self):
+        for kwargs in ({'post_args': 'no_fork_server'}, {'fork_server': True}):
+            contents = [b'ok %d' % i for i in range(10)] + [b'an error', b'crash']
+            sent, fbk = self._run(contents, **kwargs)
+            self.assertEqual(len(fbk), len(sent))
+            for d in sent:
+                content = d.to_bytes()
+                if content == b'crash':
+                    self.assertIn(-3, [status for _, status in fbk[d]])
+                elif content == b'an error':
+                    self.assertIn(-2, [status for _, status in fbk[d]])
+                else:
+                    self.assertIn(b'parsed ' + content, [c for c, _ in fbk[d]])
+
+    def test_concurrency(self):
+        t0 = datetime.datetime.now()
+        sent, fbk = self._run([b'sleep'] * 8, fork_server=True)
+        duration = (datetime.datetime.now() - t0).total_seconds()
+        self.assertEqual(len(fbk), 8)
+        # 2 rounds of 4 concurrent test cases
+        self.assertLess(duration, 8 * 0.3)
+
+    def test_data_serialized_by_caller(self):
+        serializing_threads = []
+        to_segments = Data.to_segments
+
+        def _to_segments(data):
+            serializing_threads.append(threading.current_thread())
+            return to_segments(data)
+
+        with mock.patch.object(Data, 'to_segments', _to_segments):
+            sent, fbk = self._run([b'ok %d' % i for i in range(6)], fork_server=True)
+        self.assertEqual(len(fbk), 6)
+        self.assertEqual(set(serializing_threads), {threading.current_thread()})
+
+
+class TestNetworkTarget(unittest.TestCase):
+
+    def setUp(self):
+        # echo server recording the connection through which each data is received
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('localhost', 0))
+        self.server.listen(10)
+        self.addCleanup(self.server.close)
+        self.port = self.server.getsockname()[1]
+        self.connections = []
+        self.received = {}
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections.append(conn)
+            threading.Thread(target=self._echo, args=(conn,), daemon=True).start()
+
+    def _echo(self, conn):
+        while True:
+            try:
+                data = conn.recv(1024)
+            except OSError:
+                return
+            if not data:
+                conn.close()
+                return
+            self.received[data] = conn
+            conn.sendall(b'echo ' + data)
+
+    def _send(self, tg, content):
+        tg.send_data(Data(content), from_fmk=True)
+        while not tg.is_feedback_received():
+            tg.wait_for_state_change(tg.get_state_version(), 0.1)
+        return b''.join(chunk for _, fbk, _, _ in tg.get_feedback().iter_and_cleanup_collector()
+                        for chunk in fbk)
+
+    def _get_target(self, **kwargs):
+        tg = NetworkTarget(host='localhost', port=self.port, listen_on_start=False,
+                           fbk_timeout=2, fbk_mode=Target.FBK_WAIT_UNTIL_RECV, **kwargs)
+        self.assertTrue(tg.start())
+        self.addCleanup(tg.stop)
+        return tg
+
+    def test_feedback_reactor(self):
+        tg = NetworkTarget(host='localhost', port=self.port, listen_on_start=False,
+                           fbk_timeout=2, fbk_mode=Target.FBK_WAIT_UNTIL_RECV)
+        self.assertTrue(tg.start())
+        for i in range(5):
+            self.assertEqual(self._send(tg, b'data %d' % i), b'echo data %d' % i)
+        # the feedback is collected by one long-lived thread
+        self.assertEqual([t.name for t in threading.enumerate() if t.name.startswith('FBK-')], ['FBK-Reactor'])
+
+        tg.set_feedback_mode(Target.FBK_WAIT_FULL_TIME)
+        tg.set_feedback_timeout(0.2)
+        t0 = datetime.datetime.now()
+        self.assertEqual(self._send(tg, b'data'), b'echo data')
+        self.assertGreaterEqual((datetime.datetime.now() - t0).total_seconds(), 0.2)
+
+        tg.stop()
+        self.assertFalse([t for t in threading.enumerate() if t.name.startswith('FBK-')])
+
+    def test_feedback_buffers(self):
+        tg = self._get_target()
+        tg.set_feedback_mode(Target.FBK_WAIT_FULL_TIME)
+        tg.set_feedback_timeout(0.5)
+        # bigger than the initial size of the buffer the feedback is received into
+        fbk = self._send(tg, b'x' * 200000)
+        self.assertEqual(fbk.count(b'x'), 200000)
+        self.assertEqual(len(tg._reactor_buffers), 1)
+        buf = tg._reactor_buffers[0]
+        self.assertGreater(buf.size, 200000)
+
+        # the buffer is reused by the next feedback collection
+        self.assertEqual(self._send(tg, b'data'), b'echo data')
+        self.assertEqual(tg._reactor_buffers, [buf])
+        self.assertEqual(buf.length, 0)
+
+    def test_segments(self):
+        tg = self._get_target()
+        node = Node('top', subnodes=[Node('a', values=['AA']), Node('b', values=['BB']), Node('c', values=['CC'])])
+        node.set_env(Env())
+        self.assertEqual(Data(node).to_segments(), [b'AA', b'BB', b'CC'])
+        # sent through one scatter-gather call
+        self.assertEqual(self._send(tg, node), b'echo AABBCC')
+
+    def test_burst_mode(self):
+        udp_server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_server.bind(('localhost', 0))
+        udp_server.settimeout(1)
+        self.addCleanup(udp_server.close)
+
+        tg = NetworkTarget(host='localhost', port=udp_server.getsockname()[1],
+                           socket_type=(socket.AF_INET, socket.SOCK_DGRAM), burst_mode=True,
+                           listen_on_start=False, fbk_timeout=0.1)
+        self.assertTrue(tg.start())
+        self.addCleanup(tg.stop)
+
+        contents = [b'datagram %d' % i for i in range(200)]
+        tg.send_multiple_data([Data(c) for c in contents], from_fmk=True)
+        self.assertEqual([udp_server.recv(1024) for _ in contents], contents)
+        while not tg.is_feedback_received():
+            tg.wait_for_state_change(tg.get_state_version(), 0.1)
+        fbk = [(ref, f, status) for ref, f, status, _ in tg.get_feedback().iter_and_cleanup_collector()]
+        self.assertEqual(len(fbk), 1)
+        ref, f, status = fbk[0]
+        self.assertEqual((ref, status), ('NetworkTarget()', 0))
+        self.assertTrue(f[0].startswith('Burst of 200 datagrams sent to localhost:'))
+        self.assertGreater(tg.last_burst_rate, 0)
+
+        self.assertRaises(ValueError, NetworkTarget, port=self.port, burst_mode=True)
+
+    def test_connection_pool(self):
+        for keepalive in (True, False):
+            tg = self._get_target(connection_pool=2, pool_keepalive=keepalive)
+            contents = [b'data %d' % i for i in range(6)]
+            for content in contents:
+                self.assertEqual(self._send(tg, content), b'echo ' + content)
+            used = set(self.received[c] for c in contents)
+            if keepalive:
+                self.assertLessEqual(len(used), 2)
+            else:
+                self.assertEqual(len(used), len(contents))
+
+    def test_connection_pool_health_check(self):
+        tg = self._get_target(connection_pool=1)
+        self.assertEqual(self._send(tg, b'first'), b'echo first')
+        # the server closes the idle connection, which has to be replaced
+        self.received[b'first'].shutdown(socket.SHUT_RDWR)
+        self.assertEqual(self._send(tg, b'second'), b'echo second')
+        self.assertIsNot(self.received[b'second'], self.received[b'first'])
+
+        self.assertRaises(ValueError, NetworkTarget, port=self.port, connection_pool=1, server_mode=True)
+        self.assertRaises(ValueError, NetworkTarget, port=self.port, connection_pool=1, hold_connection=True)
+
+
+class _EchoDatagramServer(asyncio.DatagramProtocol):
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        asyncio.get_running_loop().call_later(TestAsyncNetworkTarget.ECHO_DELAY,
+                                              self.transport.sendto, b'echo ' + data, addr)
+
+
+class TestAsyncNetworkTarget(unittest.TestCase):
+
+    ECHO_DELAY = 0.1
+
+    @classmethod
+    def setUpClass(cls):
+        # asyncio echo servers (TCP and UDP) answering each data after a delay
+        cls.loop = asyncio.new_event_loop()
+        cls.server = cls.loop.run_until_complete(asyncio.start_server(cls._echo, 'localhost', 0))
+        cls.port = cls.server.sockets[0].getsockname()[1]
+        cls.udp_server, _ = cls.loop.run_until_complete(cls.loop.create_datagram_endpoint(
+            _EchoDatagramServer, local_addr=('localhost', 0), family=socket.AF_INET))
+        cls.udp_port = cls.udp_server.get_extra_info('sockname')[1]
+        cls.loop_thread = threading.Thread(target=cls.loop.run_forever)
+        cls.loop_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.loop_thread.join()
+        cls.server.close()
+        cls.udp_server.close()
+        cls.loop.close()
+
+    @staticmethod
+    async def _echo(reader, writer):
+        while True:
+            data = await reader.read(1024)
+            if not data:
+                break
+            await asyncio.sleep(TestAsyncNetworkTarget.ECHO_DELAY)
+            writer.write(b'echo ' + data)
+        writer.close()
+
+    def _run(self, sessions, **kwargs):
+        tg = AsyncNetworkTarget(host='localhost', fbk_timeout=2, fbk_mode=Target.FBK_WAIT_UNTIL_RECV,
+                                **kwargs)
+        tg.set_logger(mock.Mock())
+        self.assertTrue(tg.start())
+        try:
+            sent = []
+            for contents in sessions:
+                while not tg.is_target_ready_for_new_data():
+                    tg.wait_for_state_change(tg.get_state_version(), 0.1)
+                data_list = [Data(c) for c in contents]
+                tg.send_multiple_data(data_list)
+                sent.append(data_list)
+        finally:
+            # wait for the sessions in progress
+            tg.stop()
+
+        fbk = {}
+        for call in tg._logger.collect_feedback.call_args_list:
+            fbk.setdefault(call.kwargs['related_data'], []).append(
+                (call.kwargs['content'], call.kwargs['status_code'], call.kwargs['subref']))
+        return sent, fbk
+
+    def test_sessions(self):
+        for socket_type, port in (((socket.AF_INET, socket.SOCK_STREAM), self.port),
+                                  ((socket.AF_INET, socket.SOCK_DGRAM), self.udp_port)):
+            sessions = [[b'first %d' % i, b'second %d' % i] for i in range(40)]
+            t0 = datetime.datetime.now()
+            sent, fbk = self._run(sessions, port=port, socket_type=socket_type, max_sessions=20)
+            duration = (datetime.datetime.now() - t0).total_seconds()
+            for i, data_list in enumerate(sent):
+                subrefs = set()
+                for d in data_list:
+                    self.assertEqual([(content, status) for content, status, _ in fbk[d]],
+                                     [(b'echo ' + d.to_bytes(), 0)])
+                    subrefs.add(fbk[d][0][2])
+                # the data of a session share the same reference
+                self.assertEqual(len(subrefs), 1)
+            # 2 rounds of 20 concurrent sessions instead of 80 successive exchanges
+            self.assertLess(duration, 80 * self.ECHO_DELAY / 2)
+
+    def test_data_serialized_by_caller(self):
+        serializing_threads = []
+
+        def recording(method):
+            def _method(data):
+                serializing_threads.append(threading.current_thread())
+                return method(data)
+            return _method
+
+        for socket_type, port in (((socket.AF_INET, socket.SOCK_STREAM), self.port),
+                                  ((socket.AF_INET, socket.SOCK_DGRAM), self.udp_port)):
+            with mock.patch.object(Data, 'to_segments', recording(Data.to_segments)), \
+                    mock.patch.object(Data, 'to_bytes', recording(Data.to_bytes)):
+                sent, fbk = self._run([[b'first', b'second']] * 4, port=port, socket_type=socket_type)
+            self.assertEqual(len(fbk), 8)
+        self.assertEqual(set(serializing_threads), {threading.current_thread()})
+
+    def test_connection_error(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('localhost', 0))
+        port = server.getsockname()[1]
+        server.close()
+        sent, fbk = self._run([[b'data']], port=port)
+        self.assertEqual([status for _, status, _ in fbk[sent[0][0]]], [-1])
@@ -0,0 +1,682 @@
+#!/usr/bin/env python
+
+################################################################################
+#
+#  Copyright 2014-2016 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+import sys
+import inspect
+import socket
+import threading
+import time
+import tracemalloc
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+
+from framework.plumbing import FmkPlumbing
+from framework.data import Data, DataProcess
+from framework.fuzzing_primitives import ModelWalker, TypedNodeDisruption
+from framework.error_handling import DataModelDefinitionError
+from framework.node import Node, NodeInternals, NodeInternals_Term, NodeInternals_GenFunc, \
+    NodeInternals_TypedValue, NodeInternalsCriteria, GenFuncCusto, AbsorptionProfiler
+from framework.global_resources import AbsFullCsts, AbsorbStatus
+from framework.target_helpers import Target
+from framework.targets.network import NetworkTarget
+
+import argparse
+
+parser = argparse.ArgumentParser(description='Arguments for the fuddly benchmark script')
+
+group = parser.add_argument_group('Miscellaneous Options')
+group.add_argument('-m', '--models', metavar='DM_NAMES', default='zip,png,jpg,pdf',
+                   help='Comma-separated list of the data models to use for the benchmarks '
+                        '(the ones that cannot be loaded are skipped)')
+group.add_argument('-a', '--atom', metavar='ATOM_NAME',
+                   help='Atom to use within each data model (default: the first one)')
+group.add_argument('-s', '--steps', type=int, default=300,
+                   help='Number of test cases to generate for each data model')
+
+group = parser.add_argument_group('Benchmarks')
+group.add_argument('--to-bytes', action='store_true',
+                   help='Compare the cached serialization of nodes with the uncached one '
+                        'while a tTYPE-like walk modifies them')
+group.add_argument('--clone', action='store_true',
+                   help='Compare regular node clones with copy-on-write ones (latency of the '
+                        'clone and of its serialization, and memory kept by the clones) '
+                        'while a tTYPE-like walk modifies the original node')
+group.add_argument('--paths', action='store_true',
+                   help='Compare the lookup of the consumed node path with and without '
+                        'the path index of the root node during a tTYPE-like walk')
+group.add_argument('--reachable', action='store_true',
+                   help='Compare the search of reachable nodes with and without the index '
+                        'of the root node during a tTYPE-like walk')
+group.add_argument('--snapshot', action='store_true',
+                   help='Compare the save/restore of the state of a node graph through a backup '
+                        'copy (Node.get_internals_backup()) and through a state snapshot '
+                        '(Node.get_state_snapshot()) during a tTYPE-like walk')
+group.add_argument('--compile', action='store_true',
+                   help='Compare the generation of new data (unfreeze() then to_bytes()) from '
+                        'an atom and from its compiled form (Node.compile())')
+group.add_argument('--batch', action='store_true',
+                   help='Compare the generation of data from a copy of an atom for each of '
+                        'them (as the generators do by default) with Node.freeze_batch()')
+group.add_argument('--absorb', action='store_true',
+                   help='Compare the absorption of data generated from an atom with and without '
+                        'the memo of the rejections (Env.absorption_memo_enabled)')
+group.add_argument('--pipeline', action='store_true',
+                   help='Compare the number of test cases (generator of the atom followed by '
+                        'tTYPE) sent per second by FmkPlumbing.process_data_and_send() with and '
+                        'without the pipelined mode, for a target which takes 50ms to handle '
+                        'each of them')
+group.add_argument('--burst', action='store_true',
+                   help='Compare the number of datagrams (generated from the atom) sent per second '
+                        'to a local UDP socket by a NetworkTarget, one data at a time and '
+                        'through its burst mode')
+group.add_argument('--feedback', action='store_true',
+                   help='Measure the throughput of the feedback collected by a NetworkTarget from '
+                        'a local server flooding each connection, compared to a bare recv() loop')
+group.add_argument('--memory', action='store_true',
+                   help='Report the memory used by the nodes of all the atoms of the data models')
+
+
+def load_data_models(fmk, dm_names):
+    for name in dm_names:
+        dm = fmk.get_data_model_by_name(name)
+        if dm is None:
+            print('*** data model "{:s}" does not exist, skipped ***'.format(name))
+            continue
+        try:
+            dm.load_data_model(fmk._name2dm)
+        except Exception as e:
+            print('*** data model "{:s}" cannot be loaded ({!s}), skipped ***'.format(name, e))
+            continue
+
+        yield name, dm
+
+
+def load_atoms(fmk, dm_names, atom_name=None):
+    for name, dm in load_data_models(fmk, dm_names):
+        try:
+            atom_id = atom_name if atom_name is not None else list(dm.atom_identifiers())[0]
+            atom = dm.get_atom(atom_id)
+        except Exception as e:
+            print('*** data model "{:s}" cannot be loaded ({!s}), skipped ***'.format(name, e))
+            continue
+
+        yield name, atom_id, atom
+
+
+def print_report(title, results, columns, label='Data Model'):
+    print('\n=== {:s} ==='.format(title))
+    header = '{:<20s}'.format(label) + ''.join(['{:>16s}'.format(c) for c in columns])
+    print(header)
+    print('-'*len(header))
+    for name, values in results:
+        print('{:<20s}'.format(name) + ''.join(['{:>16s}'.format(v) for v in values]))
+
+
+def bench_to_bytes(fmk, dm_names, atom_name, steps):
+    results = []
+    # Values of the nodes that are not freezable change at each serialization, thus
+    # cached and uncached values can only be compared for the models without them.
+    volatile_ic = NodeInternalsCriteria(negative_attrs=[NodeInternals.Freezable],
+                                        node_kinds=[NodeInternals_Term, NodeInternals_GenFunc])
+    for name, atom_id, atom in load_atoms(fmk, dm_names, atom_name):
+        env = atom.env
+        check = not atom.get_reachable_nodes(internals_criteria=volatile_ic)
+        cached_time = 0
+        uncached_time = 0
+        nb = 0
+        try:
+            for rnode, consumed_node, orig_node_val, idx in ModelWalker(atom, TypedNodeDisruption(),
+                                                                        make_determinist=True,
+                                                                        max_steps=steps):
+                env.bytes_cache_enabled = True
+                t0 = time.perf_counter()
+                cached_val = rnode.to_bytes()
+                cached_time += time.perf_counter() - t0
+
+                env.bytes_cache_enabled = False
+                t0 = time.perf_counter()
+                uncached_val = rnode.to_bytes()
+                uncached_time += time.perf_counter() - t0
+                env.bytes_cache_enabled = True
+
+                if check and cached_val != uncached_val:
+                    raise ValueError('cached and uncached values of "{:s}" differ (test case #{:d})'
+                                     .format(atom_id, idx))
+                nb += 1
+        except DataModelDefinitionError as e:
+            print('*** walking through "{:s}" stopped at test case #{:d} ({!r}) ***'
+                  .format(atom_id, nb+1, e))
+
+        if nb == 0:
+            continue
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}'.format(nb),
+                         '{:.1f}'.format(uncached_time/nb*1e6),
+                         '{:.1f}'.format(cached_time/nb*1e6),
+                         'x{:.2f}'.format(uncached_time/cached_time if cached_time else 0),
+                         'yes' if check else 'no']))
+
+    print_report('Node.to_bytes() after each tTYPE test case', results,
+                 ['test cases', 'uncached (us)', 'cached (us)', 'speed-up', 'checked'])
+
+
+def _walk_and_clone(atom, steps, cow, clones=None):
+    # Return the number of clones and the time spent to clone and serialize them
+    nb = 0
+    elapsed = 0
+    try:
+        for rnode, consumed_node, orig_node_val, idx in ModelWalker(atom, TypedNodeDisruption(),
+                                                                    make_determinist=True,
+                                                                    max_steps=steps):
+            t0 = time.perf_counter()
+            clone = Node(rnode.name, base_node=rnode, new_env=True, cow=cow)
+            clone.to_bytes()
+            elapsed += time.perf_counter() - t0
+            if clones is not None:
+                clones.append(clone)
+            nb += 1
+    except DataModelDefinitionError as e:
+        print('*** walking through "{:s}" stopped at test case #{:d} ({!r}) ***'
+              .format(atom.name, nb+1, e))
+
+    return nb, elapsed
+
+
+def bench_clone(fmk, dm_names, atom_name, steps):
+    results = []
+    for name, atom_id, atom in load_atoms(fmk, dm_names, atom_name):
+        durations = []
+        mem_usages = []
+        for cow in (False, True):
+            base = Node(atom.name, base_node=atom, new_env=True)
+            nb, elapsed = _walk_and_clone(base, steps, cow)
+            durations.append(elapsed/nb*1e6 if nb else 0)
+
+            # The clones are kept, as the data of a fuzzing session history would be
+            clones = []
+            base = Node(atom.name, base_node=atom, new_env=True)
+            tracemalloc.start()
+            _walk_and_clone(base, steps, cow, clones=clones)
+            mem_usages.append(tracemalloc.get_traced_memory()[0] / 1024)
+            tracemalloc.stop()
+            del clones
+
+        if nb == 0:
+            continue
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}'.format(nb),
+                         '{:.1f}'.format(durations[0]),
+                         '{:.1f}'.format(durations[1]),
+                         'x{:.2f}'.format(durations[0]/durations[1] if durations[1] else 0),
+                         '{:.0f}'.format(mem_usages[0]),
+                         '{:.0f}'.format(mem_usages[1])]))
+
+    print_report('Node clone + to_bytes() after each tTYPE test case', results,
+                 ['test cases', 'regular (us)', 'cow (us)', 'speed-up',
+                  'regular (KiB)', 'cow (KiB)'])
+
+
+def bench_paths(fmk, dm_names, atom_name, steps):
+    results = []
+    for name, atom_id, atom in load_atoms(fmk, dm_names, atom_name):
+        indexed_time = 0
+        rebuilt_time = 0
+        nb = 0
+        try:
+            for rnode, consumed_node, orig_node_val, idx in ModelWalker(atom, TypedNodeDisruption(),
+                                                                        make_determinist=True,
+                                                                        max_steps=steps):
+                t0 = time.perf_counter()
+                indexed_path = consumed_node.get_path_from(rnode)
+                indexed_time += time.perf_counter() - t0
+
+                # Same lookup with a path table computed from scratch
+                index = rnode._paths_htable, rnode._paths_htable_key, \
+                        rnode._paths_generators, rnode._paths_node_index
+                rnode._paths_htable = None
+                t0 = time.perf_counter()
+                path = consumed_node.get_path_from(rnode)
+                rebuilt_time += time.perf_counter() - t0
+                rnode._paths_htable, rnode._paths_htable_key, \
+                    rnode._paths_generators, rnode._paths_node_index = index
+
+                if path != indexed_path:
+                    raise ValueError('indexed and computed paths of the consumed node differ '
+                                     '(test case #{:d})'.format(idx))
+                nb += 1
+        except DataModelDefinitionError as e:
+            print('*** walking through "{:s}" stopped at test case #{:d} ({!r}) ***'
+                  .format(atom_id, nb+1, e))
+
+        if nb == 0:
+            continue
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}'.format(nb),
+                         '{:.1f}'.format(rebuilt_time/nb*1e6),
+                         '{:.1f}'.format(indexed_time/nb*1e6),
+                         'x{:.2f}'.format(rebuilt_time/indexed_time if indexed_time else 0)]))
+
+    print_report('Node.get_path_from() after each tTYPE test case', results,
+                 ['test cases', 'rebuilt (us)', 'indexed (us)', 'speed-up'])
+
+
+def bench_reachable(fmk, dm_names, atom_name, steps):
+    results = []
+    # Criteria similar to the ones used by the tTYPE disruptor
+    queries = [dict(internals_criteria=NodeInternalsCriteria(mandatory_attrs=[NodeInternals.Mutable],
+                                                            node_kinds=[NodeInternals_TypedValue])),
+               dict(internals_criteria=NodeInternalsCriteria(mandatory_custo=[GenFuncCusto.TriggerLast]),
+                    resolve_generator=True),
+               dict(path_regexp='.*', respect_order=True)]
+    for name, atom_id, atom in load_atoms(fmk, dm_names, atom_name):
+        indexed_time = 0
+        walked_time = 0
+        nb = 0
+        try:
+            for rnode, consumed_node, orig_node_val, idx in ModelWalker(atom, TypedNodeDisruption(),
+                                                                        make_determinist=True,
+                                                                        max_steps=steps):
+                for kwargs in queries:
+                    t0 = time.perf_counter()
+                    indexed_nodes = rnode.get_reachable_nodes(**kwargs)
+                    indexed_time += time.perf_counter() - t0
+
+                    # Same search through a walk of the graph
+                    indexes = rnode._reachable_indexes
+                    rnode._reachable_indexes = None
+                    t0 = time.perf_counter()
+                    nodes = rnode.get_reachable_nodes(**kwargs)
+                    walked_time += time.perf_counter() - t0
+                    rnode._reachable_indexes = indexes
+
+                    if set(nodes) != set(indexed_nodes):
+                        raise ValueError('indexed and walked reachable nodes differ '
+                                         '(test case #{:d})'.format(idx))
+                nb += 1
+        except DataModelDefinitionError as e:
+            print('*** walking through "{:s}" stopped at test case #{:d} ({!r}) ***'
+                  .format(atom_id, nb+1, e))
+
+        if nb == 0:
+            continue
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}'.format(nb),
+                         '{:.1f}'.format(walked_time/nb*1e6),
+                         '{:.1f}'.format(indexed_time/nb*1e6),
+                         'x{:.2f}'.format(walked_time/indexed_time if indexed_time else 0)]))
+
+    print_report('Node.get_reachable_nodes() after each tTYPE test case', results,
+                 ['test cases', 'walked (us)', 'indexed (us)', 'speed-up'])
+
+
+def bench_snapshot(fmk, dm_names, atom_name, steps):
+    results = []
+    for name, atom_id, atom in load_atoms(fmk, dm_names, atom_name):
+        backup_time = 0
+        snapshot_time = 0
+        nb = 0
+        try:
+            for rnode, consumed_node, orig_node_val, idx in ModelWalker(atom, TypedNodeDisruption(),
+                                                                        make_determinist=True,
+                                                                        max_steps=steps):
+                # The walked node is not altered
+                node = Node(rnode.name, base_node=rnode, new_env=True)
+                value = node.to_bytes()
+
+                t0 = time.perf_counter()
+                backup = node.get_internals_backup()
+                backup_time += time.perf_counter() - t0
+                node.unfreeze()
+                t0 = time.perf_counter()
+                node.set_internals(backup)
+                backup_time += time.perf_counter() - t0
+
+                t0 = time.perf_counter()
+                snapshot = node.get_state_snapshot()
+                snapshot_time += time.perf_counter() - t0
+                node.unfreeze()
+                t0 = time.perf_counter()
+                node.restore_state_snapshot(snapshot)
+                snapshot_time += time.perf_counter() - t0
+
+                if node.to_bytes() != value:
+                    raise ValueError('the restored node differs (test case #{:d})'.format(idx))
+                nb += 1
+        except DataModelDefinitionError as e:
+            print('*** walking through "{:s}" stopped at test case #{:d} ({!r}) ***'
+                  .format(atom_id, nb+1, e))
+
+        if nb == 0:
+            continue
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}'.format(nb),
+                         '{:.1f}'.format(backup_time/nb*1e6),
+                         '{:.1f}'.format(snapshot_time/nb*1e6),
+                         'x{:.2f}'.format(backup_time/snapshot_time if snapshot_time else 0)]))
+
+    print_report('Save + restore of the root node after each tTYPE test case', results,
+                 ['test cases', 'backup (us)', 'snapshot (us)', 'speed-up'])
+
+
+def bench_compile(fmk, dm_names, atom_name, steps):
+    results = []
+    for name, atom_id, atom in load_atoms(fmk, dm_names, atom_name):
+        node = Node(atom.name, base_node=atom, new_env=True)
+        compiled_node = Node(atom.name, base_node=atom, new_env=True)
+        node.freeze()
+        collapsed_qty = compiled_node.compile()
+        nb_nodes = len(compiled_node.get_reachable_nodes()) + 1
+
+        regular_time = 0
+        compiled_time = 0
+        for _ in range(steps):
+            t0 = time.perf_counter()
+            node.unfreeze(recursive=True)
+            node.to_bytes()
+            regular_time += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            compiled_node.unfreeze(recursive=True)
+            compiled_node.to_bytes()
+            compiled_time += time.perf_counter() - t0
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}/{:d}'.format(collapsed_qty, nb_nodes),
+                         '{:.1f}'.format(regular_time/steps*1e6),
+                         '{:.1f}'.format(compiled_time/steps*1e6),
+                         'x{:.2f}'.format(regular_time/compiled_time if compiled_time else 0)]))
+
+    print_report('Generation of new data from an atom (unfreeze + to_bytes)', results,
+                 ['collapsed nodes', 'regular (us)', 'compiled (us)', 'speed-up'])
+
+
+def bench_batch(fmk, dm_names, atom_name, steps):
+    results = []
+    for name, dm in load_data_models(fmk, dm_names):
+        atom_id = atom_name if atom_name is not None else list(dm.atom_identifiers())[0]
+        try:
+            t0 = time.perf_counter()
+            for _ in range(steps):
+                dm.get_atom(atom_id).to_bytes()
+            per_item_time = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            dm.get_atom(atom_id).freeze_batch(steps)
+            batch_time = time.perf_counter() - t0
+        except Exception as e:
+            print('*** data model "{:s}" cannot be loaded ({!s}), skipped ***'.format(name, e))
+            continue
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}'.format(steps),
+                         '{:.1f}'.format(per_item_time/steps*1e6),
+                         '{:.1f}'.format(batch_time/steps*1e6),
+                         'x{:.2f}'.format(per_item_time/batch_time if batch_time else 0)]))
+
+    print_report('Generation of data from an atom', results,
+                 ['data', 'per item (us)', 'batch (us)', 'speed-up'])
+
+
+def bench_absorb(fmk, dm_names, atom_name, steps):
+    results = []
+    for name, dm in load_data_models(fmk, dm_names):
+        atom_id = atom_name if atom_name is not None else list(dm.atom_identifiers())[0]
+        try:
+            data_list = [dm.get_atom(atom_id).to_bytes() for _ in range(steps)]
+
+            def absorb_all(memo_enabled, profiler=None):
+                atoms = [dm.get_atom(atom_id) for _ in data_list]
+                for atom in atoms:
+                    atom.env.absorption_memo_enabled = memo_enabled
+                absorbed = 0
+                t0 = time.perf_counter()
+                for atom, data in zip(atoms, data_list):
+                    status, _, _, _ = atom.absorb(data, constraints=AbsFullCsts(), profiler=profiler)
+                    absorbed += status == AbsorbStatus.FullyAbsorbed
+                return time.perf_counter() - t0, absorbed
+
+            dm.get_atom(atom_id).absorb(data_list[0], constraints=AbsFullCsts())  # warm-up
+            no_memo_time, absorbed = absorb_all(False)
+            memo_time, _ = absorb_all(True)
+            profiler = AbsorptionProfiler()
+            absorb_all(True, profiler)
+        except Exception as e:
+            print('*** data model "{:s}" cannot be loaded ({!s}), skipped ***'.format(name, e))
+            continue
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}/{:d}'.format(absorbed, steps),
+                         '{:.2f}'.format(no_memo_time/steps*1e3),
+                         '{:.2f}'.format(memo_time/steps*1e3),
+                         '{:d}'.format(sum([s[2] for s in profiler.stats.values()])),
+                         'x{:.2f}'.format(no_memo_time/memo_time if memo_time else 0)]))
+
+    print_report('Absorption of generated data', results,
+                 ['absorbed', 'no memo (ms)', 'memo (ms)', 'memoized', 'speed-up'])
+
+
+def bench_pipeline(fmk, dm_names, atom_name, steps, fbk_timeout=0.05):
+    results = []
+    for name in dm_names:
+        if fmk.get_data_model_by_name(name) is None or not fmk.load_data_model(name=name):
+            print('*** data model "{:s}" cannot be loaded, skipped ***'.format(name))
+            continue
+        atom_id = atom_name if atom_name is not None else list(fmk.dm.atom_identifiers())[0]
+        # the EmptyTarget waits for the whole feedback timeout
+        fmk.set_feedback_timeout(fbk_timeout, tg_id=0, do_record=False, do_show=False)
+
+        rates = []
+        for pipelined in (False, True):
+            fmk.cleanup_all_dmakers(reset_existing_seed=True)
+            t0 = time.perf_counter()
+            data_list = fmk.process_data_and_send(DataProcess([atom_id.upper(), 'tTYPE']),
+                                                  max_loop=steps, console_display=False,
+                                                  pipelined=pipelined)
+            elapsed = time.perf_counter() - t0
+            rates.append(len(data_list) / elapsed if data_list else 0)
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:.0f}'.format(fbk_timeout*1e3),
+                         '{:.1f}'.format(rates[0]),
+                         '{:.1f}'.format(rates[1]),
+                         'x{:.2f}'.format(rates[1]/rates[0] if rates[0] else 0)]))
+
+    print_report('Test cases sent per second', results,
+                 ['fbk timeout (ms)', 'sequential', 'pipelined', 'speed-up'])
+
+
+def bench_burst(fmk, dm_names, atom_name, steps):
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(('localhost', 0))
+    port = sink.getsockname()[1]
+
+    results = []
+    for name, atom_id, atom in load_atoms(fmk, dm_names, atom_name):
+        data_list = []
+        for _ in range(steps):
+            atom.unfreeze(recursive=True)
+            # a datagram cannot exceed 64 KiB
+            data_list.append(Data(atom.to_bytes()[:60000]))
+
+        rates = []
+        for burst_mode in (False, True):
+            tg = NetworkTarget(host='localhost', port=port, socket_type=(socket.AF_INET, socket.SOCK_DGRAM),
+                               burst_mode=burst_mode, listen_on_start=False, fbk_timeout=0)
+            tg.start()
+            t0 = time.perf_counter()
+            if burst_mode:
+                tg.send_multiple_data(data_list, from_fmk=True)
+            else:
+                for d in data_list:
+                    tg.send_data(d, from_fmk=True)
+                    while not tg.is_feedback_received():
+                        tg.wait_for_state_change(tg.get_state_version(), 0.1)
+            while not tg.is_feedback_received():
+                tg.wait_for_state_change(tg.get_state_version(), 0.1)
+            rates.append(len(data_list) / (time.perf_counter() - t0))
+            tg.stop()
+
+        results.append(('{:s}/{:s}'.format(name, atom_id),
+                        ['{:d}'.format(len(data_list)),
+                         '{:.0f}'.format(rates[0]),
+                         '{:.0f}'.format(rates[1]),
+                         'x{:.2f}'.format(rates[1]/rates[0] if rates[0] else 0)]))
+
+    sink.close()
+    print_report('Datagrams sent per second', results,
+                 ['datagrams', 'one at a time', 'burst', 'speed-up'])
+
+
+def _flood_server(server, flood):
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            return
+        conn.recv(1024)
+        conn.sendall(flood)
+        conn.close()
+
+
+def bench_feedback(steps, sizes=(64*1024, 1024*1024, 16*1024*1024)):
+    results = []
+    for size in sizes:
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('localhost', 0))
+        server.listen(5)
+        port = server.getsockname()[1]
+        threading.Thread(target=_flood_server, args=(server, b'F' * size), daemon=True).start()
+        rounds = max(1, steps * 64 * 1024 // size)
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            s = socket.create_connection(('localhost', port))
+            s.sendall(b'go')
+            chunks = []
+            while True:
+                chunk = s.recv(NetworkTarget.CHUNK_SZ)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            b''.join(chunks)
+            s.close()
+        raw_rate = size * rounds / (time.perf_counter() - t0)
+
+        # the server closes the connection once flooded, which ends the feedback collection
+        tg = NetworkTarget(host='localhost', port=port, listen_on_start=False,
+                           fbk_timeout=10, fbk_mode=Target.FBK_WAIT_FULL_TIME)
+        tg.start()
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            tg.send_data(Data(b'go'), from_fmk=True)
+            while not tg.is_feedback_received():
+                tg.wait_for_state_change(tg.get_state_version(), 0.1)
+            tg.get_feedback().cleanup()
+        rate = size * rounds / (time.perf_counter() - t0)
+        tg.stop()
+        server.close()
+
+        results.append(('{:d} KiB'.format(size // 1024),
+                        ['{:d}'.format(rounds),
+                         '{:.0f}'.format(rate / 1e6),
+                         '{:.0f}'.format(raw_rate / 1e6)]))
+
+    print_report('Feedback received per connection (MB/s)', results,
+                 ['rounds', 'NetworkTarget', 'recv() loop'], label='Flood size')
+
+
+def bench_memory(fmk, dm_names):
+    results = []
+    for name, dm in load_data_models(fmk, dm_names):
+        tracemalloc.start()
+        atoms = []
+        for atom_id in dm.atom_identifiers():
+            atom = dm.get_atom(atom_id)
+            if isinstance(atom, Node):
+                atom.freeze()
+                atoms.append(atom)
+        mem_usage = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        nb_nodes = sum([len(atom.get_reachable_nodes(resolve_generator=True)) + 1
+                        for atom in atoms])
+        if nb_nodes == 1:
+            continue
+
+        results.append((name,
+                        ['{:d}'.format(len(atoms)),
+                         '{:d}'.format(nb_nodes),
+                         '{:.0f}'.format(mem_usage / 1024),
+                         '{:.0f}'.format(mem_usage / nb_nodes)]))
+
+    print_report('Memory used by the frozen atoms of the data models', results,
+                 ['atoms', 'nodes', 'total (KiB)', 'per node (B)'])
+
+
+if __name__ == "__main__":
+
+    args = parser.parse_args()
+
+    dm_names = args.models.split(',')
+
+    fmk = FmkPlumbing(quiet=True)
+    fmk.start()
+    fmk.run_project(name='tuto', dm_name=['mydf'])
+
+    try:
+        if args.to_bytes:
+            bench_to_bytes(fmk, dm_names, args.atom, args.steps)
+        if args.clone:
+            bench_clone(fmk, dm_names, args.atom, args.steps)
+        if args.paths:
+            bench_paths(fmk, dm_names, args.atom, args.steps)
+        if args.reachable:
+            bench_reachable(fmk, dm_names, args.atom, args.steps)
+        if args.snapshot:
+            bench_snapshot(fmk, dm_names, args.atom, args.steps)
+        if args.compile:
+            bench_compile(fmk, dm_names, args.atom, args.steps)
+        if args.batch:
+            bench_batch(fmk, dm_names, args.atom, args.steps)
+        if args.absorb:
+            bench_absorb(fmk, dm_names, args.atom, args.steps)
+        if args.memory:
+            bench_memory(fmk, dm_names)
+        if args.pipeline:
+            bench_pipeline(fmk, dm_names, args.atom, args.steps)
+        if args.burst:
+            bench_burst(fmk, dm_names, args.atom, args.steps)
+        if args.feedback:
+            bench_feedback(args.steps)
+    finally:
+        fmk.stop()
@@ -106,6 +106,9 @@ group.add_argument('--fbk-atom', metavar='ATOM_NAME',
                         "or the name of the first registered atom in the data model")
 group.add_argument('--force-fbk-decoder', metavar='DATA_MODEL_NAME',
                    help="Decode feedback with the decoder of the data model specified")
+group.add_argument('--profile-absorption', action='store_true',
+                   help="Report the time spent and the number of absorption attempts for each "
+                        "node of the decoded data (expect --decode-data or --decode-fbk)")
 
 group = parser.add_argument_group('Fuddly Database Operations')
 group.add_argument('--export-data', nargs=2, metavar=('FIRST_DATA_ID','LAST_DATA_ID'), type=int,
@@ -210,6 +213,7 @@ if __name__ == "__main__":
     forced_fbk_decoder = args.force_fbk_decoder
     data_atom_name = args.data_atom
     fbk_atom_name = args.fbk_atom
+    profile_absorption = args.profile_absorption
 
     impact_analysis = args.data_with_impact
     raw_impact_analysis = args.data_with_impact_raw
@@ -227,7 +231,8 @@ if __name__ == "__main__":
         dm_list = copy.copy(fmk.dm_list)
         decoding_hints = (fmk._name2dm,
                           decode_data, decode_fbk,
-                          data_atom_name, fbk_atom_name, forced_fbk_decoder)
+                          data_atom_name, fbk_atom_name, forced_fbk_decoder,
+                          profile_absorption)
     else:
         dm_list = None
         decoding_hints = None